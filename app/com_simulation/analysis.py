@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from typing import List, Dict, Optional
 import numpy as np
 from scipy import signal
+from .jitter import find_crossings, crossing_offsets, JitterHistogram, DualDiracFitter
 
 @dataclass
 class EyeDiagramParams:
@@ -10,6 +11,9 @@ class EyeDiagramParams:
     width: float   # 眼宽
     jitter: float  # 抖动
     crossing_percentage: float  # 交叉点位置
+    random_jitter: float = 0.0         # RJ(UI)
+    deterministic_jitter: float = 0.0  # DJ(δδ)(UI)
+    total_jitter: float = 0.0          # TJ@目标误码率(UI)
 
 class ComAnalyzer:
     """COM分析器"""
@@ -17,6 +21,8 @@ class ComAnalyzer:
         self.data = simulation_data
         self.sample_rate = simulation_data.get('sample_rate', 1e9)
         self.bit_rate = simulation_data.get('bit_rate', 1e9)
+        self.target_ber = simulation_data.get('target_ber', 1e-12)
+        self.jitter_bins = simulation_data.get('jitter_bins', 256)
         
     def analyze_eye_diagram(self, signal_data: List[float]) -> EyeDiagramParams:
         """分析眼图参数"""
@@ -33,12 +39,16 @@ class ComAnalyzer:
         width = self._calculate_eye_width(eye_data)
         jitter = self._calculate_jitter(eye_data)
         crossing = self._find_crossing_percentage(eye_data)
+        decomposition = self.decompose_jitter(eye_data)
         
         return EyeDiagramParams(
             height=height,
             width=width,
             jitter=jitter,
-            crossing_percentage=crossing
+            crossing_percentage=crossing,
+            random_jitter=decomposition.random_jitter,
+            deterministic_jitter=decomposition.deterministic_jitter,
+            total_jitter=decomposition.total_jitter
         )
     
     def _calculate_eye_width(self, eye_data: np.ndarray) -> float:
@@ -70,27 +80,23 @@ class ComAnalyzer:
     def _calculate_jitter(self, eye_data: np.ndarray) -> float:
         """计算抖动"""
         threshold = (np.max(eye_data) + np.min(eye_data)) / 2
-        crossings = []
-        
-        # 对每个UI寻找交叉点
-        for row in eye_data:
-            row_crossings = []
-            for i in range(1, len(row)):
-                if (row[i-1] < threshold and row[i] >= threshold) or \
-                   (row[i-1] >= threshold and row[i] < threshold):
-                    # 使用线性插值获取更精确的交叉点位置
-                    x1, x2 = i-1, i
-                    y1, y2 = row[i-1], row[i]
-                    crossing = x1 + (threshold - y1) * (x2 - x1) / (y2 - y1)
-                    row_crossings.append(crossing)
-            if row_crossings:
-                crossings.extend(row_crossings)
+        crossings = find_crossings(eye_data, threshold)
         
-        if not crossings:
+        if not len(crossings):
             return 0.0
         
-        # 计算交叉点的标准差作为抖动指标
-        return np.std(crossings)
+        # 计算交叉点相对圆周均值的标准差作为抖动指标(采样点)
+        return np.std(crossing_offsets(crossings, eye_data.shape[1])) * eye_data.shape[1]
+    
+    def decompose_jitter(self, eye_data: np.ndarray):
+        """双狄拉克模型分解RJ/DJ/TJ"""
+        threshold = (np.max(eye_data) + np.min(eye_data)) / 2
+        histogram = JitterHistogram.from_crossings(
+            find_crossings(eye_data, threshold),
+            eye_data.shape[1],
+            bins=self.jitter_bins
+        )
+        return DualDiracFitter().fit(histogram, self.target_ber)
     
     def _find_crossing_percentage(self, eye_data: np.ndarray) -> float:
         """计算交叉点位置"""
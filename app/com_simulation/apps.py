@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ComSimulationConfig(AppConfig):
+    name = 'app.com_simulation'
+
+    def ready(self):
+        from . import signals  # noqa: F401
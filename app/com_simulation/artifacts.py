@@ -0,0 +1,96 @@
+from io import BytesIO
+from typing import Optional
+import numpy as np
+from django.conf import settings
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+
+class WaveformArtifactStore:
+    """
+    仿真波形二进制存储
+    波形以NPY(可选压缩NPZ)写入文件存储, result_data中只保存引用和抽取后的预览
+    """
+    base_dir = 'com_simulations'
+
+    def __init__(self, compress: Optional[bool] = None, preview_points: Optional[int] = None):
+        self.compress = getattr(settings, 'COM_WAVEFORM_COMPRESS', False) if compress is None else compress
+        self.preview_points = preview_points or getattr(settings, 'COM_WAVEFORM_PREVIEW_POINTS', 500)
+
+    def save(self, simulation_id: int, name: str, waveform: np.ndarray) -> dict:
+        """保存波形并返回引用"""
+        waveform = np.asarray(waveform)
+        extension = 'npz' if self.compress else 'npy'
+        path = f"{self.base_dir}/{simulation_id}/{name}.{extension}"
+
+        buffer = BytesIO()
+        if self.compress:
+            np.savez_compressed(buffer, waveform=waveform)
+        else:
+            np.save(buffer, waveform, allow_pickle=False)
+
+        if default_storage.exists(path):
+            default_storage.delete(path)
+        saved_path = default_storage.save(path, ContentFile(buffer.getvalue()))
+
+        return {
+            'path': saved_path,
+            'format': extension,
+            'shape': list(waveform.shape),
+            'dtype': waveform.dtype.str
+        }
+
+    def load(self, ref: dict) -> np.ndarray:
+        """按引用加载波形"""
+        with default_storage.open(ref['path'], 'rb') as f:
+            buffer = BytesIO(f.read())
+        if ref.get('format') == 'npz':
+            with np.load(buffer, allow_pickle=False) as archive:
+                return archive['waveform']
+        return np.load(buffer, allow_pickle=False)
+
+    def delete(self, ref: dict):
+        """删除波形文件"""
+        if default_storage.exists(ref['path']):
+            default_storage.delete(ref['path'])
+
+    def copy(self, ref: dict, simulation_id: int) -> Optional[dict]:
+        """
+        将波形文件复制到另一仿真的目录下, 各仿真只引用自己目录中的文件
+        :return: 新引用, 源文件不存在时返回None
+        """
+        if not default_storage.exists(ref['path']):
+            return None
+        path = f"{self.base_dir}/{simulation_id}/{ref['path'].rsplit('/', 1)[-1]}"
+        if default_storage.exists(path):
+            default_storage.delete(path)
+        with default_storage.open(ref['path'], 'rb') as source:
+            saved_path = default_storage.save(path, File(source))
+        return {**ref, 'path': saved_path}
+
+    def delete_simulation(self, simulation_id: int) -> int:
+        """删除仿真目录下的全部波形文件, 返回删除的文件数"""
+        directory = f"{self.base_dir}/{simulation_id}"
+        try:
+            _, files = default_storage.listdir(directory)
+        except FileNotFoundError:
+            return 0
+        for name in files:
+            default_storage.delete(f"{directory}/{name}")
+        return len(files)
+
+    def preview(self, waveform: np.ndarray) -> list:
+        """等间隔抽取的波形预览"""
+        waveform = np.asarray(waveform)
+        if waveform.shape[-1] <= self.preview_points:
+            return waveform.tolist()
+        indices = np.linspace(0, waveform.shape[-1] - 1, self.preview_points).astype(int)
+        return waveform[..., indices].tolist()
+
+
+def load_port_waveform(port_result: dict, store: Optional[WaveformArtifactStore] = None) -> np.ndarray:
+    """获取端口时域波形, 兼容旧版直接存储在JSON中的time_data"""
+    if 'time_data_ref' in port_result:
+        return (store or WaveformArtifactStore()).load(port_result['time_data_ref'])
+    return np.asarray(port_result['time_data'])
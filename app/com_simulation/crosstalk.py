@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+from typing import List, Tuple, Optional
+import numpy as np
+from .fft_plan import FFTPlanner
+from .pulse import compute_pulse_responses
+
+PortPair = Tuple[int, int]  # (输出端口, 输入端口)
+
+
+@dataclass
+class CrosstalkResult:
+    """串扰聚合结果"""
+    victim: PortPair
+    aggressor_rms: np.ndarray  # 各干扰源串扰有效值 [A]
+    total_rms: float  # 功率和
+    peak_distortion: float  # 峰值失真(最坏情况幅度)
+    amplitude_at_ber: Optional[float] = None  # 目标误码率下的串扰幅度(PDF法)
+
+    def to_dict(self) -> dict:
+        """转换为可JSON序列化的结果"""
+        return {
+            'victim': list(self.victim),
+            'aggressors': len(self.aggressor_rms),
+            'aggressor_rms': self.aggressor_rms.tolist(),
+            'total_rms': self.total_rms,
+            'peak_distortion': self.peak_distortion,
+            'amplitude_at_ber': self.amplitude_at_ber
+        }
+
+
+class CrosstalkAggregator:
+    """
+    多干扰源串扰聚合(NEXT/FEXT)
+    受害通道与所有干扰通道的脉冲响应在一次批量FFT中计算,
+    随后按功率和或PDF(特征函数乘积)向量化合成
+    """
+    pdf_points = 2048
+    aggressor_chunk = 16
+
+    def __init__(self, frequencies: np.ndarray, s_parameters: np.ndarray,
+                 sample_rate: float, bit_rate: float, num_ui: int = 64):
+        self.frequencies = np.asarray(frequencies)
+        self.s_parameters = s_parameters
+        self.sample_rate = sample_rate
+        self.bit_rate = bit_rate
+        self.num_ui = num_ui
+        self.samples_per_ui = int(round(sample_rate / bit_rate))
+        self.planner = FFTPlanner(sample_rate)
+
+    def aggregate(self, victim: PortPair, aggressors: List[PortPair], method: str = 'power_sum',
+                  target_ber: float = 1e-12, pulse_matrix: Optional[np.ndarray] = None) -> CrosstalkResult:
+        """
+        聚合串扰
+        :param method: power_sum(功率和) 或 pdf(概率密度卷积)
+        :param pulse_matrix: 预先计算的全部端口对脉冲响应 [P, P, T], 提供时不再做FFT
+        """
+        pairs = np.array([victim] + list(aggressors), dtype=int)
+        if pulse_matrix is not None:
+            pulses = pulse_matrix[pairs[:, 0], pairs[:, 1]]  # [1+A, T]
+        else:
+            responses = self.s_parameters[:, pairs[:, 0], pairs[:, 1]]  # [F, 1+A]
+            pulses = compute_pulse_responses(
+                self.frequencies,
+                responses,
+                self.sample_rate,
+                self.bit_rate,
+                num_ui=self.num_ui,
+                planner=self.planner
+            )
+
+        # 以受害通道主游标相位对所有干扰源按UI采样
+        phase = int(np.argmax(pulses[0])) % self.samples_per_ui
+        cursors = pulses[1:, phase::self.samples_per_ui]  # [A, N]
+
+        aggressor_rms = np.sqrt(np.sum(cursors ** 2, axis=-1))
+        result = CrosstalkResult(
+            victim=tuple(victim),
+            aggressor_rms=aggressor_rms,
+            total_rms=float(np.sqrt(np.sum(aggressor_rms ** 2))),
+            peak_distortion=float(np.sum(np.abs(cursors)))
+        )
+        if method == 'pdf':
+            result.amplitude_at_ber = self._amplitude_at_ber(cursors, result.peak_distortion, target_ber)
+        return result
+
+    def _amplitude_at_ber(self, cursors: np.ndarray, peak: float, target_ber: float) -> float:
+        """
+        通过特征函数乘积合成所有干扰源的串扰PDF, 返回单侧尾概率等于target_ber的幅度
+        对等概率±1数据, 单个游标的特征函数为cos(ωh), 总特征函数为所有游标的乘积
+        """
+        if peak == 0:
+            return 0.0
+        points = self.pdf_points
+        step = 2.2 * peak / points
+        omega = 2 * np.pi * np.fft.fftfreq(points, step)
+
+        char_fn = np.ones(points)
+        for start in range(0, len(cursors), self.aggressor_chunk):
+            chunk = cursors[start:start + self.aggressor_chunk].reshape(-1)
+            char_fn *= np.prod(np.cos(np.outer(chunk, omega)), axis=0)
+
+        pdf = np.clip(np.fft.fftshift(np.fft.fft(char_fn).real), 0, None)
+        pdf /= pdf.sum()
+        amplitudes = (np.arange(points) - points // 2) * step
+
+        # 单侧尾概率 P(X >= a)
+        tail = np.cumsum(pdf[::-1])[::-1]
+        above = np.flatnonzero(tail <= target_ber)
+        return float(amplitudes[above[0]]) if len(above) else float(amplitudes[-1])
@@ -0,0 +1,106 @@
+import uuid
+from typing import List, Dict, Any
+from celery import group
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from app.parameter.models import SParameter
+from .models import ComSimulation
+from .serializers import BulkComSimulationSerializer
+from .tasks import run_simulation
+
+
+class BulkSimulationDispatcher:
+    """
+    批量仿真分发
+    S参数一次查询后逐条经序列化器校验, 单条bulk_create写入, 并通过一次Celery group/chunks调用分发
+    """
+    def __init__(self, chunk_size: int = None):
+        self.chunk_size = chunk_size or getattr(settings, 'COM_BULK_CHUNK_SIZE', 50)
+
+    def dispatch(self, simulations: List[Dict[str, Any]]) -> dict:
+        """校验、创建并分发仿真任务"""
+        batch_id = uuid.uuid4().hex
+        parameter_ids = {self._parameter_id(sim) for sim in simulations} - {None}
+        parameters = SParameter.objects.in_bulk(parameter_ids)
+
+        instances = []
+        failed = []
+        for index, sim_data in enumerate(simulations):
+            serializer = BulkComSimulationSerializer(data=sim_data, context={'prefetched': parameters})
+            if not serializer.is_valid():
+                failed.append({
+                    'index': index,
+                    'data': sim_data,
+                    'status': 'failed',
+                    'errors': self._flatten_errors(serializer.errors)
+                })
+                continue
+            instances.append(ComSimulation(**serializer.validated_data, batch_id=batch_id))
+
+        if not instances:
+            return {'batch_id': None, 'accepted': 0, 'failed': failed}
+
+        with transaction.atomic():
+            created = ComSimulation.objects.bulk_create(instances)
+        simulation_ids = [simulation.id for simulation in created]
+
+        # 提交后再分发, 避免worker读取到未提交的记录
+        group_result = self._apply(simulation_ids)
+
+        return {
+            'batch_id': batch_id,
+            'group_id': group_result.id,
+            'accepted': len(simulation_ids),
+            'simulation_ids': simulation_ids,
+            'failed': failed
+        }
+
+    def _apply(self, simulation_ids: List[int]):
+        """大批量使用chunks合并消息, 减少broker往返"""
+        if len(simulation_ids) > self.chunk_size:
+            return run_simulation.chunks(
+                [(simulation_id,) for simulation_id in simulation_ids],
+                self.chunk_size
+            ).group().apply_async()
+        return group(run_simulation.s(simulation_id) for simulation_id in simulation_ids).apply_async()
+
+    @staticmethod
+    def _flatten_errors(errors) -> List[str]:
+        """将序列化器的字段错误展开为消息列表"""
+        if isinstance(errors, dict):
+            return [
+                message if field == 'non_field_errors' else f"{field}: {message}"
+                for field, messages in errors.items()
+                for message in BulkSimulationDispatcher._flatten_errors(messages)
+            ]
+        if isinstance(errors, list):
+            return [message for item in errors for message in BulkSimulationDispatcher._flatten_errors(item)]
+        return [str(errors)]
+
+    @staticmethod
+    def _parameter_id(sim_data: dict):
+        """获取S参数ID, 兼容字符串形式"""
+        if not isinstance(sim_data, dict):
+            return None
+        try:
+            return int(sim_data.get('s_parameter'))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def get_progress(batch_id: str) -> dict:
+        """按批次聚合仿真进度"""
+        counts = dict(
+            ComSimulation.objects.filter(batch_id=batch_id)
+            .values_list('status')
+            .annotate(count=Count('id'))
+        )
+        total = sum(counts.values())
+        finished = counts.get('completed', 0) + counts.get('failed', 0)
+        return {
+            'batch_id': batch_id,
+            'total': total,
+            'status_counts': counts,
+            'progress': (finished / total) * 100 if total else 0
+        }
@@ -0,0 +1,178 @@
+from dataclasses import dataclass, field
+from itertools import product
+from typing import List, Dict, Any, Optional
+import numpy as np
+from .fft_plan import FFTPlanner
+
+
+@dataclass
+class EqualizerGrid:
+    """均衡器扫描网格(TX FFE + RX CTLE + RX DFE)"""
+    ctle_dc_gains: List[float]  # CTLE直流增益(dB)
+    ctle_zero: float  # CTLE零点频率(Hz)
+    ctle_poles: List[float]  # CTLE两个极点频率(Hz)
+    ffe_pre: List[float] = field(default_factory=lambda: [0.0])  # TX预加重前标系数候选
+    ffe_post: List[float] = field(default_factory=lambda: [0.0])  # TX去加重后标系数候选
+    dfe_taps: int = 0  # DFE抽头数
+    dfe_max: float = 1.0  # DFE抽头幅度上限(相对主游标)
+    noise_rms: float = 0.0  # 接收端输入噪声有效值
+    prune_margin_db: float = 6.0  # CTLE初筛保留范围(相对最优FOM)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'EqualizerGrid':
+        """从仿真设置构造"""
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+
+    def validate(self) -> List[str]:
+        """验证参数"""
+        errors = []
+        if not self.ctle_dc_gains:
+            errors.append("CTLE直流增益候选不能为空")
+        if self.ctle_zero <= 0 or len(self.ctle_poles) != 2 or min(self.ctle_poles) <= 0:
+            errors.append("CTLE零极点必须为正数, 且需要两个极点")
+        if not self.ffe_pre or not self.ffe_post:
+            errors.append("FFE系数候选不能为空")
+        if any(abs(pre) + abs(post) >= 1 for pre, post in product(self.ffe_pre, self.ffe_post)):
+            errors.append("FFE前后标系数绝对值之和必须小于1")
+        if self.dfe_taps < 0:
+            errors.append("DFE抽头数不能为负")
+        return errors
+
+    @property
+    def ffe_candidates(self) -> np.ndarray:
+        """FFE系数组合 [M, 3], 主游标系数由归一化约束得到"""
+        pairs = np.array(list(product(self.ffe_pre, self.ffe_post)), dtype=float)
+        main = 1 - np.abs(pairs[:, 0]) - np.abs(pairs[:, 1])
+        return np.column_stack([pairs[:, 0], main, pairs[:, 1]])
+
+
+@dataclass
+class SweepResult:
+    """均衡器扫描结果"""
+    best: Dict[str, Any]
+    surface: np.ndarray  # FOM曲面 [CTLE候选, FFE候选], 被剪枝的候选为NaN, 主游标非正时为-inf
+    ctle_dc_gains: List[float]
+    ffe_candidates: np.ndarray
+    evaluated: int
+
+    def to_dict(self) -> dict:
+        """转换为可JSON序列化的结果"""
+        return {
+            'best': self.best,
+            # NaN和±inf不是合法JSON, 统一输出为None
+            'surface': np.where(np.isfinite(self.surface), self.surface, None).tolist(),
+            'ctle_dc_gains': list(self.ctle_dc_gains),
+            'ffe_candidates': self.ffe_candidates.tolist(),
+            'evaluated': self.evaluated
+        }
+
+
+class EqualizerSweep:
+    """
+    均衡器参数扫描引擎
+    基于一次计算的脉冲响应, 向量化评估所有CTLE/FFE组合, DFE抽头按闭式解求得
+    """
+    max_batch_bytes = 256 * 1024 * 1024
+
+    def __init__(self, pulse_response: np.ndarray, sample_rate: float, bit_rate: float,
+                 planner: Optional[FFTPlanner] = None):
+        self.planner = planner or FFTPlanner(sample_rate)
+        self.sample_rate = float(sample_rate)
+        self.bit_rate = float(bit_rate)
+        self.samples_per_ui = int(round(sample_rate / bit_rate))
+        self.length = len(pulse_response)
+        self.fft_length = self.planner.fast_length(self.length)
+        self.freqs = self.planner.frequencies(self.fft_length)
+        self.pulse_fft = self.planner.rfft(pulse_response, n=self.fft_length)
+
+    def run(self, grid: EqualizerGrid) -> SweepResult:
+        """执行扫描"""
+        errors = grid.validate()
+        if errors:
+            raise ValueError('; '.join(errors))
+
+        ctle = self._ctle_responses(grid)  # [G, K]
+        ffe_taps = grid.ffe_candidates  # [M, 3]
+        ffe = self._ffe_responses(ffe_taps)  # [M, K]
+        noise_var = self._noise_variance(ctle, grid.noise_rms)  # [G]
+
+        # 第一阶段: 仅CTLE(FFE直通)评估, 剪枝明显较差的CTLE候选
+        ctle_pulses = self.planner.irfft(self.pulse_fft * ctle, n=self.fft_length)[:, :self.length]
+        ctle_fom, _ = self._figure_of_merit(ctle_pulses, grid, noise_var)
+        keep = np.flatnonzero(ctle_fom >= np.nanmax(ctle_fom) - grid.prune_margin_db)
+
+        # 第二阶段: 保留的CTLE与全部FFE组合, 分块以控制内存
+        surface = np.full((len(ctle), len(ffe)), np.nan)
+        dfe_surface = np.zeros((len(ctle), len(ffe), grid.dfe_taps))
+        chunk = max(1, self.max_batch_bytes // (len(ffe) * len(self.freqs) * 16))
+        for start in range(0, len(keep), chunk):
+            idx = keep[start:start + chunk]
+            spectra = self.pulse_fft * ctle[idx, None, :] * ffe[None, :, :]
+            pulses = self.planner.irfft(spectra, n=self.fft_length)[..., :self.length]
+            fom, dfe = self._figure_of_merit(pulses, grid, noise_var[idx, None])
+            surface[idx] = fom
+            dfe_surface[idx] = dfe
+
+        best_ctle, best_ffe = np.unravel_index(np.nanargmax(surface), surface.shape)
+        best_fom = float(surface[best_ctle, best_ffe])
+        best = {
+            'fom': best_fom if np.isfinite(best_fom) else None,
+            'ctle_dc_gain': float(grid.ctle_dc_gains[best_ctle]),
+            'ffe_taps': ffe_taps[best_ffe].tolist(),
+            'dfe_taps': dfe_surface[best_ctle, best_ffe].tolist()
+        }
+        return SweepResult(
+            best=best,
+            surface=surface,
+            ctle_dc_gains=grid.ctle_dc_gains,
+            ffe_candidates=ffe_taps,
+            evaluated=len(keep) * len(ffe)
+        )
+
+    def _ctle_responses(self, grid: EqualizerGrid) -> np.ndarray:
+        """堆叠的CTLE传递函数 [G, K]"""
+        gains = 10 ** (np.asarray(grid.ctle_dc_gains, dtype=float)[:, None] / 20)
+        jf = 1j * self.freqs[None, :]
+        p1, p2 = grid.ctle_poles
+        return (gains + jf / grid.ctle_zero) / ((1 + jf / p1) * (1 + jf / p2))
+
+    def _ffe_responses(self, taps: np.ndarray) -> np.ndarray:
+        """FFE频响 [M, K], 抽头间隔为1 UI"""
+        ui = 1 / self.bit_rate
+        delays = np.exp(-2j * np.pi * self.freqs[None, :] * ui * np.arange(3)[:, None])  # [3, K]
+        return taps @ delays
+
+    def _noise_variance(self, ctle: np.ndarray, noise_rms: float) -> np.ndarray:
+        """经CTLE放大后的噪声方差 [G], 按奈奎斯特频率内的平均噪声增益计算"""
+        band = self.freqs <= self.bit_rate / 2
+        return noise_rms ** 2 * np.mean(np.abs(ctle[:, band]) ** 2, axis=-1)
+
+    def _figure_of_merit(self, pulses: np.ndarray, grid: EqualizerGrid, noise_var: np.ndarray):
+        """
+        计算一批脉冲响应的FOM(dB)
+        :param pulses: [..., T]
+        :return: (fom [...], dfe_taps [..., dfe_taps])
+        """
+        spui = self.samples_per_ui
+        cursor = np.argmax(pulses, axis=-1)
+        num_ui = self.length // spui
+        offsets = np.arange(-num_ui, num_ui + 1) * spui
+        positions = cursor[..., None] + offsets
+        valid = (positions >= 0) & (positions < self.length)
+        samples = np.take_along_axis(pulses, np.clip(positions, 0, self.length - 1), axis=-1)
+        samples = np.where(valid, samples, 0.0)
+
+        center = num_ui
+        main = samples[..., center].copy()
+        # DFE闭式解: 抽头等于对应后标, 受幅度上限约束
+        post = samples[..., center + 1:center + 1 + grid.dfe_taps]
+        limit = grid.dfe_max * np.abs(main)[..., None]
+        dfe = np.clip(post, -limit, limit)
+        samples[..., center + 1:center + 1 + grid.dfe_taps] -= dfe
+        samples[..., center] = 0.0
+
+        isi = np.sum(samples ** 2, axis=-1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fom = 10 * np.log10(main ** 2 / (isi + noise_var))
+        fom = np.where(main > 0, fom, -np.inf)
+        return fom, dfe
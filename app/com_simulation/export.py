@@ -0,0 +1,166 @@
+import csv
+import io
+import json
+import shutil
+import tempfile
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Callable, Iterable, List, Optional, Tuple
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from .models import ComSimulation
+from .analysis import ComAnalyzer
+from .artifacts import load_port_waveform
+
+Entry = Tuple[str, bytes]
+
+
+class SimulationExporter:
+    """
+    仿真结果流式导出
+    ZIP写入磁盘临时文件后整体上传到文件存储, 眼图参数直接复用仿真时保存的结果,
+    每批仿真在线程池中并行序列化, 内存占用与导出数量无关; 过期的导出文件由定时任务清理
+    """
+    base_dir = 'com_exports'
+    summary_header = ['ID', 'Name', 'Status', 'Created At', 'Updated At', 'Error Message']
+
+    def __init__(self, batch_size: Optional[int] = None, workers: Optional[int] = None):
+        self.batch_size = batch_size or getattr(settings, 'COM_EXPORT_BATCH_SIZE', 100)
+        self.workers = workers or getattr(settings, 'COM_EXPORT_WORKERS', 4)
+
+    def export(self, ids: list, user_id: int,
+               on_progress: Optional[Callable[[int, int, str], None]] = None) -> dict:
+        """
+        导出仿真并保存到文件存储
+        :param on_progress: 每批完成后回调(已完成数, 总数, 当前仿真名称)
+        :return: 存储路径和访问URL
+        """
+        queryset = ComSimulation.objects.filter(id__in=ids).order_by('id')
+        total = queryset.count()
+
+        with tempfile.TemporaryFile() as archive, tempfile.TemporaryFile() as summary:
+            summary_text = io.TextIOWrapper(summary, encoding='utf-8', newline='', write_through=True)
+            writer = csv.writer(summary_text)
+            writer.writerow(self.summary_header)
+
+            with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zip_file, \
+                    ThreadPoolExecutor(max_workers=self.workers) as executor:
+                done = 0
+                for batch in self._batches(queryset.iterator(chunk_size=self.batch_size)):
+                    for simulation, entries in zip(batch, executor.map(self._serialize, batch)):
+                        for name, data in entries:
+                            zip_file.writestr(name, data)
+                        self._write_waveforms(zip_file, simulation)
+                        writer.writerow(self._summary_row(simulation))
+                    done += len(batch)
+                    if on_progress:
+                        on_progress(done, total, batch[-1].name)
+
+                summary_text.detach()
+                summary.seek(0)
+                with zip_file.open('summary.csv', 'w') as target:
+                    shutil.copyfileobj(summary, target)
+
+            archive.seek(0)
+            path = default_storage.save(
+                f"{self.base_dir}/{user_id}/{uuid.uuid4().hex}.zip",
+                File(archive)
+            )
+
+        return {'path': path, 'url': default_storage.url(path), 'total': total}
+
+    def cleanup(self, max_age_hours: Optional[float] = None) -> int:
+        """
+        删除超过保留时间的导出文件
+        下载地址只在导出进度缓存中保存1小时, 之后文件不再可达
+        :return: 删除的文件数
+        """
+        max_age_hours = max_age_hours or getattr(settings, 'COM_EXPORT_EXPIRY_HOURS', 2)
+        cutoff = timezone.now() - timedelta(hours=max_age_hours)
+        try:
+            user_dirs, _ = default_storage.listdir(self.base_dir)
+        except FileNotFoundError:
+            return 0
+        deleted = 0
+        for user_dir in user_dirs:
+            directory = f"{self.base_dir}/{user_dir}"
+            _, files = default_storage.listdir(directory)
+            for name in files:
+                path = f"{directory}/{name}"
+                if default_storage.get_modified_time(path) < cutoff:
+                    default_storage.delete(path)
+                    deleted += 1
+        return deleted
+
+    def _batches(self, simulations: Iterable[ComSimulation]) -> Iterable[List[ComSimulation]]:
+        """按批次切分, 每批并行序列化"""
+        batch = []
+        for simulation in simulations:
+            batch.append(simulation)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _serialize(self, simulation: ComSimulation) -> List[Entry]:
+        """序列化单个仿真的参数、结果和眼图参数"""
+        params = {
+            'id': simulation.id,
+            'name': simulation.name,
+            'parameters': simulation.parameters,
+            'created_at': simulation.created_at.isoformat(),
+            'status': simulation.status
+        }
+        entries = [(f'{simulation.id}/parameters.json', json.dumps(params, indent=2).encode())]
+
+        result_data = simulation.result_data
+        if not result_data:
+            return entries
+        entries.append((f'{simulation.id}/results.json', json.dumps(result_data, indent=2).encode()))
+
+        if simulation.status == 'completed':
+            for name, port_result in (result_data.get('port_results') or {}).items():
+                if not port_result:
+                    continue
+                entries.append((
+                    f'{simulation.id}/eye_diagram_port_{name}.json',
+                    json.dumps(self._eye_params(result_data, port_result), indent=2).encode()
+                ))
+        return entries
+
+    def _eye_params(self, result_data: dict, port_result: dict) -> dict:
+        """优先使用仿真时保存的眼图参数, 仅旧数据缺失时重新分析"""
+        if port_result.get('eye_params'):
+            return port_result['eye_params']
+        eye_params = ComAnalyzer(result_data).analyze_eye_diagram(load_port_waveform(port_result))
+        return eye_params.__dict__
+
+    def _write_waveforms(self, zip_file: zipfile.ZipFile, simulation: ComSimulation):
+        """将存储中的端口波形文件分块复制进压缩包"""
+        if simulation.status != 'completed' or not simulation.result_data:
+            return
+        for port_result in (simulation.result_data.get('port_results') or {}).values():
+            ref = (port_result or {}).get('time_data_ref')
+            if not ref or not default_storage.exists(ref['path']):
+                continue
+            arcname = f"{simulation.id}/{ref['path'].rsplit('/', 1)[-1]}"
+            with default_storage.open(ref['path'], 'rb') as source, zip_file.open(arcname, 'w') as target:
+                shutil.copyfileobj(source, target)
+
+    @staticmethod
+    def _summary_row(simulation: ComSimulation) -> list:
+        """汇总CSV中的一行"""
+        return [
+            simulation.id,
+            simulation.name,
+            simulation.status,
+            simulation.created_at.isoformat(),
+            simulation.updated_at.isoformat(),
+            (simulation.result_data or {}).get('error', '')
+        ]
+
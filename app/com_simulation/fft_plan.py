@@ -0,0 +1,90 @@
+from functools import lru_cache
+from typing import Optional
+import os
+import numpy as np
+from scipy import fft as sp_fft
+from scipy.signal import get_window
+from django.conf import settings
+
+
+@lru_cache(maxsize=64)
+def _rfft_frequencies(length: int, sample_rate: float) -> np.ndarray:
+    """按(长度, 采样率)缓存的rfft频率网格"""
+    freqs = sp_fft.rfftfreq(length, 1 / sample_rate)
+    freqs.setflags(write=False)
+    return freqs
+
+
+@lru_cache(maxsize=64)
+def _window(name: str, length: int) -> np.ndarray:
+    """按(窗类型, 长度)缓存的窗函数"""
+    window = get_window(name, length)
+    window.setflags(write=False)
+    return window
+
+
+class FFTPlanner:
+    """FFT规划器
+
+    负责将变换长度填充到快速长度、复用频率网格和窗函数，
+    并支持沿指定轴的批量多通道变换。大变换使用多线程执行。
+    """
+    def __init__(self, sample_rate: float, workers: Optional[int] = None,
+                 parallel_threshold: Optional[int] = None):
+        self.sample_rate = float(sample_rate)
+        self.workers = workers or getattr(settings, 'COM_FFT_WORKERS', os.cpu_count() or 1)
+        self.parallel_threshold = parallel_threshold or getattr(
+            settings, 'COM_FFT_PARALLEL_THRESHOLD', 1 << 16
+        )
+
+    def fast_length(self, length: int) -> int:
+        """获取不小于length的快速FFT长度"""
+        return sp_fft.next_fast_len(int(length), real=True)
+
+    def frequencies(self, length: int) -> np.ndarray:
+        """获取rfft频率网格(只读, 跨调用复用)"""
+        return _rfft_frequencies(int(length), self.sample_rate)
+
+    def window(self, length: int, name: str = 'hann') -> np.ndarray:
+        """获取窗函数(只读, 跨调用复用)"""
+        return _window(name, int(length))
+
+    def rfft(self, data: np.ndarray, n: Optional[int] = None, axis: int = -1) -> np.ndarray:
+        """沿axis执行实数FFT, 多通道数据一次完成"""
+        data = np.asarray(data)
+        length = n or data.shape[axis]
+        return sp_fft.rfft(data, n=length, axis=axis,
+                           workers=self._workers_for(data.size // data.shape[axis] * length))
+
+    def irfft(self, spectrum: np.ndarray, n: int, axis: int = -1) -> np.ndarray:
+        """沿axis执行实数逆FFT"""
+        spectrum = np.asarray(spectrum)
+        return sp_fft.irfft(spectrum, n=n, axis=axis,
+                            workers=self._workers_for(spectrum.size // spectrum.shape[axis] * n))
+
+    def interpolate(self, freq_points: np.ndarray, frequencies: np.ndarray,
+                    response: np.ndarray) -> np.ndarray:
+        """
+        将频域响应线性插值到FFT频点
+        :param freq_points: 目标频点 [K]
+        :param frequencies: 原始频点 [F]
+        :param response: 原始响应 [F] 或 [F, C]
+        :return: [K] 或 [C, K], 端点外取边界值(与np.interp一致)
+        """
+        frequencies = np.asarray(frequencies, dtype=float)
+        response = np.asarray(response)
+        if response.ndim == 1:
+            return np.interp(freq_points, frequencies, response)
+
+        # 一次计算插值索引和权重, 对所有通道复用
+        upper = np.clip(np.searchsorted(frequencies, freq_points), 1, len(frequencies) - 1)
+        lower = upper - 1
+        span = frequencies[upper] - frequencies[lower]
+        weight = np.clip((freq_points - frequencies[lower]) / np.where(span == 0, 1, span), 0, 1)
+        flat = response.reshape(len(frequencies), -1)
+        result = flat[lower] * (1 - weight)[:, None] + flat[upper] * weight[:, None]
+        return np.moveaxis(result.reshape((len(freq_points),) + response.shape[1:]), 0, -1)
+
+    def _workers_for(self, size: int) -> int:
+        """小变换单线程执行, 避免线程调度开销"""
+        return self.workers if size >= self.parallel_threshold else 1
@@ -0,0 +1,144 @@
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from scipy.special import ndtri
+from scipy.stats import norm
+
+
+def find_crossings(eye_data: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    向量化查找眼图数据中的阈值交叉点
+    按连续波形查找, 相邻UI之间(上一UI末尾到下一UI开头)的跳变同样计入
+    :param eye_data: [UI数, 每UI采样数], 各行首尾相接
+    :return: 交叉点在UI内的位置(采样点, 线性插值, 取值[0, 每UI采样数))
+    """
+    samples_per_ui = eye_data.shape[-1]
+    waveform = np.ravel(eye_data)
+    above = waveform >= threshold
+    index = np.flatnonzero(above[1:] != above[:-1])
+    y1 = waveform[index]
+    y2 = waveform[index + 1]
+    return (index + (threshold - y1) / (y2 - y1)) % samples_per_ui
+
+
+def crossing_offsets(crossings: np.ndarray, samples_per_ui: int, center: Optional[float] = None) -> np.ndarray:
+    """
+    交叉点相对中心的偏移(UI), 折叠到[-0.5, 0.5)
+    :param center: 交叉中心位置(采样点), 默认取圆周均值, 中心位于UI边界附近时同样正确
+    """
+    crossings = np.asarray(crossings)
+    if center is None:
+        phase = 2 * np.pi * crossings / samples_per_ui
+        center = np.angle(np.mean(np.exp(1j * phase))) * samples_per_ui / (2 * np.pi) if len(phase) else 0.0
+    offsets = (crossings - center) / samples_per_ui
+    return (offsets + 0.5) % 1.0 - 0.5
+
+
+@dataclass
+class JitterHistogram:
+    """交叉点直方图, 以UI为单位, 中心为交叉点均值"""
+    counts: np.ndarray
+    edges: np.ndarray
+
+    @classmethod
+    def from_crossings(cls, crossings: np.ndarray, samples_per_ui: int, bins: int = 256,
+                       center: Optional[float] = None) -> 'JitterHistogram':
+        """
+        将交叉点折叠到以center为中心的一个UI内并分箱
+        :param center: 交叉中心位置(采样点), 默认取圆周均值
+        """
+        offsets = crossing_offsets(crossings, samples_per_ui, center)
+        counts, edges = np.histogram(offsets, bins=bins, range=(-0.5, 0.5))
+        return cls(counts=counts, edges=edges)
+
+    def merge(self, other: 'JitterHistogram') -> 'JitterHistogram':
+        """合并相同分箱的直方图"""
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("直方图分箱不一致")
+        return JitterHistogram(counts=self.counts + other.counts, edges=self.edges)
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+
+@dataclass
+class JitterDecomposition:
+    """双狄拉克抖动分解结果(单位: UI)"""
+    random_jitter: float         # RJ, 高斯尾部标准差
+    deterministic_jitter: float  # DJ(δδ), 两个狄拉克位置之差
+    total_jitter: float          # TJ@BER
+    target_ber: float
+    crossings: int
+
+    def to_dict(self) -> dict:
+        """转换为可JSON序列化的结果"""
+        return {
+            'rj': self.random_jitter,
+            'dj': self.deterministic_jitter,
+            'tj': self.total_jitter,
+            'target_ber': self.target_ber,
+            'crossings': self.crossings
+        }
+
+
+class DualDiracFitter:
+    """
+    双狄拉克模型拟合
+    左右尾部累积概率在Q刻度下为直线, 斜率给出RJ, 截距给出两个狄拉克的位置;
+    拟合只在直方图分箱上进行, 计算量与交叉点数量无关
+    """
+    def __init__(self, tail_probability: float = 0.1, rho: float = 0.5):
+        """
+        :param tail_probability: 参与拟合的尾部累积概率上限
+        :param rho: 每个狄拉克的跳变密度
+        """
+        self.tail_probability = tail_probability
+        self.rho = rho
+
+    def fit(self, histogram: JitterHistogram, target_ber: float = 1e-12) -> JitterDecomposition:
+        """拟合并计算RJ/DJ/TJ"""
+        total = histogram.total
+        if total == 0:
+            return JitterDecomposition(0.0, 0.0, 0.0, target_ber, 0)
+
+        centers = (histogram.edges[:-1] + histogram.edges[1:]) / 2
+        pdf = histogram.counts / total
+        cdf = np.cumsum(pdf)
+        sf = np.cumsum(pdf[::-1])[::-1]
+
+        left = self._fit_tail(centers, cdf)
+        right = self._fit_tail(-centers, sf)
+        if left is None or right is None:
+            # 尾部样本不足时退化为纯高斯模型
+            mean = np.sum(centers * pdf)
+            sigma = float(np.sqrt(np.sum((centers - mean) ** 2 * pdf)))
+            mu_left, mu_right = mean, mean
+        else:
+            (sigma_left, mu_left), (sigma_right, mu_right) = left, right
+            mu_right = -mu_right
+            sigma = (sigma_left + sigma_right) / 2
+
+        dj = max(0.0, float(mu_right - mu_left))
+        q_ber = float(norm.isf(target_ber))
+        return JitterDecomposition(
+            random_jitter=float(sigma),
+            deterministic_jitter=dj,
+            total_jitter=dj + 2 * q_ber * float(sigma),
+            target_ber=target_ber,
+            crossings=total
+        )
+
+    def _fit_tail(self, positions: np.ndarray, cumulative: np.ndarray):
+        """
+        在Q刻度下线性拟合左尾 Q(x) = (x - μ) / σ
+        :return: (σ, μ), 有效点不足时返回None
+        """
+        mask = (cumulative > 0) & (cumulative <= self.tail_probability * self.rho)
+        if np.count_nonzero(mask) < 2:
+            return None
+        q = ndtri(cumulative[mask] / self.rho)
+        slope, intercept = np.polyfit(positions[mask], q, 1)
+        if slope <= 0:
+            return None
+        return 1.0 / slope, -intercept / slope
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from app.com_simulation.memoization import ResultMemoizer
+
+
+class Command(BaseCommand):
+    """清除Com仿真结果记忆"""
+    help = '清除非当前引擎版本(或全部)的Com仿真结果记忆'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='清除全部记忆, 包括当前引擎版本')
+
+    def handle(self, *args, **options):
+        memoizer = ResultMemoizer()
+        deleted = memoizer.invalidate(all_versions=options['all'])
+        self.stdout.write(f"已清除 {deleted} 条仿真结果记忆 (当前引擎版本: {memoizer.engine_version})")
@@ -0,0 +1,88 @@
+import copy
+import hashlib
+import logging
+from typing import Optional
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F
+from .artifacts import WaveformArtifactStore
+from .models import ComSimulation, ComResultMemo
+from .validators import SimulationParameters
+
+logger = logging.getLogger(__name__)
+
+
+class ResultMemoizer:
+    """
+    Com仿真结果记忆
+    键由(S参数内容哈希, 规范化仿真参数, 引擎版本)组成, 相同输入的新仿真直接复用已有结果并复制波形文件
+    """
+    def __init__(self, engine_version: Optional[str] = None):
+        self.engine_version = engine_version or getattr(settings, 'COM_ENGINE_VERSION', '1')
+
+    def make_key(self, simulation: ComSimulation, params: SimulationParameters) -> Optional[str]:
+        """生成记忆键, S参数文件不可用时返回None"""
+        content_hash = simulation.s_parameter.get_content_hash()
+        if not content_hash:
+            return None
+        parts = [content_hash, params.canonical_hash(), self.engine_version]
+        return hashlib.sha256('|'.join(parts).encode()).hexdigest()
+
+    def lookup(self, key: str, simulation: ComSimulation) -> Optional[dict]:
+        """
+        查找已记忆的结果
+        波形文件复制到新仿真的目录下, 来源仿真删除或过期清理后不会留下悬空引用;
+        来源波形已不存在时删除该记忆并按未命中处理
+        """
+        memo = ComResultMemo.objects.filter(key=key, engine_version=self.engine_version).first()
+        if memo is None:
+            return None
+        result_data = copy.deepcopy(memo.result_data)
+        if not self._copy_waveforms(result_data, simulation):
+            logger.info(f"仿真结果记忆的波形文件已不存在, 删除记忆: {key}")
+            memo.delete()
+            return None
+        ComResultMemo.objects.filter(pk=memo.pk).update(hit_count=F('hit_count') + 1)
+        result_data['memoized_from'] = memo.source_id
+        return result_data
+
+    @staticmethod
+    def _copy_waveforms(result_data: dict, simulation: ComSimulation) -> bool:
+        """将结果引用的波形复制给simulation并改写引用, 任一文件缺失时返回False"""
+        store = WaveformArtifactStore()
+        copied = []
+        for port_result in (result_data.get('port_results') or {}).values():
+            ref = (port_result or {}).get('time_data_ref')
+            if not ref:
+                continue
+            new_ref = store.copy(ref, simulation.id)
+            if new_ref is None:
+                for saved in copied:
+                    store.delete(saved)
+                return False
+            port_result['time_data_ref'] = new_ref
+            copied.append(new_ref)
+        return True
+
+    def store(self, key: str, simulation: ComSimulation, result_data: dict):
+        """记录仿真结果, 并发写入同一键时保留先写入者"""
+        try:
+            ComResultMemo.objects.create(
+                key=key,
+                engine_version=self.engine_version,
+                source=simulation,
+                result_data=result_data
+            )
+        except IntegrityError:
+            logger.info(f"仿真结果记忆已存在: {key}")
+
+    def invalidate(self, all_versions: bool = False) -> int:
+        """
+        清除记忆
+        :param all_versions: True时清除全部, 否则只清除非当前引擎版本的记录
+        """
+        memos = ComResultMemo.objects.all()
+        if not all_versions:
+            memos = memos.exclude(engine_version=self.engine_version)
+        deleted, _ = memos.delete()
+        return deleted
@@ -23,8 +23,27 @@ class ComSimulation(TimeStampedModel):
         related_name='com_simulations',
         verbose_name="S参数文件"
     )
+    parameters = models.JSONField(default=dict, verbose_name="仿真参数")
+    batch_id = models.CharField(max_length=32, blank=True, db_index=True, verbose_name="批次ID")
     result_data = models.JSONField(null=True, verbose_name="仿真结果")
     
     class Meta:
         verbose_name = "Com仿真"
-        verbose_name_plural = verbose_name 
\ No newline at end of file
+        verbose_name_plural = verbose_name 
+
+class ComResultMemo(TimeStampedModel):
+    """Com仿真结果记忆(按S参数内容、仿真参数和引擎版本寻址)"""
+    key = models.CharField(max_length=64, unique=True, verbose_name="记忆键")
+    engine_version = models.CharField(max_length=32, db_index=True, verbose_name="引擎版本")
+    source = models.ForeignKey(
+        ComSimulation,
+        on_delete=models.CASCADE,
+        related_name='result_memos',
+        verbose_name="来源仿真"
+    )
+    result_data = models.JSONField(verbose_name="仿真结果")
+    hit_count = models.IntegerField(default=0, verbose_name="命中次数")
+
+    class Meta:
+        verbose_name = "Com仿真结果记忆"
+        verbose_name_plural = verbose_name
@@ -0,0 +1,130 @@
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Tuple, Any
+import logging
+import billiard
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SharedArray:
+    """
+    共享内存数组
+    父进程创建并写入一次, 子进程通过spec按名称零拷贝挂载
+    """
+    def __init__(self, array: np.ndarray):
+        array = np.ascontiguousarray(array)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        view = np.ndarray(array.shape, dtype=array.dtype, buffer=self._shm.buf)
+        view[...] = array
+        del view
+        self.spec = {
+            'name': self._shm.name,
+            'shape': array.shape,
+            'dtype': array.dtype.str
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def release(self):
+        """释放并删除共享内存段"""
+        self._shm.close()
+        self._shm.unlink()
+
+    @staticmethod
+    def attach(spec: dict) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+        """
+        在子进程中挂载共享数组, 调用方负责在使用完毕后close
+        共享内存段只由创建者删除: Python 3.13以下挂载也会登记到resource_tracker(bpo-38119),
+        若挂载方使用独立的tracker, 退出时会告警泄漏并删除创建者仍在使用的段, 因此挂载后取消登记;
+        与创建者共用tracker(fork/spawn的子进程)时登记是重复的, 不能取消, 否则创建者删除时tracker报错
+        """
+        try:
+            shm = shared_memory.SharedMemory(name=spec['name'], track=False)
+        except TypeError:
+            inherited_tracker = resource_tracker._resource_tracker._fd is not None
+            shm = shared_memory.SharedMemory(name=spec['name'])
+            if not inherited_tracker:
+                resource_tracker.unregister(shm._name, 'shared_memory')
+        array = np.ndarray(spec['shape'], dtype=np.dtype(spec['dtype']), buffer=shm.buf)
+        return shm, array
+
+
+def _calculate_port_worker(spec: dict, frequencies: np.ndarray, port: int,
+                           freq_range: tuple, sim_settings: dict) -> Tuple[Any, List[str]]:
+    """进程池中执行的单端口计算"""
+    from .services import ComSimulationProcessor
+
+    shm, s_parameters = SharedArray.attach(spec)
+    try:
+        processor = ComSimulationProcessor(None)
+        result = processor._calculate_port(
+            {'frequencies': frequencies, 's_parameters': s_parameters},
+            port,
+            freq_range,
+            sim_settings
+        )
+        return result, processor.errors
+    finally:
+        del s_parameters
+        shm.close()
+
+
+class ParallelPortRunner:
+    """按端口并行执行COM计算"""
+    def __init__(self, pool_size: int = None):
+        self.pool_size = pool_size or getattr(settings, 'COM_SIMULATION_POOL_SIZE', 1)
+
+    def run(self, s_param_data: dict, port_mapping: Dict[str, int], freq_range: tuple,
+            sim_settings: dict) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        执行所有端口计算
+        :return: (port_results, errors)
+        """
+        frequencies = np.asarray(s_param_data['frequencies'])
+        s_parameters = np.asarray(s_param_data['s_parameters'])
+
+        if self.pool_size <= 1 or len(port_mapping) <= 1:
+            return self._run_serial(frequencies, s_parameters, port_mapping, freq_range, sim_settings)
+
+        port_results = {}
+        errors = []
+        with SharedArray(s_parameters) as shared:
+            processes = min(self.pool_size, len(port_mapping))
+            # 使用billiard进程池, Celery prefork子进程中也允许创建子进程
+            pool = billiard.Pool(processes=processes)
+            try:
+                pending = {
+                    name: pool.apply_async(
+                        _calculate_port_worker,
+                        (shared.spec, frequencies, port, freq_range, sim_settings)
+                    )
+                    for name, port in port_mapping.items()
+                }
+                for name, async_result in pending.items():
+                    result, port_errors = async_result.get()
+                    port_results[name] = result
+                    errors.extend(port_errors)
+            finally:
+                pool.close()
+                pool.join()
+
+        logger.info(f"并行完成{len(port_mapping)}个端口计算, 进程数: {processes}")
+        return port_results, errors
+
+    def _run_serial(self, frequencies, s_parameters, port_mapping, freq_range, sim_settings):
+        """串行执行, 用于单端口或未配置进程池的情况"""
+        from .services import ComSimulationProcessor
+
+        processor = ComSimulationProcessor(None)
+        s_param_data = {'frequencies': frequencies, 's_parameters': s_parameters}
+        port_results = {
+            name: processor._calculate_port(s_param_data, port, freq_range, sim_settings)
+            for name, port in port_mapping.items()
+        }
+        return port_results, processor.errors
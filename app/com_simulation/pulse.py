@@ -0,0 +1,50 @@
+from typing import Optional
+import numpy as np
+from django.conf import settings
+from app.core.cache.manager import CacheManager
+from app.fom_chi.loader import load_s_parameter_arrays
+from .fft_plan import FFTPlanner
+
+
+def compute_pulse_responses(frequencies: np.ndarray, responses: np.ndarray, sample_rate: float,
+                            bit_rate: float, num_ui: int = 64,
+                            planner: Optional[FFTPlanner] = None) -> np.ndarray:
+    """
+    计算单比特(1 UI矩形脉冲)经过信道后的脉冲响应
+    :param frequencies: 频点 [F]
+    :param responses: 信道频响 [F] 或 [F, C], 多通道时一次批量变换
+    :param num_ui: 脉冲响应截取长度(UI数)
+    :return: [T] 或 [C, T], T = num_ui * samples_per_ui
+    """
+    planner = planner or FFTPlanner(sample_rate)
+    samples_per_ui = int(round(sample_rate / bit_rate))
+    total_samples = num_ui * samples_per_ui
+    fft_length = planner.fast_length(total_samples)
+
+    channel = planner.interpolate(planner.frequencies(fft_length), frequencies, responses)
+
+    pulse = np.zeros(fft_length)
+    pulse[:samples_per_ui] = 1.0
+    pulse_fft = planner.rfft(pulse)
+
+    return planner.irfft(pulse_fft * channel, n=fft_length)[..., :total_samples]
+
+
+def load_pulse_responses(parameter, sample_rate: float, bit_rate: float, num_ui: int = 64) -> np.ndarray:
+    """
+    全频段所有端口对的脉冲响应 [P, P, T], 按文件内容哈希缓存
+    串扰聚合在全频段计算时直接按端口对取用, 缓存预热时预先生成
+    """
+    cache_manager = CacheManager(
+        backend=getattr(settings, 'COM_PULSE_CACHE_BACKEND', 'file'),
+        timeout=settings.CACHE_TIMEOUTS.get('long', 86400)
+    )
+    content_hash = parameter.get_content_hash()
+    cache_key = f"com_pulses_{content_hash or parameter.id}_{sample_rate:g}_{bit_rate:g}_{num_ui}"
+
+    pulses = cache_manager.get(cache_key)
+    if pulses is None:
+        frequencies, s_parameters = load_s_parameter_arrays(parameter)
+        pulses = compute_pulse_responses(frequencies, s_parameters, sample_rate, bit_rate, num_ui=num_ui)
+        cache_manager.set(cache_key, pulses, tags=[f"parameter_{parameter.id}"])
+    return pulses
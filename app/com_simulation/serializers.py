@@ -0,0 +1,52 @@
+from rest_framework import serializers
+from app.parameter.models import SParameter
+from .models import ComSimulation
+from .validators import SimulationParameters
+
+
+class ComSimulationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ComSimulation
+        fields = ['id', 'name', 'description', 'status', 's_parameter', 'parameters',
+                  'batch_id', 'created_at', 'updated_at']
+        read_only_fields = ['status', 'batch_id', 'created_at', 'updated_at']
+
+    def validate_parameters(self, value):
+        """验证仿真参数"""
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("仿真参数必须是对象")
+        errors = build_simulation_parameters(value).validate()
+        if errors:
+            raise serializers.ValidationError(errors)
+        return value
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """按主键从上下文中预先查询的对象字典(context['prefetched'])取值, 批量校验时不逐条查询数据库"""
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return self.context['prefetched'][int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
+class BulkComSimulationSerializer(ComSimulationSerializer):
+    """批量创建时逐条校验, S参数由调用方一次查询后通过上下文传入"""
+    s_parameter = PrefetchedPrimaryKeyRelatedField(queryset=SParameter.objects.all())
+
+    class Meta(ComSimulationSerializer.Meta):
+        extra_kwargs = {'parameters': {'required': True}}
+
+
+def build_simulation_parameters(parameters: dict) -> SimulationParameters:
+    """从存储的参数字典构造仿真参数对象"""
+    return SimulationParameters(
+        frequency_range=(parameters.get('start_freq'), parameters.get('end_freq')),
+        port_mapping=parameters.get('port_mapping', {}),
+        settings=parameters.get('settings', {})
+    )
@@ -1,6 +1,14 @@
 from app.core.services import ProcessingService
 from .models import ComSimulation
-from .parameters import SimulationParameters
+from .validators import SimulationParameters
+from .analysis import ComAnalyzer
+from .fft_plan import FFTPlanner
+from .parallel import ParallelPortRunner
+from .pulse import compute_pulse_responses, load_pulse_responses
+from .equalization import EqualizerGrid, EqualizerSweep
+from .crosstalk import CrosstalkAggregator
+from .artifacts import WaveformArtifactStore
+from .memoization import ResultMemoizer
 import numpy as np
 
 class ComSimulationProcessor(ProcessingService):
@@ -31,6 +39,17 @@ class ComSimulationProcessor(ProcessingService):
                     self.add_error(error)
                 return None
 
+            # 相同S参数内容、参数和引擎版本的结果直接复用
+            memoizer = ResultMemoizer()
+            memo_key = memoizer.make_key(self.simulation, params)
+            if memo_key:
+                memoized_result = memoizer.lookup(memo_key, self.simulation)
+                if memoized_result is not None:
+                    self.simulation.result_data = memoized_result
+                    self.simulation.status = 'completed'
+                    self.simulation.save()
+                    return memoized_result
+
             # 更新状态
             self.simulation.status = self.status
             self.simulation.save()
@@ -46,6 +65,9 @@ class ComSimulationProcessor(ProcessingService):
             self.simulation.status = 'completed'
             self.simulation.save()
             
+            if memo_key and processed_result and not self.has_errors():
+                memoizer.store(memo_key, self.simulation, processed_result)
+            
             return processed_result
         except Exception as e:
             self.simulation.status = 'failed'
@@ -56,15 +78,18 @@ class ComSimulationProcessor(ProcessingService):
     def _process_result(self, result_data: dict) -> dict:
         """处理仿真结果"""
         # 添加结果验证
-        if not result_data.get('success'):
-            self.add_error(result_data.get('error', '仿真失败'))
+        if not result_data or not result_data.get('success'):
+            self.add_error((result_data or {}).get('error', '仿真失败'))
             return None
             
-        # 添加结果分析
+        # 添加结果分析(结果中包含数值序列时)
+        values = result_data.get('values')
+        if not values:
+            return result_data
         analysis = {
-            'max_value': max(result_data.get('values', [])),
-            'min_value': min(result_data.get('values', [])),
-            'average': sum(result_data.get('values', [])) / len(result_data.get('values', [1])),
+            'max_value': max(values),
+            'min_value': min(values),
+            'average': sum(values) / len(values),
         }
         
         return {
@@ -97,15 +122,26 @@ class ComSimulationProcessor(ProcessingService):
                 'success': True
             }
             
-            # 对每个端口对执行计算
-            for name, port in port_mapping.items():
-                port_result = self._calculate_port(
+            # 按端口扇出到进程池, S参数数组通过共享内存传递
+            runner = ParallelPortRunner()
+            port_results, errors = runner.run(
+                s_param_data,
+                port_mapping,
+                params.frequency_range,
+                params.settings
+            )
+            for error in errors:
+                self.add_error(error)
+            self._store_waveforms(port_results)
+            result['port_results'].update(port_results)
+            
+            # 多干扰源串扰聚合
+            if params.settings.get('crosstalk'):
+                result['crosstalk'] = self._aggregate_crosstalk(
                     s_param_data,
-                    port,
                     params.frequency_range,
                     params.settings
                 )
-                result['port_results'][name] = port_result
             
             return result
         except Exception as e:
@@ -114,6 +150,48 @@ class ComSimulationProcessor(ProcessingService):
                 'error': str(e)
             }
 
+    def _store_waveforms(self, port_results: dict):
+        """将端口波形写入二进制存储, result_data中只保留引用和抽取预览"""
+        store = WaveformArtifactStore()
+        for name, port_result in port_results.items():
+            if not port_result or 'time_data' not in port_result:
+                continue
+            waveform = port_result.pop('time_data')
+            port_result['time_data_ref'] = store.save(self.simulation.id, f"port_{name}", waveform)
+            port_result['time_data_preview'] = store.preview(waveform)
+
+    def _aggregate_crosstalk(self, s_param_data: dict, freq_range: tuple, settings: dict) -> dict:
+        """计算受害通道在所有干扰源作用下的串扰"""
+        start_freq, end_freq = freq_range
+        frequencies = np.asarray(s_param_data['frequencies'])
+        freq_mask = np.logical_and(frequencies >= start_freq, frequencies <= end_freq)
+        
+        xt_settings = settings['crosstalk']
+        aggregator = CrosstalkAggregator(
+            frequencies[freq_mask],
+            np.asarray(s_param_data['s_parameters'])[freq_mask],
+            settings.get('sample_rate', 1e9),
+            settings.get('bit_rate', 1e9),
+            num_ui=xt_settings.get('num_ui', 64)
+        )
+        
+        # 全频段计算时使用按文件内容缓存的脉冲响应(可由缓存预热生成)
+        pulse_matrix = None
+        if freq_mask.all():
+            pulse_matrix = load_pulse_responses(
+                self.simulation.s_parameter,
+                aggregator.sample_rate,
+                aggregator.bit_rate,
+                num_ui=aggregator.num_ui
+            )
+        return aggregator.aggregate(
+            tuple(xt_settings['victim']),
+            [tuple(pair) for pair in xt_settings['aggressors']],
+            method=xt_settings.get('method', 'power_sum'),
+            target_ber=xt_settings.get('target_ber', 1e-12),
+            pulse_matrix=pulse_matrix
+        ).to_dict()
+
     def _calculate_port(self, s_param_data: dict, port: int, freq_range: tuple, settings: dict) -> dict:
         """计算单个端口的结果"""
         try:
@@ -131,10 +209,10 @@ class ComSimulationProcessor(ProcessingService):
             sample_rate = settings.get('sample_rate', 1e9)
             bit_rate = settings.get('bit_rate', 1e9)
             
-            # 生成时域响应
+            # 生成时域响应(只取从输入端口到该端口的传输通道)
             time_data = self._generate_time_response(
                 frequencies,
-                port_data,
+                self._through_channel(port_data, settings),
                 sample_rate,
                 bit_rate
             )
@@ -142,24 +220,61 @@ class ComSimulationProcessor(ProcessingService):
             # 分析眼图
             analyzer = ComAnalyzer({
                 'sample_rate': sample_rate,
-                'bit_rate': bit_rate
+                'bit_rate': bit_rate,
+                'target_ber': settings.get('target_ber', 1e-12)
             })
             eye_params = analyzer.analyze_eye_diagram(time_data)
             
-            return {
+            port_result = {
                 'port': port,
-                'time_data': time_data.tolist(),
+                'time_data': time_data,
                 'eye_params': {
                     'height': eye_params.height,
                     'width': eye_params.width,
                     'jitter': eye_params.jitter,
-                    'crossing': eye_params.crossing_percentage
+                    'crossing': eye_params.crossing_percentage,
+                    'rj': eye_params.random_jitter,
+                    'dj': eye_params.deterministic_jitter,
+                    'tj': eye_params.total_jitter
                 }
             }
+            
+            # 均衡器参数扫描
+            if settings.get('equalizer'):
+                port_result['equalizer'] = self._optimize_equalizer(
+                    frequencies,
+                    port_data,
+                    sample_rate,
+                    bit_rate,
+                    settings['equalizer']
+                )
+            
+            return port_result
         except Exception as e:
             self.add_error(f"端口{port}计算失败: {str(e)}")
             return None
 
+    def _through_channel(self, port_data: np.ndarray, settings: dict) -> np.ndarray:
+        """端口一行S参数 [F, N] 中输入端口对应的传输通道 [F], 未指定时使用均衡器的输入端口"""
+        if port_data.ndim == 1:
+            return port_data
+        input_port = settings.get('input_port', (settings.get('equalizer') or {}).get('input_port', 0))
+        return port_data[:, input_port]
+
+    def _optimize_equalizer(self, frequencies: np.ndarray, port_data: np.ndarray,
+                            sample_rate: float, bit_rate: float, eq_settings: dict) -> dict:
+        """基于一次计算的脉冲响应扫描CTLE/FFE/DFE设置"""
+        channel = port_data[:, eq_settings['input_port']] if port_data.ndim > 1 else port_data
+        pulse = compute_pulse_responses(
+            frequencies,
+            channel,
+            sample_rate,
+            bit_rate,
+            num_ui=eq_settings.get('num_ui', 64)
+        )
+        sweep = EqualizerSweep(pulse, sample_rate, bit_rate)
+        return sweep.run(EqualizerGrid.from_dict(eq_settings)).to_dict()
+
     def _generate_time_response(self, frequencies: np.ndarray, s_parameters: np.ndarray,
                               sample_rate: float, bit_rate: float) -> np.ndarray:
         """生成时域响应"""
@@ -170,24 +285,22 @@ class ComSimulationProcessor(ProcessingService):
         
         # 生成PRBS序列
         prbs_seq = self._generate_prbs_sequence(num_bits)
-        
-        # 生成基带信号
-        time = np.arange(total_samples) / sample_rate
         baseband = np.repeat(prbs_seq, samples_per_bit)
         
-        # 频域转换
-        freq_response = np.zeros(total_samples//2 + 1, dtype=complex)
-        freq_points = np.fft.rfftfreq(total_samples, 1/sample_rate)
+        # 填充到快速FFT长度, 避免质数长度导致的慢速变换
+        planner = FFTPlanner(sample_rate)
+        fft_length = planner.fast_length(total_samples)
+        freq_points = planner.frequencies(fft_length)
         
-        # 插值S参数到所需频点
-        interpolated_s = np.interp(freq_points, frequencies, s_parameters)
+        # 插值S参数到所需频点, 多通道时为 [C, K]
+        interpolated_s = planner.interpolate(freq_points, frequencies, s_parameters)
         
         # 应用信道响应
-        signal_fft = np.fft.rfft(baseband)
+        signal_fft = planner.rfft(baseband, n=fft_length)
         output_fft = signal_fft * interpolated_s
         
-        # 转回时域
-        time_signal = np.fft.irfft(output_fft)
+        # 转回时域并截取原始长度
+        time_signal = planner.irfft(output_fft, n=fft_length)[..., :total_samples]
         
         return time_signal
 
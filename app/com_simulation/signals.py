@@ -0,0 +1,12 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from .artifacts import WaveformArtifactStore
+from .models import ComSimulation
+
+
+@receiver(post_delete, sender=ComSimulation)
+def delete_waveform_artifacts(sender, instance, **kwargs):
+    """删除仿真时清理其波形文件(事务提交后执行, 回滚时保留)"""
+    simulation_id = instance.id
+    transaction.on_commit(lambda: WaveformArtifactStore().delete_simulation(simulation_id))
@@ -0,0 +1,62 @@
+from datetime import timedelta
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+from .artifacts import WaveformArtifactStore
+from .export import SimulationExporter
+from .models import ComSimulation, ComResultMemo
+from .services import ComSimulationProcessor
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def run_simulation(self, simulation_id: int):
+    """运行Com仿真任务"""
+    try:
+        simulation = ComSimulation.objects.select_related('s_parameter').get(id=simulation_id)
+    except ComSimulation.DoesNotExist:
+        return {
+            'simulation_id': simulation_id,
+            'status': 'error',
+            'error': f'找不到ID为{simulation_id}的仿真'
+        }
+
+    processor = ComSimulationProcessor(simulation)
+    processor.execute(**(simulation.parameters or {}))
+
+    # 结果已保存在仿真记录中, 任务结果只返回状态
+    return {
+        'simulation_id': simulation_id,
+        'status': processor.status,
+        'errors': processor.errors
+    }
+
+
+@shared_task
+def cleanup_expired_waveforms() -> dict:
+    """
+    清理超过保留期的仿真波形文件
+    结果中只保留波形预览并标记waveforms_expired; 以这些仿真为来源的结果记忆一并删除
+    """
+    expiry_date = timezone.now() - timedelta(days=getattr(settings, 'SIMULATION_RESULTS_EXPIRY_DAYS', 30))
+    expired = ComSimulation.objects.filter(created_at__lt=expiry_date, result_data__isnull=False) \
+        .exclude(result_data__has_key='waveforms_expired')
+
+    store = WaveformArtifactStore()
+    simulations = files = 0
+    for simulation in expired.iterator():
+        files += store.delete_simulation(simulation.id)
+        for port_result in (simulation.result_data.get('port_results') or {}).values():
+            if port_result:
+                port_result.pop('time_data_ref', None)
+        simulation.result_data['waveforms_expired'] = True
+        simulation.save(update_fields=['result_data'])
+        ComResultMemo.objects.filter(source=simulation).delete()
+        simulations += 1
+
+    return {'simulations': simulations, 'files': files}
+
+
+@shared_task
+def cleanup_expired_exports() -> int:
+    """删除超过COM_EXPORT_EXPIRY_HOURS的导出压缩包"""
+    return SimulationExporter().cleanup()
@@ -1,5 +1,18 @@
 from dataclasses import dataclass
+import hashlib
+import json
 from typing import List, Dict, Any
+from .equalization import EqualizerGrid
+
+def _canonicalize(value: Any) -> Any:
+    """规范化数值表示, 使 1e9 与 1000000000 等价"""
+    if isinstance(value, dict):
+        return {str(k): _canonicalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonicalize(v) for v in value]
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return value
 
 @dataclass
 class SimulationParameters:
@@ -14,7 +27,9 @@ class SimulationParameters:
         
         # 验证频率范围
         start_freq, end_freq = self.frequency_range
-        if start_freq >= end_freq:
+        if start_freq is None or end_freq is None:
+            errors.append("必须指定起始频率和结束频率")
+        elif start_freq >= end_freq:
             errors.append("起始频率必须小于结束频率")
             
         # 验证端口映射
@@ -26,5 +41,35 @@ class SimulationParameters:
         for setting in required_settings:
             if setting not in self.settings:
                 errors.append(f"缺少必要的设置: {setting}")
+        
+        # 验证均衡器扫描设置
+        equalizer = self.settings.get('equalizer')
+        if equalizer:
+            if 'input_port' not in equalizer:
+                errors.append("均衡器扫描必须指定输入端口: input_port")
+            try:
+                errors.extend(EqualizerGrid.from_dict(equalizer).validate())
+            except TypeError as e:
+                errors.append(f"均衡器设置无效: {str(e)}")
+        
+        # 验证串扰聚合设置
+        crosstalk = self.settings.get('crosstalk')
+        if crosstalk:
+            if len(crosstalk.get('victim') or []) != 2:
+                errors.append("串扰设置必须指定受害通道端口对: victim")
+            if not crosstalk.get('aggressors') or any(len(pair) != 2 for pair in crosstalk['aggressors']):
+                errors.append("串扰设置必须指定干扰源端口对列表: aggressors")
+            if crosstalk.get('method', 'power_sum') not in ('power_sum', 'pdf'):
+                errors.append("串扰合成方法必须为 power_sum 或 pdf")
                 
-        return errors 
\ No newline at end of file
+        return errors 
+
+    def canonical_hash(self) -> str:
+        """参数的规范化哈希, 与字典顺序和端口映射写法无关"""
+        canonical = {
+            'frequency_range': [float(f) for f in self.frequency_range],
+            'port_mapping': {str(k): int(v) for k, v in self.port_mapping.items()},
+            'settings': _canonicalize(self.settings)
+        }
+        payload = json.dumps(canonical, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
@@ -1,45 +1,131 @@
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
 from django.core.cache.backends.redis import RedisCache
 from django.core.cache.backends.filebased import FileBasedCache
 from django.core.cache.backends.locmem import LocMemCache
-from typing import List, Any
+from typing import List, Any, Optional
+import glob
 import os
+import time
+from django.conf import settings
 from pathlib import Path
+from .singleflight import CacheLock
+from .capacity import CacheUsageIndex
+from .tiered import _MISSING
 
 # 方案一：自定义缓存后端
 class CustomRedisCache(RedisCache):
     """自定义Redis缓存后端 - 方案一"""
+    scan_batch_size = 500
+    pipeline_batches = 20  # 每次管道发送的UNLINK批数
+    tag_timeout = 7 * 24 * 3600
+    lock_poll_interval = 0.05
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # 添加自定义功能
 
+    def _raw_client(self, write: bool = False):
+        """获取底层redis客户端"""
+        return self._cache.get_client(None, write=write)
+
+    def _original_key(self, raw_key: bytes) -> str:
+        """由存储键还原调用方使用的键(默认键格式为 prefix:version:key)"""
+        return raw_key.decode().split(':', 2)[-1]
+
+    def _scan(self, client, pattern: str):
+        """按批次迭代匹配的存储键, 使用SCAN游标避免阻塞Redis"""
+        batch = []
+        for raw_key in client.scan_iter(match=self.make_key(pattern), count=self.scan_batch_size):
+            batch.append(raw_key)
+            if len(batch) >= self.scan_batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
     def get_many(self, keys):
         """批量获取缓存"""
         return super().get_many(keys)
 
     def get_many_by_pattern(self, pattern: str) -> dict:
-        """使用模式匹配获取多个缓存"""
-        client = self._client
-        keys = client.keys(pattern)
-        if not keys:
-            return {}
-        return {k.decode(): self.get(k) for k in keys}
+        """使用模式匹配获取多个缓存, 每批键一次MGET"""
+        client = self._raw_client()
+        result = {}
+        for batch in self._scan(client, pattern):
+            for raw_key, raw_value in zip(batch, client.mget(batch)):
+                if raw_value is not None:
+                    result[self._original_key(raw_key)] = self._cache._serializer.loads(raw_value)
+        return result
     
     def delete_many_by_pattern(self, pattern: str) -> int:
-        """使用模式匹配删除多个缓存"""
-        client = self._client
-        keys = client.keys(pattern)
-        if not keys:
-            return 0
-        return client.delete(*keys)
+        """使用模式匹配删除多个缓存, 每批键一条UNLINK, 多批合并在管道中发送"""
+        client = self._raw_client(write=True)
+        pipeline = client.pipeline(transaction=False)
+        deleted = 0
+        for batch in self._scan(client, pattern):
+            pipeline.unlink(*batch)
+            if len(pipeline) >= self.pipeline_batches:
+                deleted += sum(pipeline.execute())
+        if len(pipeline):
+            deleted += sum(pipeline.execute())
+        return deleted
 
-    def get_or_set(self, key: str, default_func: callable, timeout=None) -> Any:
-        """获取缓存，不存在则设置"""
-        value = self.get(key)
-        if value is None:
-            value = default_func()
-            self.set(key, value, timeout)
-        return value
+    def _tag_key(self, tag: str) -> str:
+        return self.make_key(f"tag:{tag}")
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, tags=None):
+        """设置缓存, tags中的每个标签记录该键以便按标签失效"""
+        super().set(key, value, timeout, version)
+        if tags:
+            raw_key = self.make_and_validate_key(key, version=version)
+            pipeline = self._raw_client(write=True).pipeline(transaction=False)
+            for tag in tags:
+                pipeline.sadd(self._tag_key(tag), raw_key)
+                pipeline.expire(self._tag_key(tag), self.tag_timeout)
+            pipeline.execute()
+
+    def delete_by_tag(self, *tags: str) -> int:
+        """删除带有任一标签的所有缓存, 开销与标签下的键数成正比"""
+        client = self._raw_client(write=True)
+        deleted = 0
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            batch = []
+            for raw_key in client.sscan_iter(tag_key, count=self.scan_batch_size):
+                batch.append(raw_key)
+                if len(batch) >= self.scan_batch_size:
+                    deleted += client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += client.unlink(*batch)
+            client.unlink(tag_key)
+        return deleted
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None) -> Any:
+        """
+        获取缓存，不存在则设置
+        与Django的get_or_set一致保存原值(软过期包装只在CacheManager.get_or_set中使用);
+        同一键只有获得锁的调用方计算, 其他调用方等待值写入或锁释放
+        """
+        value = self.get(key, _MISSING, version=version)
+        if value is not _MISSING:
+            return value
+
+        lock = CacheLock(self, key, getattr(settings, 'CACHE_LOCK_TIMEOUT', 30))
+        if not lock.acquire():
+            deadline = time.monotonic() + lock.timeout
+            while time.monotonic() < deadline:
+                time.sleep(self.lock_poll_interval)
+                value = self.get(key, _MISSING, version=version)
+                if value is not _MISSING:
+                    return value
+                if not lock.held():
+                    break
+            return super().get_or_set(key, default, timeout, version)
+        try:
+            return super().get_or_set(key, default, timeout, version)
+        finally:
+            lock.release()
 
 class CustomFileCache(FileBasedCache):
     """自定义文件缓存后端 - 方案一"""
@@ -148,4 +234,190 @@ class SubDirRedisCache(SubDirCacheMixin, RedisCache):
 
 class SubDirLocMemCache(SubDirCacheMixin, LocMemCache):
     """支持子目录的内存缓存 - 方案二"""
-    pass 
\ No newline at end of file
+    pass
+
+class BoundedFileBasedCache(SubDirCacheMixin, FileBasedCache):
+    """
+    有容量控制的文件缓存 - 方案二
+    子目录键写入对应的子目录, 以第一级子目录(如user_1)作为命名空间计算配额;
+    超出全局容量或命名空间配额时按最近访问时间(LRU)淘汰, 用量记录在缓存目录的索引文件中
+    OPTIONS:
+        MAX_BYTES: 全局容量(字节), 0表示不限制
+        NAMESPACE_MAX_BYTES: 每个命名空间的默认配额(字节), 0表示不限制
+        NAMESPACE_QUOTAS: 单独指定的命名空间配额, 如 {'user_1': 2 * 1024 ** 3}
+        EVICT_RATIO: 淘汰到上限的该比例为止, 避免每次写入都触发淘汰
+    """
+    evict_batch_size = 100
+
+    def __init__(self, dir, params):
+        super().__init__(dir, params)
+        options = params.get('OPTIONS', {})
+        self.max_bytes = options.get('MAX_BYTES', 0)
+        self.namespace_max_bytes = options.get('NAMESPACE_MAX_BYTES', 0)
+        self.namespace_quotas = options.get('NAMESPACE_QUOTAS', {})
+        self.evict_ratio = options.get('EVICT_RATIO', 0.9)
+        self.index = CacheUsageIndex(self._dir)
+
+    def _key_to_file(self, key, version=None):
+        """子目录键(_make_sub_dir_key生成的路径)对应的文件放在该子目录中"""
+        fname = super()._key_to_file(key, version)
+        key_dir = os.path.normpath(os.path.dirname(str(key)))
+        if key_dir.startswith(self._dir + os.sep):
+            return os.path.join(key_dir, os.path.basename(fname))
+        return fname
+
+    def _namespace(self, fname: str) -> str:
+        """文件所属命名空间(第一级子目录), 根目录下的文件为空字符串"""
+        parts = os.path.relpath(fname, self._dir).split(os.sep)
+        return parts[0] if len(parts) > 1 else ''
+
+    def _quota(self, namespace: str) -> int:
+        if not namespace:
+            return 0
+        return self.namespace_quotas.get(namespace, self.namespace_max_bytes)
+
+    def _list_cache_files(self):
+        """包含子目录中的缓存文件"""
+        return glob.glob(
+            os.path.join(glob.escape(self._dir), '**', f"*{self.cache_suffix}"), recursive=True
+        )
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        if value is _MISSING:
+            return default
+        self.index.touch(self._key_to_file(key, version))
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        super().set(key, value, timeout, version)
+        fname = self._key_to_file(key, version)
+        try:
+            size = os.path.getsize(fname)
+        except FileNotFoundError:
+            return
+        namespace = self._namespace(fname)
+        self.index.record(fname, namespace, size)
+        self._enforce(namespace)
+
+    def _delete(self, fname):
+        deleted = super()._delete(fname)
+        self.index.remove([fname])
+        return deleted
+
+    def _cull(self):
+        """按条目数上限LRU淘汰, 替代默认的全目录扫描和随机淘汰"""
+        _, entries = self.index.usage()
+        if entries >= self._max_entries:
+            self._evict(max_entries=self._max_entries)
+
+    def _enforce(self, namespace: str) -> int:
+        """检查命名空间配额和全局容量, 返回淘汰的条目数"""
+        evicted = 0
+        quota = self._quota(namespace)
+        if quota and self.index.usage(namespace)[0] > quota:
+            evicted += self._evict(namespace, max_bytes=quota)
+        if self.max_bytes and self.index.usage()[0] > self.max_bytes:
+            evicted += self._evict(max_bytes=self.max_bytes)
+        return evicted
+
+    def _evict(self, namespace: Optional[str] = None, max_bytes: int = 0, max_entries: int = 0) -> int:
+        """
+        按LRU淘汰, 直到用量降到上限的evict_ratio以下
+        :param namespace: 淘汰范围, None表示全部
+        """
+        self.index.flush()
+        size, entries = self.index.usage(namespace)
+        target_bytes = max_bytes * self.evict_ratio
+        target_entries = max_entries * self.evict_ratio
+
+        def over_limit():
+            return (max_bytes and size > target_bytes) or (max_entries and entries > target_entries)
+
+        evicted = 0
+        while over_limit():
+            batch = self.index.least_recent(namespace, limit=self.evict_batch_size)
+            if not batch:
+                break
+            removed = []
+            for path, file_size in batch:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                removed.append(path)
+                size -= file_size
+                entries -= 1
+                if not over_limit():
+                    break
+            self.index.remove(removed)
+            evicted += len(removed)
+        return evicted
+
+    def clear_sub_dir(self, sub_dirs: List[str]) -> None:
+        """清除子目录(含下级目录)的所有缓存"""
+        dir_path = self._get_sub_dir_path(sub_dirs)
+        removed = []
+        for cache_file in dir_path.rglob(f"*{self.cache_suffix}"):
+            try:
+                cache_file.unlink()
+            except FileNotFoundError:
+                pass
+            removed.append(str(cache_file))
+        self.index.remove(removed)
+
+    def usage(self) -> dict:
+        """容量使用情况"""
+        self.index.flush()
+        total_bytes, entries = self.index.usage()
+        return {
+            'bytes': total_bytes,
+            'entries': entries,
+            'max_bytes': self.max_bytes,
+            'namespaces': {
+                namespace or '/': {'bytes': size, 'entries': count, 'quota': self._quota(namespace)}
+                for namespace, (size, count) in self.index.namespaces().items()
+            }
+        }
+
+    def compact(self) -> dict:
+        """
+        后台整理: 删除过期文件, 使索引与磁盘一致(补记未索引文件、移除失效记录), 再按配额淘汰
+        :return: 各步骤处理的条目数
+        """
+        self.index.flush()
+        on_disk = set()
+        expired = 0
+        for fname in self._list_cache_files():
+            try:
+                with open(fname, 'rb') as f:
+                    if self._is_expired(f):
+                        expired += 1
+                        continue
+            except FileNotFoundError:
+                continue
+            on_disk.add(fname)
+
+        indexed = set(self.index.paths())
+        missing = indexed - on_disk
+        self.index.remove(list(missing))
+        untracked = 0
+        for fname in on_disk - indexed:
+            try:
+                stat = os.stat(fname)
+            except FileNotFoundError:
+                continue
+            self.index.record(fname, self._namespace(fname), stat.st_size, accessed=stat.st_mtime)
+            untracked += 1
+
+        evicted = sum(self._enforce(namespace) for namespace in self.index.namespaces())
+        _, entries = self.index.usage()
+        if entries >= self._max_entries:
+            evicted += self._evict(max_entries=self._max_entries)
+
+        return {
+            'expired': expired,
+            'missing': len(missing),
+            'untracked': untracked,
+            'evicted': evicted
+        }
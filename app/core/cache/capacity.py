@@ -0,0 +1,128 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class CacheUsageIndex:
+    """
+    文件缓存用量索引
+    记录每个缓存文件的命名空间、大小和最近访问时间, 命名空间用量由触发器汇总;
+    索引保存在缓存目录下的SQLite文件中, 同一缓存目录的所有worker进程共享
+    """
+    filename = '.usage.sqlite3'
+    flush_interval = 5     # 访问时间批量写回间隔(秒)
+    flush_size = 256       # 待写回访问记录达到该数量时立即写回
+
+    def __init__(self, cache_dir: str):
+        self.path = Path(cache_dir) / self.filename
+        self._local = threading.local()
+        self._pending: Dict[str, float] = {}
+        self._pending_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def _connection(self) -> sqlite3.Connection:
+        """每个线程一个连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS entries (
+                    path TEXT PRIMARY KEY, namespace TEXT NOT NULL,
+                    size INTEGER NOT NULL, accessed REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS entries_lru ON entries (namespace, accessed);
+                CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+                CREATE TABLE IF NOT EXISTS usage (
+                    namespace TEXT PRIMARY KEY, bytes INTEGER NOT NULL, entries INTEGER NOT NULL
+                );
+                CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+                    INSERT INTO usage (namespace, bytes, entries) VALUES (NEW.namespace, NEW.size, 1)
+                    ON CONFLICT(namespace) DO UPDATE SET bytes = bytes + NEW.size, entries = entries + 1;
+                END;
+                CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+                    UPDATE usage SET bytes = bytes - OLD.size, entries = entries - 1
+                    WHERE namespace = OLD.namespace;
+                END;
+                CREATE TRIGGER IF NOT EXISTS entries_resize AFTER UPDATE OF size ON entries BEGIN
+                    UPDATE usage SET bytes = bytes - OLD.size + NEW.size WHERE namespace = NEW.namespace;
+                END;
+            ''')
+            self._local.conn = conn
+        return conn
+
+    def record(self, path: str, namespace: str, size: int, accessed: Optional[float] = None):
+        """记录写入的缓存文件"""
+        self._connection().execute(
+            'INSERT INTO entries (path, namespace, size, accessed) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT(path) DO UPDATE SET size = excluded.size, accessed = excluded.accessed',
+            (path, namespace, size, accessed or time.time())
+        )
+
+    def touch(self, path: str):
+        """记录访问, 访问时间在内存中合并后批量写回"""
+        with self._pending_lock:
+            self._pending[path] = time.time()
+            due = (len(self._pending) >= self.flush_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """写回待处理的访问时间"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if pending:
+            conn = self._connection()
+            with conn:
+                conn.execute('BEGIN')
+                conn.executemany(
+                    'UPDATE entries SET accessed = MAX(accessed, ?) WHERE path = ?',
+                    [(accessed, path) for path, accessed in pending.items()]
+                )
+
+    def remove(self, paths: List[str]):
+        """删除缓存文件的记录"""
+        if not paths:
+            return
+        conn = self._connection()
+        with conn:
+            conn.execute('BEGIN')
+            conn.executemany('DELETE FROM entries WHERE path = ?', [(path,) for path in paths])
+
+    def usage(self, namespace: Optional[str] = None) -> Tuple[int, int]:
+        """(字节数, 条目数), namespace为None时返回全部用量"""
+        if namespace is None:
+            row = self._connection().execute('SELECT SUM(bytes), SUM(entries) FROM usage').fetchone()
+        else:
+            row = self._connection().execute(
+                'SELECT bytes, entries FROM usage WHERE namespace = ?', (namespace,)
+            ).fetchone()
+        return (row[0] or 0, row[1] or 0) if row else (0, 0)
+
+    def namespaces(self) -> Dict[str, Tuple[int, int]]:
+        """各命名空间用量"""
+        rows = self._connection().execute('SELECT namespace, bytes, entries FROM usage WHERE entries > 0')
+        return {namespace: (size, entries) for namespace, size, entries in rows}
+
+    def least_recent(self, namespace: Optional[str] = None, limit: int = 100) -> List[Tuple[str, int]]:
+        """按最近访问时间升序返回 (路径, 大小)"""
+        if namespace is None:
+            rows = self._connection().execute(
+                'SELECT path, size FROM entries ORDER BY accessed LIMIT ?', (limit,)
+            )
+        else:
+            rows = self._connection().execute(
+                'SELECT path, size FROM entries WHERE namespace = ? ORDER BY accessed LIMIT ?',
+                (namespace, limit)
+            )
+        return rows.fetchall()
+
+    def paths(self) -> List[str]:
+        """所有已记录的路径"""
+        return [row[0] for row in self._connection().execute('SELECT path FROM entries')]
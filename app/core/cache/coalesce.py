@@ -0,0 +1,119 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from django.conf import settings
+from django.core.cache import caches
+from .generations import GenerationStore
+from .singleflight import CacheLock
+
+logger = logging.getLogger(__name__)
+
+
+def coalesce_key(name: str, **params) -> str:
+    """由请求名称和参数生成合并键, 参数按键排序后哈希, 与书写顺序无关"""
+    digest = hashlib.md5(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+    return f"{name}:{digest}"
+
+
+class _Call:
+    """进程内一次进行中的计算"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class RequestCoalescer:
+    """
+    合并进行中的相同请求
+    进程内同一键的并发调用等待第一个调用的结果; 跨进程时由取得锁的进程计算, 结果短期发布到缓存,
+    其他进程轮询取用。与缓存不同, 只在计算进行期间共享结果, 对不缓存或首次请求同样有效
+    领导者计算失败时: 本进程的等待者收到同一异常, 其他进程的等待者各自重新计算
+    """
+    _calls: Dict[str, _Call] = {}
+    _calls_lock = threading.Lock()
+    poll_interval = 0.02
+
+    def __init__(self, backend: str = None, wait_timeout: float = None, result_ttl: int = None):
+        """
+        :param backend: 跨进程协调使用的缓存后端, 配置为空时只在进程内合并
+        :param wait_timeout: 等待其他调用方计算的最长时间(秒), 超时后自行计算
+        :param result_ttl: 结果在缓存中保留的秒数, 只需覆盖等待者的轮询间隔
+        """
+        backend = backend or getattr(settings, 'REQUEST_COALESCE_BACKEND', 'default')
+        self.cache = caches[backend] if backend else None
+        self.wait_timeout = wait_timeout or getattr(settings, 'REQUEST_COALESCE_WAIT_TIMEOUT', 30)
+        self.result_ttl = result_ttl or getattr(settings, 'REQUEST_COALESCE_RESULT_TTL', 10)
+
+    def run(self, key: str, func: Callable[[], Any], namespaces: List[str] = None) -> Any:
+        """
+        执行或等待相同键的计算
+        :param key: 合并键(见coalesce_key), 应包含影响结果的全部参数
+        :param namespaces: 结果所属的命名空间, 键中加入其当前代数, 数据更新后的请求不会取到旧结果
+        """
+        if namespaces:
+            key = GenerationStore().versioned_key(key, namespaces)
+
+        with self._calls_lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.event.wait(self.wait_timeout):
+                logger.warning(f"等待合并请求超时, 自行计算: {key}")
+                return func()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = self._run_shared(key, func)
+            return call.value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._calls_lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def _run_shared(self, key: str, func: Callable[[], Any]) -> Any:
+        """跨进程合并: 取得锁的进程计算并发布结果, 其他进程等待结果或锁释放"""
+        if self.cache is None:
+            return func()
+        result_key = f"coalesce:{key}:result"
+        lock = CacheLock(self.cache, f"coalesce:{key}", int(self.wait_timeout))
+        if lock.acquire():
+            try:
+                value = func()
+                self._publish(result_key, value)
+                return value
+            finally:
+                lock.release()
+
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            published = self.cache.get(result_key)
+            if published is not None:
+                return published['value']
+            if not lock.held():
+                # 锁已释放: 领导者可能在两次检查之间刚完成, 再读一次; 仍没有结果说明领导者失败或结果无法发布
+                published = self.cache.get(result_key)
+                if published is not None:
+                    return published['value']
+                break
+        return func()
+
+    def _publish(self, result_key: str, value: Any):
+        """发布结果供其他进程的等待者读取, 包装后None也可区分"""
+        try:
+            self.cache.set(result_key, {'value': value}, timeout=self.result_ttl)
+        except Exception as e:
+            logger.debug(f"合并请求结果发布失败 {result_key}: {str(e)}")
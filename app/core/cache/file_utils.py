@@ -2,6 +2,10 @@ from typing import List, Optional, Union, Callable
 from pathlib import Path
 import hashlib
 import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
 
 class FilePathHandler:
     """文件路径处理器"""
@@ -68,29 +72,113 @@ class FilePathHandler:
             return [filename]
         return []
 
+class FingerprintIndex:
+    """
+    文件指纹索引
+    记录 (路径, inode, 大小, mtime_ns) -> 内容哈希, 元数据不变时无需重新读取文件;
+    使用SQLite保存, 同一主机上的多个worker进程共享
+    """
+    
+    def __init__(self, path: Union[str, Path] = None):
+        self.path = Path(path or getattr(
+            settings, 'FILE_FINGERPRINT_INDEX', '/var/tmp/django_cache/fingerprints.sqlite3'
+        ))
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """每个线程一个连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS fingerprints ('
+                'path TEXT PRIMARY KEY, inode INTEGER, size INTEGER, mtime_ns INTEGER, digest TEXT)'
+            )
+            self._local.conn = conn
+        return conn
+
+    def lookup(self, path: str, stat: os.stat_result) -> Optional[str]:
+        """元数据一致时返回已记录的哈希"""
+        row = self._connection().execute(
+            'SELECT digest FROM fingerprints WHERE path = ? AND inode = ? AND size = ? AND mtime_ns = ?',
+            (path, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        ).fetchone()
+        return row[0] if row else None
+
+    def store(self, path: str, stat: os.stat_result, digest: str):
+        """记录哈希"""
+        self._connection().execute(
+            'INSERT OR REPLACE INTO fingerprints (path, inode, size, mtime_ns, digest) VALUES (?, ?, ?, ?, ?)',
+            (path, stat.st_ino, stat.st_size, stat.st_mtime_ns, digest)
+        )
+
 class FileHasher:
     """文件哈希处理器"""
+    chunk_size = 1024 * 1024
+    _index = None
+    _index_lock = threading.Lock()
+
+    @classmethod
+    def get_index(cls) -> FingerprintIndex:
+        """进程内共享的指纹索引"""
+        with cls._index_lock:
+            if cls._index is None:
+                cls._index = FingerprintIndex()
+            return cls._index
     
-    @staticmethod
-    def get_file_hash(file_path: Union[str, Path]) -> Optional[str]:
-        """获取文件内容的哈希值"""
+    @classmethod
+    def hash_content(cls, path: Path) -> str:
+        """以大块读取计算文件内容的BLAKE2b哈希"""
+        file_hash = hashlib.blake2b(digest_size=16)
+        buffer = bytearray(cls.chunk_size)
+        view = memoryview(buffer)
+        with open(path, 'rb', buffering=0) as f:
+            while True:
+                size = f.readinto(buffer)
+                if not size:
+                    break
+                file_hash.update(view[:size])
+        return file_hash.hexdigest()
+
+    @classmethod
+    def get_file_hash(cls, file_path: Union[str, Path]) -> Optional[str]:
+        """获取文件内容的哈希值, 文件元数据未变化时直接使用指纹索引"""
         path = Path(file_path)
-        if not path.exists():
+        try:
+            stat = path.stat()
+        except (FileNotFoundError, NotADirectoryError):
             return None
-            
-        with open(path, 'rb') as f:
-            file_hash = hashlib.md5()
-            for chunk in iter(lambda: f.read(4096), b''):
-                file_hash.update(chunk)
-        return file_hash.hexdigest()
+        if not path.is_file():
+            return None
+        
+        key = str(path.resolve())
+        index = cls.get_index()
+        try:
+            digest = index.lookup(key, stat)
+        except sqlite3.Error:
+            index, digest = None, None
+        if digest:
+            return digest
+        
+        digest = cls.hash_content(path)
+        if index is not None:
+            try:
+                index.store(key, stat, digest)
+            except sqlite3.Error:
+                pass
+        return digest
 
-    @staticmethod
-    def get_files_hash(file_paths: List[str]) -> Optional[str]:
-        """获取多个文件的组合哈希值"""
-        hashes = []
-        for path in file_paths:
-            file_hash = FileHasher.get_file_hash(path)
-            if file_hash:
-                hashes.append(file_hash)
+    @classmethod
+    def get_files_hash(cls, file_paths: List[str]) -> Optional[str]:
+        """获取多个文件的组合哈希值, 多个文件在线程池中并行计算"""
+        if len(file_paths) <= 1:
+            hashes = [cls.get_file_hash(path) for path in file_paths]
+        else:
+            workers = min(len(file_paths), getattr(settings, 'FILE_HASH_WORKERS', 4))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                hashes = list(executor.map(cls.get_file_hash, file_paths))
+        hashes = [file_hash for file_hash in hashes if file_hash]
         
-        return '_'.join(hashes) if hashes else None 
\ No newline at end of file
+        return '_'.join(hashes) if hashes else None
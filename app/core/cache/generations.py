@@ -0,0 +1,94 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Tuple
+from django.conf import settings
+from django.core.cache import caches
+
+
+class GenerationStore:
+    """
+    命名空间代数计数器
+    缓存键中嵌入所属命名空间(如 parameter:12、platform:3)的当前代数, 递增代数即可让该命名空间下的
+    所有缓存键失效, 旧条目等待过期或容量淘汰, 与后端是否支持模式删除无关
+    计数器丢失(如Redis重启)时以当前毫秒时间戳重新初始化, 保证不会回到已用过的代数
+    """
+    _local: Dict[str, Tuple[int, float]] = {}
+    _local_lock = threading.Lock()
+
+    def __init__(self, backend: str = None):
+        self.cache = caches[backend or getattr(settings, 'CACHE_GENERATION_BACKEND', 'default')]
+        # 进程内缓存代数的时间(秒), 其他进程递增后最多延迟这么久生效
+        self.local_ttl = getattr(settings, 'CACHE_GENERATION_LOCAL_TTL', 1.0)
+
+    @staticmethod
+    def _key(namespace: str) -> str:
+        return f"generation:{namespace}"
+
+    @staticmethod
+    def _initial() -> int:
+        return int(time.time() * 1000)
+
+    def _remember(self, namespace: str, generation: int):
+        with self._local_lock:
+            self._local[namespace] = (generation, time.monotonic() + self.local_ttl)
+
+    def get_many(self, namespaces: Iterable[str]) -> Dict[str, int]:
+        """获取多个命名空间的当前代数, 一次批量读取"""
+        result, missing = {}, []
+        now = time.monotonic()
+        for namespace in namespaces:
+            cached = self._local.get(namespace)
+            if cached is not None and cached[1] > now:
+                result[namespace] = cached[0]
+            else:
+                missing.append(namespace)
+        if not missing:
+            return result
+
+        stored = self.cache.get_many([self._key(namespace) for namespace in missing])
+        for namespace in missing:
+            generation = stored.get(self._key(namespace))
+            if generation is None:
+                # 并发初始化时以先写入者为准
+                self.cache.add(self._key(namespace), self._initial(), timeout=None)
+                generation = self.cache.get(self._key(namespace)) or self._initial()
+            self._remember(namespace, generation)
+            result[namespace] = generation
+        return result
+
+    def get(self, namespace: str) -> int:
+        return self.get_many([namespace])[namespace]
+
+    def bump(self, *namespaces: str) -> Dict[str, int]:
+        """递增代数, 使命名空间下的缓存全部失效"""
+        result = {}
+        for namespace in namespaces:
+            try:
+                generation = self.cache.incr(self._key(namespace))
+            except ValueError:
+                # 计数器不存在: 初始化为新值, 同样使旧键失效
+                generation = self._initial()
+                if not self.cache.add(self._key(namespace), generation, timeout=None):
+                    generation = self.cache.incr(self._key(namespace))
+            self._remember(namespace, generation)
+            result[namespace] = generation
+        return result
+
+    def versioned_key(self, key: str, namespaces: List[str]) -> str:
+        """在键末尾加上各命名空间的代数"""
+        if not namespaces:
+            return key
+        generations = self.get_many(namespaces)
+        return f"{key}:g{'.'.join(str(generations[namespace]) for namespace in namespaces)}"
+
+
+def parameter_namespace(parameter_id) -> str:
+    return f"parameter:{parameter_id}"
+
+
+def user_namespace(user_id) -> str:
+    return f"user:{user_id}"
+
+
+def platform_namespace(platform_id) -> str:
+    return f"platform:{platform_id}"
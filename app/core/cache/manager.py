@@ -9,48 +9,208 @@ from pathlib import Path
 from django.core.cache.backends.redis import RedisCache
 from django.core.cache.backends.filebased import FileBasedCache
 from django.core.cache.backends.locmem import LocMemCache
-from django.core.cache.backends import CustomFileCache
+from .backends import CustomFileCache, CustomRedisCache
 from app.core.cache.mixins import SubDirCacheMixin
 import os
 from .file_utils import FilePathHandler, FileHasher
+from .tiered import CacheTier, _MISSING
+from .singleflight import SingleFlight, CachedEntry
+from .metrics import CacheMetrics, key_namespace
+from .serializers import ValueCodec
+from .generations import GenerationStore
+import time
+import logging
+
+logger = logging.getLogger(__name__)
 
 class CacheManager:
     """缓存管理器"""
     
-    def __init__(self, backend='default', timeout=None, key_prefix=None, sub_dirs=None):
+    def __init__(self, backend='default', timeout=None, key_prefix=None, sub_dirs=None, local_cache=None):
+        """
+        :param local_cache: 是否在后端(L2)前启用进程内LRU(L1), 默认按CACHE_L1_BACKENDS配置
+        """
         self.backend = backend
         self.timeout = timeout or getattr(settings, 'CACHE_TIMEOUT', 300)
         self.key_prefix = key_prefix or getattr(settings, 'CACHE_KEY_PREFIX', '')
         self.sub_dirs = sub_dirs
         self._cache = caches[backend]
+        if local_cache is None:
+            local_cache = backend in getattr(settings, 'CACHE_L1_BACKENDS', [])
+        self._tier = CacheTier.for_backend(backend) if local_cache else None
+        # 后端中的值按ValueCodec编码(可选压缩), L1中保存解码后的对象
+        self._codec = ValueCodec.for_backend(backend, self._cache)
+
+    def _local_key(self, key):
+        """L1中的键, 包含子目录以区分同名键"""
+        return '/'.join([*(self.sub_dirs or []), str(key)])
 
     def get(self, key, default=None):
         """获取缓存"""
-        if isinstance(self._cache, SubDirCacheMixin) and self.sub_dirs:
-            return self._cache.get_with_sub_dirs(key, self.sub_dirs, default)
-        return self._cache.get(key, default)
+        value = self._get_raw(key, default)
+        return value.value if isinstance(value, CachedEntry) else value
+
+    def _get_raw(self, key, default=None):
+        """获取缓存原始值(可能为带软过期信息的CachedEntry), 按键命名空间记录命中和延迟"""
+        metrics = CacheMetrics.instance()
+        namespace = key_namespace(key)
+        start = time.perf_counter()
+        try:
+            value = self._lookup(key, _MISSING)
+        except Exception:
+            metrics.record(namespace, 'errors', time.perf_counter() - start)
+            raise
+        if value is _MISSING:
+            metrics.record(namespace, 'misses', time.perf_counter() - start)
+            return default
+        metrics.record(namespace, 'hits', time.perf_counter() - start)
+        return value
+
+    def _lookup(self, key, default=None):
+        """依次查找L1和后端"""
+        if self._tier is None:
+            return self._backend_get(key, default)
 
-    def set(self, key, value, timeout=None):
-        """设置缓存"""
+        local_key = self._local_key(key)
+        value = self._tier.local.get(local_key)
+        if value is not _MISSING:
+            self._tier.record('l1_hits')
+            return value
+
+        value = self._backend_get(key, _MISSING)
+        if value is _MISSING:
+            self._tier.record('misses')
+            return default
+        self._tier.record('l2_hits')
+        self._tier.local.set(local_key, value)
+        return value
+
+    def _backend_get(self, key, default=None):
+        """从后端获取缓存"""
         if isinstance(self._cache, SubDirCacheMixin) and self.sub_dirs:
-            return self._cache.set_with_sub_dirs(key, value, self.sub_dirs, timeout or self.timeout)
-        return self._cache.set(key, value, timeout or self.timeout)
+            value = self._cache.get_with_sub_dirs(key, self.sub_dirs, default)
+        else:
+            value = self._cache.get(key, default)
+        if self._codec is None:
+            return value
+        try:
+            return self._codec.decode(value)
+        except Exception as e:
+            # 损坏或无法识别的编码值按未命中处理, 由调用方重新计算并覆盖
+            logger.warning(f"缓存值解码失败 {key}: {str(e)}")
+            return default
+
+    def set(self, key, value, timeout=None, tags=None):
+        """
+        设置缓存
+        :param tags: 标签列表, 支持标签的后端可通过delete_tag批量失效
+        """
+        metrics = CacheMetrics.instance()
+        namespace = key_namespace(key)
+        start = time.perf_counter()
+        try:
+            stored = self._codec.encode(value) if self._codec is not None else value
+            if isinstance(self._cache, SubDirCacheMixin) and self.sub_dirs:
+                result = self._cache.set_with_sub_dirs(key, stored, self.sub_dirs, timeout or self.timeout)
+            elif tags and isinstance(self._cache, CustomRedisCache):
+                result = self._cache.set(key, stored, timeout or self.timeout, tags=tags)
+            else:
+                result = self._cache.set(key, stored, timeout or self.timeout)
+        except Exception:
+            metrics.record(namespace, 'errors')
+            raise
+        metrics.record(namespace, 'sets', time.perf_counter() - start)
+        metrics.observe_size(namespace, stored)
+        if self._tier is not None:
+            local_key = self._local_key(key)
+            self._tier.local.set(local_key, value, timeout or self.timeout)
+            self._tier.invalidate(local_key)
+        return result
 
     def delete(self, key):
         """删除缓存"""
         if isinstance(self._cache, SubDirCacheMixin) and self.sub_dirs:
-            return self._cache.delete_with_sub_dirs(key, self.sub_dirs)
-        return self._cache.delete(key)
+            result = self._cache.delete_with_sub_dirs(key, self.sub_dirs)
+        else:
+            result = self._cache.delete(key)
+        if self._tier is not None:
+            local_key = self._local_key(key)
+            self._tier.local.delete(local_key)
+            self._tier.invalidate(local_key)
+        return result
 
     def clear(self):
         """清除所有缓存"""
         self._cache.clear()
+        self._clear_local()
+
+    def _clear_local(self):
+        """清空本进程L1并通知其他worker"""
+        if self._tier is not None:
+            self._tier.local.clear()
+            self._tier.invalidate()
+
+    def hit_rates(self) -> Optional[dict]:
+        """L1/L2命中率, 未启用L1时返回None"""
+        return self._tier.hit_rates() if self._tier is not None else None
 
     def clear_sub_dir(self):
         """清除子目录缓存"""
         if isinstance(self._cache, SubDirCacheMixin) and self.sub_dirs:
+            self._clear_local()
             return self._cache.clear_sub_dir(self.sub_dirs)
 
+    def get_or_set(self, key: str, default_func: callable, timeout=None, beta: float = 1.0):
+        """
+        获取缓存，不存在则设置
+        同一键只有一个调用方重算, 其他调用方返回旧值或等待; 接近过期时按XFetch概率提前重算
+        :param beta: 提前重算倾向, 越大越早
+        """
+        flight = SingleFlight(
+            self._cache,
+            get_entry=self._get_raw,
+            set_entry=lambda entry_key, entry, entry_timeout: self.set(entry_key, entry, entry_timeout)
+        )
+        return flight.get_or_set(key, default_func, timeout or self.timeout, beta)
+
+    def delete_pattern(self, pattern: str) -> int:
+        """删除匹配模式的缓存"""
+        self._clear_local()
+        if isinstance(self._cache, CustomRedisCache):
+            return self._cache.delete_many_by_pattern(pattern)
+        elif isinstance(self._cache, LocMemCache):
+            return self._cache.clear_with_prefix(pattern)
+        return 0
+
+    def versioned_key(self, key: str, *namespaces: str) -> str:
+        """
+        在键中嵌入命名空间的当前代数, 递增代数(bump)后旧键不再被读取
+        :param namespaces: 如 parameter_namespace(12)
+        """
+        return GenerationStore().versioned_key(key, list(namespaces))
+
+    def bump(self, *namespaces: str) -> dict:
+        """使命名空间下的所有版本化缓存键失效, O(1), 对所有后端有效"""
+        self._clear_local()
+        return GenerationStore().bump(*namespaces)
+
+    def delete_tag(self, *tags: str) -> int:
+        """按标签删除缓存, 后端不支持标签时返回0"""
+        self._clear_local()
+        if isinstance(self._cache, CustomRedisCache):
+            return self._cache.delete_by_tag(*tags)
+        return 0
+
+    def touch(self, key: str, timeout=None) -> bool:
+        """更新缓存过期时间"""
+        if isinstance(self._cache, FileBasedCache):
+            return self._cache.touch(key, timeout)
+        value = self.get(key)
+        if value is not None:
+            self.set(key, value, timeout)
+            return True
+        return False
+
     def get_cache_key(self, *args, key_generator: Callable = None, **kwargs) -> str:
         """生成缓存键"""
         if key_generator:
@@ -71,13 +231,7 @@ class CacheManager:
                 else:
                     cache_key = f"{func.__name__}_{self.get_cache_key(*args, key_generator=key_generator, **kwargs)}"
                 
-                cached_value = self.get(cache_key)
-                if cached_value is not None:
-                    return cached_value
-                
-                result = func(*args, **kwargs)
-                self.set(cache_key, result, timeout)
-                return result
+                return self.get_or_set(cache_key, lambda: func(*args, **kwargs), timeout)
             return wrapper
         return decorator
 
@@ -120,51 +274,9 @@ class FileCacheManager(CacheManager):
 
     def get_file_hash(self, file_path: Union[str, Path]) -> Optional[str]:
         """获取文件内容的哈希值"""
-        path = Path(file_path)
-        if not path.exists():
-            return None
-            
-        with open(path, 'rb') as f:
-            file_hash = hashlib.md5()
-            for chunk in iter(lambda: f.read(4096), b''):
-                file_hash.update(chunk)
-        return file_hash.hexdigest()
+        return self.file_hasher.get_file_hash(file_path)
 
     def get_files_cache_key(self, file_paths: List[str]) -> Optional[str]:
         """生成基于文件内容的缓存键"""
-        hashes = []
-        for path in file_paths:
-            file_hash = self.get_file_hash(path)
-            if file_hash:
-                hashes.append(file_hash)
-        
-        return f"file_cache_{'_'.join(hashes)}" if hashes else None
-
-    def get_or_set(self, key: str, default_func: callable, timeout=None):
-        """获取缓存，不存在则设置"""
-        if isinstance(self._cache, RedisCache):
-            return self._cache.get_or_set(key, default_func, timeout)
-        
-        value = self.get(key)
-        if value is None:
-            value = default_func()
-            self.set(key, value, timeout)
-        return value
-
-    def delete_pattern(self, pattern: str) -> int:
-        """删除匹配模式的缓存"""
-        if isinstance(self._cache, RedisCache):
-            return self._cache.delete_many_by_pattern(pattern)
-        elif isinstance(self._cache, LocMemCache):
-            return self._cache.clear_with_prefix(pattern)
-        return 0
-
-    def touch(self, key: str, timeout=None) -> bool:
-        """更新缓存过期时间"""
-        if isinstance(self._cache, FileBasedCache):
-            return self._cache.touch(key, timeout)
-        value = self.get(key)
-        if value is not None:
-            self.set(key, value, timeout)
-            return True
-        return False 
\ No newline at end of file
+        files_hash = self.file_hasher.get_files_hash(file_paths)
+        return f"file_cache_{files_hash}" if files_hash else None
@@ -0,0 +1,254 @@
+import bisect
+import json
+import logging
+import os
+import pickle
+import re
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# 直方图桶上界: 延迟(秒)和值大小(字节), 最后一个桶收集超出范围的值
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, float('inf'))
+SIZE_BUCKETS = tuple(1024 * 4 ** i for i in range(9)) + (float('inf'),)
+
+# 键末尾的ID、哈希等高基数部分
+_KEY_SUFFIX = re.compile(r'[_:](\d[\w.+-]*|[0-9a-f]{16,})([_:].*)?$')
+
+
+def key_namespace(key: Any) -> str:
+    """由缓存键得到命名空间, 去掉ID和哈希等部分, 如 s_parameter_data_12 -> s_parameter_data"""
+    return _KEY_SUFFIX.sub('', str(key)) or 'other'
+
+
+class Histogram:
+    """固定桶直方图"""
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self) -> dict:
+        return {'counts': list(self.counts), 'sum': self.sum, 'count': self.count}
+
+    @staticmethod
+    def quantile(data: dict, buckets: tuple, q: float) -> Optional[float]:
+        """按桶估计分位数(返回所在桶的上界)"""
+        if not data['count']:
+            return None
+        rank = q * data['count']
+        seen = 0
+        for bound, count in zip(buckets, data['counts']):
+            seen += count
+            if seen >= rank:
+                return bound if bound != float('inf') else None
+        return None
+
+
+class NamespaceMetrics:
+    """单个命名空间的计数和直方图"""
+    outcomes = ('hits', 'misses', 'stale', 'errors', 'sets')
+
+    def __init__(self):
+        self.counters = dict.fromkeys(self.outcomes, 0)
+        self.latency = {'get': Histogram(LATENCY_BUCKETS), 'set': Histogram(LATENCY_BUCKETS)}
+        self.size = Histogram(SIZE_BUCKETS)
+
+    def to_dict(self) -> dict:
+        return {
+            **self.counters,
+            'latency': {op: hist.to_dict() for op, hist in self.latency.items()},
+            'size': self.size.to_dict()
+        }
+
+
+class CacheMetrics:
+    """
+    进程内缓存指标
+    按命名空间统计命中/未命中/错误数、读写延迟和值大小; 定期将快照写入本机目录,
+    由指标接口或管理命令汇总各worker进程的数据
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.enabled = getattr(settings, 'CACHE_METRICS_ENABLED', True)
+        self.size_sample_every = getattr(settings, 'CACHE_METRICS_SIZE_SAMPLE_EVERY', 10)
+        self.max_namespaces = getattr(settings, 'CACHE_METRICS_MAX_NAMESPACES', 200)
+        self.flush_interval = getattr(settings, 'CACHE_METRICS_FLUSH_INTERVAL', 30)
+        self.snapshot_dir = Path(getattr(settings, 'CACHE_METRICS_DIR', '/var/tmp/django_cache/metrics'))
+        self.pid = os.getpid()
+        self.started_at = time.time()
+        self.namespaces: Dict[str, NamespaceMetrics] = {}
+        self._sets = 0
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    @classmethod
+    def instance(cls) -> 'CacheMetrics':
+        """当前进程的指标(fork后的子进程重新计数)"""
+        instance = cls._instance
+        if instance is None or instance.pid != os.getpid():
+            with cls._instance_lock:
+                if cls._instance is None or cls._instance.pid != os.getpid():
+                    cls._instance = cls()
+                instance = cls._instance
+        return instance
+
+    def _namespace(self, namespace: str) -> NamespaceMetrics:
+        metrics = self.namespaces.get(namespace)
+        if metrics is None:
+            # 限制命名空间数量, 防止键格式异常时无限增长
+            if len(self.namespaces) >= self.max_namespaces:
+                namespace = 'other'
+            metrics = self.namespaces.setdefault(namespace, NamespaceMetrics())
+        return metrics
+
+    def record(self, namespace: str, outcome: str, latency: Optional[float] = None):
+        """
+        记录一次缓存操作
+        :param outcome: hits/misses/stale/errors/sets
+        :param latency: 操作耗时(秒), sets记入写延迟, 其他记入读延迟
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            metrics = self._namespace(namespace)
+            metrics.counters[outcome] += 1
+            if latency is not None:
+                metrics.latency['set' if outcome == 'sets' else 'get'].observe(latency)
+        self._maybe_flush()
+
+    def observe_size(self, namespace: str, value: Any):
+        """抽样记录写入值的序列化大小"""
+        if not self.enabled or not self.size_sample_every:
+            return
+        with self._lock:
+            self._sets += 1
+            if self._sets % self.size_sample_every:
+                return
+        try:
+            # 已编码的值直接取长度, 其他值按pickle估计
+            size = len(value) if isinstance(value, (bytes, bytearray)) else \
+                len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return
+        with self._lock:
+            self._namespace(namespace).size.observe(size)
+
+    def snapshot(self) -> dict:
+        """当前进程的指标快照"""
+        with self._lock:
+            return {
+                'host': socket.gethostname(),
+                'pid': self.pid,
+                'started_at': self.started_at,
+                'updated_at': time.time(),
+                'namespaces': {name: metrics.to_dict() for name, metrics in self.namespaces.items()}
+            }
+
+    def _maybe_flush(self):
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self._last_flush = time.monotonic()
+            self.flush()
+
+    def flush(self):
+        """将快照写入指标目录(原子替换)"""
+        try:
+            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+            path = self.snapshot_dir / f"{socket.gethostname()}-{self.pid}.json"
+            tmp_path = path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps(self.snapshot()))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"缓存指标写入失败: {str(e)}")
+
+    @classmethod
+    def collect(cls, max_age: Optional[float] = None) -> dict:
+        """
+        汇总本机所有进程的指标
+        :param max_age: 忽略超过该秒数未更新的快照(已退出的进程), 默认为写入间隔的10倍;
+                        这些快照文件同时删除, 删除时至少按默认时长判断, 避免误删存活进程的快照
+        """
+        current = cls.instance()
+        if current.namespaces:
+            current.flush()
+        retention = current.flush_interval * 10
+        max_age = max_age or retention
+        retention = max(retention, max_age)
+        now = time.time()
+
+        snapshots = []
+        for path in current.snapshot_dir.glob('*.json'):
+            try:
+                snapshot = json.loads(path.read_text())
+                updated_at = snapshot.get('updated_at', 0)
+            except ValueError:
+                # 无法解析的文件按修改时间判断是否过期
+                snapshot, updated_at = None, cls._mtime(path)
+            except OSError:
+                continue
+            if now - updated_at > retention:
+                cls._remove(path)
+            elif snapshot is not None and now - updated_at <= max_age:
+                snapshots.append(snapshot)
+
+        merged = {}
+        for snapshot in snapshots:
+            for name, data in snapshot['namespaces'].items():
+                target = merged.setdefault(name, NamespaceMetrics().to_dict())
+                for outcome in NamespaceMetrics.outcomes:
+                    target[outcome] += data[outcome]
+                for hist_target, hist in [*zip(target['latency'].values(), data['latency'].values()),
+                                          (target['size'], data['size'])]:
+                    hist_target['counts'] = [a + b for a, b in zip(hist_target['counts'], hist['counts'])]
+                    hist_target['sum'] += hist['sum']
+                    hist_target['count'] += hist['count']
+
+        return {
+            'processes': len(snapshots),
+            'namespaces': {name: cls.summarize(data) for name, data in sorted(merged.items())}
+        }
+
+    @staticmethod
+    def _mtime(path: Path) -> float:
+        try:
+            return path.stat().st_mtime
+        except OSError:
+            return time.time()
+
+    @staticmethod
+    def _remove(path: Path):
+        """删除已退出进程的快照"""
+        try:
+            path.unlink()
+        except OSError as e:
+            logger.debug(f"缓存指标快照删除失败 {path}: {str(e)}")
+
+    @staticmethod
+    def summarize(data: dict) -> dict:
+        """计算命中率、延迟分位数和平均大小"""
+        lookups = data['hits'] + data['misses'] + data['stale']
+        summary = {
+            **{outcome: data[outcome] for outcome in NamespaceMetrics.outcomes},
+            'hit_rate': (data['hits'] + data['stale']) / lookups if lookups else None,
+            'avg_size': data['size']['sum'] / data['size']['count'] if data['size']['count'] else None,
+            'size_p95': Histogram.quantile(data['size'], SIZE_BUCKETS, 0.95),
+            'histograms': data
+        }
+        for op, hist in data['latency'].items():
+            summary[f'{op}_p50'] = Histogram.quantile(hist, LATENCY_BUCKETS, 0.5)
+            summary[f'{op}_p95'] = Histogram.quantile(hist, LATENCY_BUCKETS, 0.95)
+        return summary
@@ -0,0 +1,256 @@
+import io
+import logging
+import pickle
+import struct
+import zlib
+from typing import Any, Dict, Optional
+import numpy as np
+from django.conf import settings
+from django.core.cache.backends.filebased import FileBasedCache
+
+logger = logging.getLogger(__name__)
+
+# 编码值的头部: 魔数 + 序列化器ID + 压缩器ID; 没有该头部的值按原样返回(兼容旧格式)
+MAGIC = b'\x93RFC'
+HEADER = struct.Struct('>4sBB')
+
+
+class Serializer:
+    """序列化器基类"""
+    id = 0
+    name = ''
+
+    def accepts(self, value: Any) -> bool:
+        return True
+
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: memoryview) -> Any:
+        raise NotImplementedError
+
+
+class PickleSerializer(Serializer):
+    """通用pickle序列化"""
+    id = 1
+    name = 'pickle'
+
+    def dumps(self, value: Any) -> bytes:
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data: memoryview) -> Any:
+        return pickle.loads(data)
+
+
+class NumpySerializer(Serializer):
+    """NumPy数组以NPY格式保存(头部+原始数据), 不经过pickle"""
+    id = 2
+    name = 'npy'
+
+    def accepts(self, value: Any) -> bool:
+        return isinstance(value, np.ndarray) and not value.dtype.hasobject
+
+    def dumps(self, value: np.ndarray) -> bytes:
+        buffer = io.BytesIO()
+        np.lib.format.write_array(buffer, value, allow_pickle=False)
+        return buffer.getvalue()
+
+    def loads(self, data: memoryview) -> np.ndarray:
+        # 只解析头部, 数据段直接从缓冲区复制, 避免BytesIO逐段读取
+        # 头部长度记录在魔数之后(1.0版2字节, 2.0版4字节), 结构化dtype的头部可能很长;
+        # 数据由本缓存写入, 不受NumPy默认的头部长度安全上限限制
+        magic_len = np.lib.format.MAGIC_LEN
+        version = np.lib.format.read_magic(io.BytesIO(data[:magic_len]))
+        length_size = 2 if version == (1, 0) else 4
+        header_len = int.from_bytes(data[magic_len:magic_len + length_size], 'little')
+        header = io.BytesIO(data[:magic_len + length_size + header_len])
+        header.seek(magic_len)
+        read_header = (np.lib.format.read_array_header_1_0 if version == (1, 0)
+                       else np.lib.format.read_array_header_2_0)
+        shape, fortran_order, dtype = read_header(header, max_header_size=max(header_len, 10000))
+        array = np.frombuffer(data, dtype=dtype, count=int(np.prod(shape)), offset=header.tell())
+        return array.reshape(shape, order='F' if fortran_order else 'C').copy(order='K')
+
+
+class RawBytesSerializer(Serializer):
+    """字节串原样保存(如导出的ZIP文件)"""
+    id = 3
+    name = 'raw'
+
+    def accepts(self, value: Any) -> bool:
+        return isinstance(value, (bytes, bytearray))
+
+    def dumps(self, value: bytes) -> bytes:
+        return bytes(value)
+
+    def loads(self, data: memoryview) -> bytes:
+        return bytes(data)
+
+
+class Compressor:
+    """压缩器基类, 依赖的库未安装时available为False"""
+    id = 0
+    name = 'none'
+    available = True
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: memoryview) -> bytes:
+        return data
+
+
+class ZlibCompressor(Compressor):
+    id = 1
+    name = 'zlib'
+    level = 1  # 大值以速度优先
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: memoryview) -> bytes:
+        return zlib.decompress(data)
+
+
+class ZstdCompressor(Compressor):
+    """需要zstandard库"""
+    id = 2
+    name = 'zstd'
+
+    def __init__(self):
+        try:
+            import zstandard
+        except ImportError:
+            self.available = False
+            return
+        self._compressor = zstandard.ZstdCompressor(level=3)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def decompress(self, data: memoryview) -> bytes:
+        return self._decompressor.decompress(data)
+
+
+class Lz4Compressor(Compressor):
+    """需要lz4库"""
+    id = 3
+    name = 'lz4'
+
+    def __init__(self):
+        try:
+            import lz4.frame
+        except ImportError:
+            self.available = False
+            return
+        self._frame = lz4.frame
+
+    def compress(self, data: bytes) -> bytes:
+        return self._frame.compress(data)
+
+    def decompress(self, data: memoryview) -> bytes:
+        return self._frame.decompress(data)
+
+
+SERIALIZERS: Dict[str, Serializer] = {}
+COMPRESSORS: Dict[str, Compressor] = {}
+
+
+def register_serializer(serializer: Serializer):
+    """注册序列化器, ID写入值头部, 发布后不可更改"""
+    SERIALIZERS[serializer.name] = serializer
+
+
+def register_compressor(compressor: Compressor):
+    """注册压缩器, ID写入值头部, 发布后不可更改"""
+    COMPRESSORS[compressor.name] = compressor
+
+
+for _serializer in (PickleSerializer(), NumpySerializer(), RawBytesSerializer()):
+    register_serializer(_serializer)
+for _compressor in (Compressor(), ZlibCompressor(), ZstdCompressor(), Lz4Compressor()):
+    register_compressor(_compressor)
+
+
+class ValueCodec:
+    """
+    缓存值编解码
+    按值类型选择序列化器(auto: 数组用NPY、字节串原样、其他pickle), 超过阈值且压缩有效时压缩;
+    解码时根据头部识别格式, 没有头部的旧值原样返回, 便于滚动升级
+    """
+    _instances: Dict[str, Optional['ValueCodec']] = {}
+    probe_bytes = 64 * 1024
+
+    def __init__(self, serializer: str = 'auto', compressor: str = 'zlib',
+                 min_bytes: int = 64 * 1024, min_saving: float = 0.1):
+        """
+        :param serializer: 序列化器名称或auto
+        :param compressor: 压缩器名称, 不可用时退回zlib
+        :param min_bytes: 序列化后超过该字节数才尝试压缩
+        :param min_saving: 压缩后至少减少该比例才保存压缩结果(已压缩的数据不再压缩)
+        """
+        self.serializer = serializer
+        compressor = COMPRESSORS.get(compressor or 'none')
+        if compressor is None or not compressor.available:
+            logger.warning(f"缓存压缩器不可用, 使用zlib: {compressor.name if compressor else None}")
+            compressor = COMPRESSORS['zlib']
+        self.compressor = compressor
+        self.min_bytes = min_bytes
+        self.min_saving = min_saving
+        self._serializers_by_id = {item.id: item for item in SERIALIZERS.values()}
+        self._compressors_by_id = {item.id: item for item in COMPRESSORS.values()}
+
+    @classmethod
+    def for_backend(cls, backend: str, cache) -> Optional['ValueCodec']:
+        """
+        按配置获取后端的编解码器(进程内复用), 未启用时返回None
+        文件缓存写入时自身已压缩, 不再重复压缩
+        """
+        if backend not in cls._instances:
+            serializer = getattr(settings, 'CACHE_VALUE_SERIALIZER', 'auto')
+            codec = None
+            if serializer:
+                compressor = getattr(settings, 'CACHE_VALUE_COMPRESSOR', 'zlib')
+                codec = cls(
+                    serializer=serializer,
+                    compressor='none' if isinstance(cache, FileBasedCache) else compressor,
+                    min_bytes=getattr(settings, 'CACHE_COMPRESS_MIN_BYTES', 64 * 1024)
+                )
+            cls._instances[backend] = codec
+        return cls._instances[backend]
+
+    def _select(self, value: Any) -> Serializer:
+        if self.serializer != 'auto':
+            serializer = SERIALIZERS[self.serializer]
+            return serializer if serializer.accepts(value) else SERIALIZERS['pickle']
+        for name in ('raw', 'npy'):
+            if SERIALIZERS[name].accepts(value):
+                return SERIALIZERS[name]
+        return SERIALIZERS['pickle']
+
+    def encode(self, value: Any) -> bytes:
+        serializer = self._select(value)
+        payload = serializer.dumps(value)
+        compressor = COMPRESSORS['none']
+        if self.compressor.id and len(payload) >= self.min_bytes and self._compressible(payload):
+            compressed = self.compressor.compress(payload)
+            if len(compressed) <= len(payload) * (1 - self.min_saving):
+                payload, compressor = compressed, self.compressor
+        return HEADER.pack(MAGIC, serializer.id, compressor.id) + payload
+
+    def _compressible(self, payload: bytes) -> bool:
+        """先压缩开头一段试探, 已压缩或随机数据(如ZIP)跳过整体压缩"""
+        if len(payload) <= 2 * self.probe_bytes:
+            return True
+        probe = memoryview(payload)[:self.probe_bytes]
+        return len(self.compressor.compress(probe)) <= self.probe_bytes * (1 - self.min_saving)
+
+    def decode(self, data: Any) -> Any:
+        if not isinstance(data, (bytes, bytearray)) or data[:len(MAGIC)] != MAGIC:
+            return data
+        _, serializer_id, compressor_id = HEADER.unpack_from(data)
+        payload = memoryview(data)[HEADER.size:]
+        if compressor_id:
+            payload = memoryview(self._compressors_by_id[compressor_id].decompress(payload))
+        return self._serializers_by_id[serializer_id].loads(payload)
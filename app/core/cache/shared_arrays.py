@@ -0,0 +1,206 @@
+import fcntl
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Optional
+import numpy as np
+from django.conf import settings
+from .capacity import CacheUsageIndex
+
+logger = logging.getLogger(__name__)
+
+
+def _default_dir() -> str:
+    """优先使用内存文件系统(/dev/shm), 文件页即共享内存"""
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(base, 'rf_arrays')
+
+
+class SharedArrayCache:
+    """
+    本机多进程共享的数组缓存
+    每个条目是以内容哈希命名的目录, 其中每个数组保存为一个NPY文件, 清单记录数组名称; 读取时以只读内存映射打开,
+    所有gunicorn worker和Celery进程共享同一份物理页, 不再各自反序列化一份副本
+    条目的大小和最近访问时间记录在目录下的用量索引中, 超过容量时在文件锁内按LRU淘汰;
+    淘汰只删除文件, 已映射的进程在释放前仍可正常读取
+    返回的数组是只读的, 调用方需要修改时应先复制
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+    namespace = 'arrays'
+    stale_tmp_seconds = 3600
+    manifest_name = 'manifest.json'  # 条目包含的数组名称
+
+    def __init__(self, directory: str = None, max_bytes: int = None, local_handles: int = None):
+        """
+        :param directory: 缓存目录, 应位于本机内存文件系统
+        :param max_bytes: 所有条目的总大小上限
+        :param local_handles: 进程内保留映射的条目数, 命中时免去打开文件
+        """
+        self.root = Path(directory or getattr(settings, 'SHARED_ARRAY_DIR', None) or _default_dir())
+        self.max_bytes = max_bytes or getattr(settings, 'SHARED_ARRAY_MAX_BYTES', 2 * 1024 ** 3)
+        self.local_handles = local_handles or getattr(settings, 'SHARED_ARRAY_LOCAL_HANDLES', 32)
+        self.index = CacheUsageIndex(str(self.root))
+        self.pid = os.getpid()
+        self._handles: 'OrderedDict[str, Dict[str, np.ndarray]]' = OrderedDict()
+        self._handles_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> Optional['SharedArrayCache']:
+        """当前进程的共享数组缓存(fork后的子进程重新打开索引), 未启用时返回None"""
+        if not getattr(settings, 'SHARED_ARRAY_ENABLED', True):
+            return None
+        instance = cls._instance
+        if instance is None or instance.pid != os.getpid():
+            with cls._instance_lock:
+                if cls._instance is None or cls._instance.pid != os.getpid():
+                    cls._instance = cls()
+                instance = cls._instance
+        return instance
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.root / key
+
+    @contextmanager
+    def _locked(self):
+        """本机进程间互斥(写入登记和淘汰)"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _remember(self, key: str, arrays: Dict[str, np.ndarray]):
+        with self._handles_lock:
+            self._handles[key] = arrays
+            self._handles.move_to_end(key)
+            while len(self._handles) > self.local_handles:
+                self._handles.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """以只读内存映射获取条目的所有数组, 不存在时返回None"""
+        entry_dir = self._entry_dir(key)
+        with self._handles_lock:
+            arrays = self._handles.get(key)
+            if arrays is not None:
+                self._handles.move_to_end(key)
+        if arrays is None:
+            try:
+                # 按清单加载全部数组, 缺少任何一个(读取时正被其他进程淘汰)都按未命中处理
+                names = json.loads((entry_dir / self.manifest_name).read_text())
+                arrays = {
+                    name: np.load(entry_dir / f"{name}.npy", mmap_mode='r', allow_pickle=False)
+                    for name in names
+                }
+            except (OSError, ValueError) as e:
+                logger.debug(f"共享数组读取失败 {key}: {str(e)}")
+                return None
+            if not arrays:
+                return None
+            self._remember(key, arrays)
+        self.index.touch(str(entry_dir))
+        return arrays
+
+    def put(self, key: str, arrays: Dict[str, np.ndarray]) -> Optional[Dict[str, np.ndarray]]:
+        """
+        写入条目并返回其只读映射
+        先写入临时目录再整体改名, 其他进程不会看到写了一半的条目; 多个进程同时写入同一内容时以先完成者为准
+        :return: 条目超过容量上限或写入失败时返回None
+        """
+        size = sum(np.asarray(array).nbytes for array in arrays.values())
+        if size > self.max_bytes:
+            return None
+        entry_dir = self._entry_dir(key)
+        tmp_dir = self.root / f".tmp-{key}-{uuid.uuid4().hex[:8]}"
+        try:
+            tmp_dir.mkdir(parents=True)
+            for name, array in arrays.items():
+                np.save(tmp_dir / f"{name}.npy", np.ascontiguousarray(array), allow_pickle=False)
+            (tmp_dir / self.manifest_name).write_text(json.dumps(list(arrays)))
+            with self._locked():
+                try:
+                    os.rename(tmp_dir, entry_dir)
+                except OSError:
+                    if self.get(key) is None:
+                        # 已有的条目不完整(淘汰中断等): 替换
+                        shutil.rmtree(entry_dir, ignore_errors=True)
+                        os.rename(tmp_dir, entry_dir)
+                    else:
+                        # 其他进程已写入相同内容
+                        shutil.rmtree(tmp_dir, ignore_errors=True)
+                self.index.record(str(entry_dir), self.namespace, size)
+                self._evict()
+        except OSError as e:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            logger.warning(f"共享数组写入失败 {key}: {str(e)}")
+            return None
+        return self.get(key)
+
+    def get_or_load(self, key: str, loader: Callable[[], Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        """获取条目, 不存在时调用loader生成并写入; 写入失败时返回loader的结果"""
+        arrays = self.get(key)
+        if arrays is None:
+            loaded = loader()
+            arrays = self.put(key, loaded) or loaded
+        return arrays
+
+    def _evict(self):
+        """按LRU删除条目直到总大小不超过上限, 需要在文件锁内调用"""
+        self.index.flush()
+        total, _ = self.index.usage(self.namespace)
+        while total > self.max_bytes:
+            victims = self.index.least_recent(self.namespace, limit=16)
+            if not victims:
+                break
+            removed = []
+            for path, size in victims:
+                shutil.rmtree(path, ignore_errors=True)
+                removed.append(path)
+                total -= size
+                if total <= self.max_bytes:
+                    break
+            self.index.remove(removed)
+            logger.debug(f"共享数组淘汰 {len(removed)} 个条目")
+
+    def delete(self, key: str):
+        entry_dir = self._entry_dir(key)
+        with self._handles_lock:
+            self._handles.pop(key, None)
+        with self._locked():
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            self.index.remove([str(entry_dir)])
+
+    def compact(self) -> Dict[str, int]:
+        """
+        核对索引和目录: 删除残留的临时目录和没有目录的记录, 登记没有记录的条目, 再按容量淘汰
+        :return: 整理后的字节数和条目数
+        """
+        with self._locked():
+            indexed = set(self.index.paths())
+            existing = set()
+            for path in self.root.iterdir() if self.root.exists() else []:
+                if not path.is_dir():
+                    continue
+                if path.name.startswith('.tmp-'):
+                    # 只清理中断写入留下的旧临时目录, 不影响正在写入的进程
+                    if time.time() - path.stat().st_mtime > self.stale_tmp_seconds:
+                        shutil.rmtree(path, ignore_errors=True)
+                    continue
+                existing.add(str(path))
+                if str(path) not in indexed:
+                    size = sum(item.stat().st_size for item in path.glob('*.npy'))
+                    self.index.record(str(path), self.namespace, size)
+            self.index.remove(list(indexed - existing))
+            self._evict()
+            total, entries = self.index.usage(self.namespace)
+        return {'bytes': total, 'entries': entries}
@@ -0,0 +1,140 @@
+import hashlib
+import math
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+from django.conf import settings
+from django.core.cache.backends.filebased import FileBasedCache
+
+
+@dataclass
+class CachedEntry:
+    """
+    带软过期信息的缓存值
+    后端按 软过期+宽限期 保存, 宽限期内的旧值可在重算期间继续返回
+    """
+    value: Any
+    expires_at: float  # 软过期时间(unix时间戳)
+    delta: float       # 上次计算耗时(秒), 用于概率提前过期
+
+    def is_fresh(self, beta: float = 1.0, now: Optional[float] = None) -> bool:
+        """
+        XFetch: 越接近过期且计算越慢, 越可能提前判定为过期,
+        使单个请求在过期前完成重算, 避免集中失效
+        """
+        now = time.time() if now is None else now
+        return now - self.delta * beta * math.log(random.random() or 1e-12) < self.expires_at
+
+
+class CacheLock:
+    """
+    重算锁
+    文件缓存使用O_EXCL锁文件, 其他后端使用原子的add(Redis为SET NX)
+    """
+    def __init__(self, cache, key: str, timeout: int):
+        self.cache = cache
+        self.key = f"{key}:lock"
+        self.timeout = timeout
+        self.token = uuid.uuid4().hex
+        self._path = None
+        if isinstance(cache, FileBasedCache):
+            name = hashlib.md5(self.key.encode()).hexdigest()
+            self._path = Path(cache._dir) / f"{name}.lock"
+
+    def acquire(self) -> bool:
+        if self._path is None:
+            return self.cache.add(self.key, self.token, self.timeout)
+        try:
+            fd = os.open(self._path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            # 持有者崩溃时锁文件过期后可被抢占
+            try:
+                if time.time() - self._path.stat().st_mtime > self.timeout:
+                    self._path.unlink()
+                    return self.acquire()
+            except FileNotFoundError:
+                return self.acquire()
+            return False
+        except FileNotFoundError:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            return self.acquire()
+        os.close(fd)
+        return True
+
+    def held(self) -> bool:
+        """锁是否仍被持有(任意持有者)"""
+        if self._path is None:
+            return self.cache.get(self.key) is not None
+        return self._path.exists()
+
+    def release(self):
+        if self._path is None:
+            if self.cache.get(self.key) == self.token:
+                self.cache.delete(self.key)
+            return
+        try:
+            self._path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SingleFlight:
+    """
+    防缓存击穿的取值流程
+    同一键只有获得锁的调用方执行计算, 其他调用方返回宽限期内的旧值或等待新值写入
+    """
+    def __init__(self, lock_cache, get_entry: Callable[[str], Any],
+                 set_entry: Callable[[str, Any, int], Any]):
+        self.lock_cache = lock_cache
+        self.get_entry = get_entry
+        self.set_entry = set_entry
+        self.lock_timeout = getattr(settings, 'CACHE_LOCK_TIMEOUT', 30)
+        self.stale_grace = getattr(settings, 'CACHE_STALE_GRACE', 60)
+        self.poll_interval = 0.05
+
+    def get_or_set(self, key: str, default_func: Callable[[], Any], timeout: int,
+                   beta: float = 1.0) -> Any:
+        entry = self._load(key)
+        if entry is not None and entry.is_fresh(beta):
+            return entry.value
+
+        lock = CacheLock(self.lock_cache, key, self.lock_timeout)
+        if lock.acquire():
+            try:
+                return self._compute(key, default_func, timeout)
+            finally:
+                lock.release()
+
+        # 他人正在重算: 有旧值直接返回, 否则等待结果
+        if entry is not None:
+            return entry.value
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            entry = self._load(key)
+            if entry is not None:
+                return entry.value
+            if not lock.held():
+                # 锁已释放但没有新值: 持有者计算失败或结果为None, 不再等待, 再读一次后自行计算
+                entry = self._load(key)
+                if entry is not None:
+                    return entry.value
+                break
+        return self._compute(key, default_func, timeout)
+
+    def _load(self, key: str) -> Optional[CachedEntry]:
+        entry = self.get_entry(key)
+        return entry if isinstance(entry, CachedEntry) else None
+
+    def _compute(self, key: str, default_func: Callable[[], Any], timeout: int) -> Any:
+        start = time.monotonic()
+        value = default_func()
+        delta = time.monotonic() - start
+        if value is not None:
+            entry = CachedEntry(value=value, expires_at=time.time() + timeout, delta=delta)
+            self.set_entry(key, entry, timeout + self.stale_grace)
+        return value
@@ -0,0 +1,163 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class LocalLRUCache:
+    """进程内有界LRU缓存(L1), 条目带过期时间, 线程安全"""
+
+    def __init__(self, max_entries: int = 1024, timeout: int = 60):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default=_MISSING):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None):
+        ttl = self.timeout if timeout is None else min(timeout, self.timeout)
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class LocalInvalidationBus:
+    """进程内失效广播, 未配置Redis时的替代实现(只覆盖当前进程)"""
+    _subscribers = []
+    _lock = threading.Lock()
+
+    def publish(self, message: dict):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback(message)
+
+    def subscribe(self, callback: Callable[[dict], None]):
+        with self._lock:
+            self._subscribers.append(callback)
+
+
+class RedisInvalidationBus:
+    """基于Redis pub/sub的跨进程失效广播, 订阅在后台线程中处理"""
+
+    def __init__(self, url: str, channel: str):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.channel = channel
+        self._pubsub = None
+
+    def publish(self, message: dict):
+        try:
+            self.client.publish(self.channel, json.dumps(message))
+        except Exception as e:
+            logger.warning(f"缓存失效广播失败: {str(e)}")
+
+    def subscribe(self, callback: Callable[[dict], None]):
+        def handler(raw):
+            try:
+                callback(json.loads(raw['data']))
+            except (TypeError, ValueError):
+                pass
+
+        self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{self.channel: handler})
+        self._pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+
+class CacheTier:
+    """
+    某个缓存后端的进程内L1层
+    同一进程内所有CacheManager实例共享, 写入和删除时通过失效广播通知其他worker丢弃L1条目
+    """
+    _instances: Dict[str, 'CacheTier'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, backend: str):
+        self.backend = backend
+        self.origin = uuid.uuid4().hex
+        self.local = LocalLRUCache(
+            max_entries=getattr(settings, 'CACHE_L1_MAX_ENTRIES', 1024),
+            timeout=getattr(settings, 'CACHE_L1_TIMEOUT', 60)
+        )
+        self.stats = {'l1_hits': 0, 'l2_hits': 0, 'misses': 0}
+        self.bus = self._create_bus()
+        self.bus.subscribe(self._on_invalidation)
+
+    @classmethod
+    def for_backend(cls, backend: str) -> 'CacheTier':
+        """获取(必要时创建)后端对应的L1层"""
+        with cls._instances_lock:
+            if backend not in cls._instances:
+                cls._instances[backend] = cls(backend)
+            return cls._instances[backend]
+
+    @staticmethod
+    def _create_bus():
+        url = getattr(settings, 'CACHE_INVALIDATION_URL', '')
+        if url:
+            try:
+                return RedisInvalidationBus(url, getattr(settings, 'CACHE_INVALIDATION_CHANNEL', 'cache_invalidation'))
+            except Exception as e:
+                logger.warning(f"Redis失效广播不可用, 使用进程内广播: {str(e)}")
+        return LocalInvalidationBus()
+
+    def _on_invalidation(self, message: dict):
+        """处理其他worker发出的失效消息"""
+        if message.get('origin') == self.origin or message.get('backend') != self.backend:
+            return
+        if message.get('key') is None:
+            self.local.clear()
+        else:
+            self.local.delete(message['key'])
+
+    def invalidate(self, key: Optional[str] = None):
+        """广播失效, key为None表示清空"""
+        self.bus.publish({'origin': self.origin, 'backend': self.backend, 'key': key})
+
+    def record(self, outcome: str):
+        self.stats[outcome] += 1
+
+    def hit_rates(self) -> dict:
+        """各层命中率"""
+        total = sum(self.stats.values())
+        return {
+            **self.stats,
+            'requests': total,
+            'l1_hit_rate': self.stats['l1_hits'] / total if total else 0.0,
+            'l2_hit_rate': self.stats['l2_hits'] / total if total else 0.0,
+            'hit_rate': (self.stats['l1_hits'] + self.stats['l2_hits']) / total if total else 0.0,
+            'l1_entries': len(self.local)
+        }
@@ -0,0 +1,119 @@
+import logging
+import time
+from collections import Counter
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+
+logger = logging.getLogger(__name__)
+
+
+class AccessStats:
+    """
+    对象访问计数, 按天分桶, 用于挑选预热对象
+    Redis后端使用有序集合(ZINCRBY), 其他后端退化为缓存中的计数字典(尽力而为, 并发写入可能丢失计数)
+    """
+
+    def __init__(self, scope: str, backend: str = None, window_days: int = None):
+        self.scope = scope
+        self.cache = caches[backend or getattr(settings, 'ACCESS_STATS_BACKEND', 'default')]
+        self.window_days = window_days or getattr(settings, 'ACCESS_STATS_DAYS', 7)
+
+    def _bucket(self, day: date) -> str:
+        return f"access_stats:{self.scope}:{day.isoformat()}"
+
+    def _client(self):
+        return self.cache._cache.get_client(None, write=True)
+
+    def record(self, object_id: Any):
+        """记录一次访问, 失败不影响调用方"""
+        bucket = self._bucket(date.today())
+        timeout = (self.window_days + 1) * 86400
+        try:
+            if isinstance(self.cache, RedisCache):
+                pipeline = self._client().pipeline(transaction=False)
+                pipeline.zincrby(self.cache.make_key(bucket), 1, str(object_id))
+                pipeline.expire(self.cache.make_key(bucket), timeout)
+                pipeline.execute()
+            else:
+                counts = self.cache.get(bucket) or {}
+                counts[str(object_id)] = counts.get(str(object_id), 0) + 1
+                self.cache.set(bucket, counts, timeout)
+        except Exception as e:
+            logger.debug(f"访问计数失败 {self.scope}:{object_id}: {str(e)}")
+
+    def top(self, limit: int) -> List[tuple]:
+        """统计窗口内访问最多的对象, 返回 [(对象ID, 次数)]"""
+        today = date.today()
+        totals = Counter()
+        for offset in range(self.window_days):
+            bucket = self._bucket(today - timedelta(days=offset))
+            if isinstance(self.cache, RedisCache):
+                # 每天只取前若干名, 合并后的排名对长尾对象是近似的
+                rows = self._client().zrevrange(self.cache.make_key(bucket), 0, limit * 4 - 1, withscores=True)
+                totals.update({member.decode(): int(score) for member, score in rows})
+            else:
+                totals.update(self.cache.get(bucket) or {})
+        return totals.most_common(limit)
+
+
+class CacheWarmer:
+    """
+    缓存预热流程
+    对每个对象依次执行已注册的预热步骤; 按速率限制处理对象并受总时长约束, 避免预热占满worker
+    """
+
+    def __init__(self, rate: float = None, max_seconds: float = None):
+        """
+        :param rate: 每秒最多处理的对象数, 0表示不限制
+        :param max_seconds: 总时长上限, 超过后停止处理剩余对象
+        """
+        self.rate = getattr(settings, 'CACHE_WARMUP_RATE', 2) if rate is None else rate
+        self.max_seconds = max_seconds or getattr(settings, 'CACHE_WARMUP_MAX_SECONDS', 600)
+        self.steps: Dict[str, Callable[[Any], Any]] = {}
+
+    def register(self, name: str, func: Callable[[Any], Any]) -> 'CacheWarmer':
+        """注册预热步骤, 按注册顺序执行"""
+        self.steps[name] = func
+        return self
+
+    def run(self, items: Iterable[Any], steps: Optional[List[str]] = None) -> dict:
+        """
+        执行预热
+        :param steps: 只执行指定步骤, 默认全部
+        :return: 各步骤的成功/失败数
+        """
+        selected = {name: func for name, func in self.steps.items() if not steps or name in steps}
+        summary = {name: {'ok': 0, 'failed': 0} for name in selected}
+        interval = 1.0 / self.rate if self.rate else 0.0
+        start = time.monotonic()
+        processed = 0
+        stopped_early = False
+
+        for item in items:
+            elapsed = time.monotonic() - start
+            if elapsed > self.max_seconds:
+                stopped_early = True
+                break
+            # 平均速率不超过rate
+            wait = processed * interval - elapsed
+            if wait > 0:
+                time.sleep(wait)
+
+            for name, func in selected.items():
+                try:
+                    func(item)
+                    summary[name]['ok'] += 1
+                except Exception as e:
+                    summary[name]['failed'] += 1
+                    logger.warning(f"缓存预热步骤{name}失败 {item}: {str(e)}")
+            processed += 1
+
+        return {
+            'processed': processed,
+            'steps': summary,
+            'elapsed': round(time.monotonic() - start, 3),
+            'stopped_early': stopped_early
+        }
@@ -12,8 +12,17 @@ from rest_framework.response import Response
 from rest_framework.request import Request
 from typing import Callable, Any, Union, List, Dict, Optional
 from pathlib import Path
-from .cache.manager import CacheManager
+from .cache.manager import CacheManager, FileCacheManager
+from .cache.metrics import CacheMetrics
+from .cache.generations import GenerationStore
 import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
 
 class MonitoredTask(Task):
     """带监控的Celery任务基类"""
@@ -92,9 +101,57 @@ def cache_method_result(backend='default', timeout=None):
         return wrapper
     return decorator
 
-def cache_view_result(cache_key: str, timeout: int = None):
-    """视图结果缓存装饰器"""
+_revalidate_executor = None
+_revalidate_executor_lock = threading.Lock()
+
+def _get_revalidate_executor() -> ThreadPoolExecutor:
+    """后台刷新线程池(按需创建, 并发的首次请求只创建一个)"""
+    global _revalidate_executor
+    if _revalidate_executor is None:
+        with _revalidate_executor_lock:
+            if _revalidate_executor is None:
+                _revalidate_executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'CACHE_REVALIDATE_WORKERS', 4),
+                    thread_name_prefix='cache-revalidate'
+                )
+    return _revalidate_executor
+
+def cache_view_result(cache_key: str, timeout: int = None, stale_while_revalidate: int = 0,
+                      namespaces: Callable[[Request, dict], List[str]] = None,
+                      on_hit: Callable[[Request, dict], Any] = None):
+    """
+    视图结果缓存装饰器
+    :param stale_while_revalidate: 软过期后继续提供旧结果的秒数, 期间在后台线程中刷新(每个键只刷新一次)
+    :param namespaces: 由(request, kwargs)返回结果所属的命名空间, 递增其代数即可使缓存失效
+    :param on_hit: 以缓存结果响应时以(request, kwargs)调用(如访问计数), 此时已通过视图的权限检查;
+                   缓存中只有视图成功执行后的响应, 未命中时由视图自行处理
+    """
     def decorator(view_func: Callable) -> Callable:
+        namespace = f"view:{cache_key}"
+
+        def store(cache_key_final: str, response: Response, timeout_value: int):
+            """缓存成功的响应, 保留生成时间用于计算Age"""
+            if response.status_code == 200:
+                start = time.perf_counter()
+                cache.set(
+                    cache_key_final,
+                    {'data': response.data, 'created_at': time.time()},
+                    timeout=timeout_value + stale_while_revalidate
+                )
+                metrics = CacheMetrics.instance()
+                metrics.record(namespace, 'sets', time.perf_counter() - start)
+                metrics.observe_size(namespace, response.data)
+
+        def revalidate(cache_key_final: str, timeout_value: int, view_instance, request, args, kwargs):
+            """后台重新执行视图并刷新缓存"""
+            try:
+                store(cache_key_final, view_func(view_instance, request, *args, **kwargs), timeout_value)
+            except Exception as e:
+                logger.warning(f"缓存后台刷新失败 {cache_key_final}: {str(e)}")
+            finally:
+                cache.delete(f"{cache_key_final}:revalidate")
+                close_old_connections()
+
         @wraps(view_func)
         def wrapper(view_instance, request: Request, *args, **kwargs) -> Response:
             # 只缓存POST请求
@@ -119,19 +176,59 @@ def cache_view_result(cache_key: str, timeout: int = None):
                 ).hexdigest()
             ]
             cache_key_final = '_'.join(key_parts)
+            if namespaces is not None:
+                cache_key_final = GenerationStore().versioned_key(cache_key_final, namespaces(request, kwargs))
+            timeout_value = timeout or settings.CACHE_TIMEOUTS.get(cache_key, 300)
             
             # 尝试从缓存获取
-            cached_response = cache.get(cache_key_final)
-            if cached_response is not None:
-                return Response(cached_response)
+            metrics = CacheMetrics.instance()
+            start = time.perf_counter()
+            try:
+                cached = cache.get(cache_key_final)
+            except Exception:
+                metrics.record(namespace, 'errors', time.perf_counter() - start)
+                raise
+            latency = time.perf_counter() - start
+            if cached is not None:
+                if not (isinstance(cached, dict) and 'created_at' in cached):
+                    # 旧格式缓存, 没有生成时间
+                    metrics.record(namespace, 'hits', latency)
+                    if on_hit is not None:
+                        on_hit(request, kwargs)
+                    response = Response(cached)
+                    response['Cache-Status'] = 'rf; hit'
+                    return response
+                
+                age = int(time.time() - cached['created_at'])
+                response = Response(cached['data'])
+                response['Age'] = str(age)
+                if age < timeout_value:
+                    metrics.record(namespace, 'hits', latency)
+                    if on_hit is not None:
+                        on_hit(request, kwargs)
+                    response['Cache-Status'] = 'rf; hit'
+                    return response
+                
+                # 已软过期: 立即返回旧结果, 由一个请求触发后台刷新
+                metrics.record(namespace, 'stale', latency)
+                response['Cache-Status'] = 'rf; hit; detail=stale'
+                if cache.add(f"{cache_key_final}:revalidate", True, timeout=timeout_value):
+                    # 后台刷新会重新执行视图, 不再单独调用on_hit
+                    _get_revalidate_executor().submit(
+                        revalidate, cache_key_final, timeout_value, view_instance, request, args, kwargs
+                    )
+                elif on_hit is not None:
+                    on_hit(request, kwargs)
+                return response
             
             # 执行视图函数
+            metrics.record(namespace, 'misses', latency)
             response = view_func(view_instance, request, *args, **kwargs)
             
             # 只缓存成功的响应
-            if response.status_code == 200:
-                timeout_value = timeout or settings.CACHE_TIMEOUTS.get(cache_key, 300)
-                cache.set(cache_key_final, response.data, timeout=timeout_value)
+            store(cache_key_final, response, timeout_value)
+            response['Age'] = '0'
+            response['Cache-Status'] = 'rf; fwd=miss' + ('; stored' if response.status_code == 200 else '')
             
             return response
         return wrapper
@@ -145,7 +242,7 @@ def file_based_cache(
     path_join_func: Callable = None
 ):
     """文件缓存装饰器"""
-    cache_manager = CacheManager(
+    cache_manager = FileCacheManager(
         backend=backend,
         timeout=timeout,
         sub_dirs=sub_dirs
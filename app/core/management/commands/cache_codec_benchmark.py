@@ -0,0 +1,61 @@
+import os
+import time
+import numpy as np
+from django.core.management.base import BaseCommand
+from app.core.cache.serializers import COMPRESSORS, SERIALIZERS, ValueCodec
+
+
+def sample_values(num_freqs: int, num_ports: int) -> dict:
+    """典型的大缓存值: S参数数组、解析后的数据字典和导出ZIP字节"""
+    rng = np.random.default_rng(0)
+    frequencies = np.linspace(1e7, 5e10, num_freqs)
+    decay = np.exp(-frequencies / 2e10)[:, None, None]
+    s_parameters = (rng.normal(size=(num_freqs, num_ports, num_ports))
+                    + 1j * rng.normal(size=(num_freqs, num_ports, num_ports))) * decay
+    return {
+        's_parameters': s_parameters,
+        'parsed_data': {
+            'frequencies': frequencies.tolist(),
+            'data_points': [
+                {'frequency': f, 'values': np.round(row.view(float), 6).tolist()}
+                for f, row in zip(frequencies, s_parameters.reshape(num_freqs, -1))
+            ]
+        },
+        'export_zip': os.urandom(8 * 1024 * 1024)
+    }
+
+
+class Command(BaseCommand):
+    """缓存值编解码基准测试"""
+    help = '比较各序列化器/压缩器组合对典型大缓存值的编码、解码耗时和存储字节数'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--freqs', type=int, default=4000, help='样本S参数的频点数')
+        parser.add_argument('--ports', type=int, default=8, help='样本S参数的端口数')
+        parser.add_argument('--repeat', type=int, default=3, help='每个组合重复次数(取最小值)')
+
+    def handle(self, *args, **options):
+        values = sample_values(options['freqs'], options['ports'])
+        compressors = [name for name, compressor in COMPRESSORS.items() if compressor.available]
+        serializers = ['auto'] + [name for name in SERIALIZERS if name != 'raw']
+
+        self.stdout.write(f"{'值':<14}{'序列化':<8}{'压缩':<6}{'编码ms':>10}{'解码ms':>10}{'字节数':>14}{'比例':>8}")
+        for value_name, value in values.items():
+            baseline = None
+            for serializer in serializers:
+                for compressor in compressors:
+                    codec = ValueCodec(serializer=serializer, compressor=compressor, min_bytes=0)
+                    encode_times, decode_times = [], []
+                    for _ in range(options['repeat']):
+                        start = time.perf_counter()
+                        encoded = codec.encode(value)
+                        encode_times.append(time.perf_counter() - start)
+                        start = time.perf_counter()
+                        codec.decode(encoded)
+                        decode_times.append(time.perf_counter() - start)
+                    baseline = baseline or len(encoded)
+                    self.stdout.write(
+                        f"{value_name:<14}{serializer:<8}{compressor:<6}"
+                        f"{min(encode_times) * 1000:>10.1f}{min(decode_times) * 1000:>10.1f}"
+                        f"{len(encoded):>14}{len(encoded) / baseline:>8.2f}"
+                    )
@@ -0,0 +1,33 @@
+import json
+from django.core.management.base import BaseCommand
+from app.core.cache.metrics import CacheMetrics
+
+
+class Command(BaseCommand):
+    """查看缓存指标"""
+    help = '汇总本机各进程的缓存命中率、读写延迟和值大小'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-age', type=float, help='忽略超过该秒数未更新的进程快照')
+        parser.add_argument('--json', action='store_true', help='以JSON格式输出(含直方图)')
+
+    def handle(self, *args, **options):
+        result = CacheMetrics.collect(max_age=options['max_age'])
+        if options['json']:
+            self.stdout.write(json.dumps(result, ensure_ascii=False, indent=2))
+            return
+
+        def fmt(value, scale=1.0, unit=''):
+            return '-' if value is None else f"{value * scale:.3g}{unit}"
+
+        self.stdout.write(f"进程数: {result['processes']}")
+        header = f"{'命名空间':<40}{'命中':>8}{'未命中':>8}{'过期':>6}{'错误':>6}{'命中率':>8}" \
+                 f"{'读p50':>9}{'读p95':>9}{'写p95':>9}{'平均大小':>10}"
+        self.stdout.write(header)
+        for name, summary in result['namespaces'].items():
+            self.stdout.write(
+                f"{name[:39]:<40}{summary['hits']:>8}{summary['misses']:>8}{summary['stale']:>6}"
+                f"{summary['errors']:>6}{fmt(summary['hit_rate'], 100, '%'):>8}"
+                f"{fmt(summary['get_p50'], 1000, 'ms'):>9}{fmt(summary['get_p95'], 1000, 'ms'):>9}"
+                f"{fmt(summary['set_p95'], 1000, 'ms'):>9}{fmt(summary['avg_size'], 1 / 1024, 'K'):>10}"
+            )
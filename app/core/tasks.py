@@ -1,8 +1,11 @@
 from celery import shared_task
 from typing import Any, Dict
 from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils import timezone
+from .cache.shared_arrays import SharedArrayCache
 from .models import TaskRecord
 from .services import TaskMonitorService
 from .decorators import MonitoredTask
@@ -83,4 +86,17 @@ def retry_task(self, func, *args, **kwargs):
             self.retry(exc=exc)
         except MaxRetriesExceededError:
             # 记录最终失败
-            raise 
\ No newline at end of file
+            raise
+
+@shared_task
+def compact_file_caches() -> Dict[str, Dict[str, int]]:
+    """整理有容量控制的文件缓存和本机共享数组缓存: 清理过期文件并按容量和配额淘汰"""
+    results = {}
+    for alias in settings.CACHES:
+        cache = caches[alias]
+        if hasattr(cache, 'compact'):
+            results[alias] = cache.compact()
+    shared_cache = SharedArrayCache.instance()
+    if shared_cache is not None:
+        results['shared_arrays'] = shared_cache.compact()
+    return results
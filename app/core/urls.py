@@ -0,0 +1,13 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from . import views
+
+router = DefaultRouter()
+router.register(r'metrics', views.CacheMetricsViewSet, basename='cache-metrics')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
+
+# 生成的 URL 模式:
+# /metrics/ - GET(缓存命中率、延迟和值大小指标, ?histograms=1 返回原始直方图)
@@ -0,0 +1,29 @@
+import math
+from rest_framework import viewsets
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from .cache.metrics import CacheMetrics
+from .cache.tiered import CacheTier
+
+
+class CacheMetricsViewSet(viewsets.ViewSet):
+    """缓存指标API视图集"""
+    permission_classes = [IsAdminUser]
+
+    def list(self, request):
+        """本机各进程汇总的缓存指标"""
+        max_age = request.query_params.get('max_age')
+        if max_age:
+            try:
+                max_age = float(max_age)
+            except ValueError:
+                max_age = None
+            if max_age is None or not math.isfinite(max_age) or max_age <= 0:
+                return Response({'error': 'max_age必须是正数(秒)'}, status=400)
+        result = CacheMetrics.collect(max_age=max_age or None)
+        if request.query_params.get('histograms') != '1':
+            for summary in result['namespaces'].values():
+                summary.pop('histograms')
+        # L1命中率只统计处理本请求的进程
+        result['l1'] = {backend: tier.hit_rates() for backend, tier in CacheTier._instances.items()}
+        return Response(result)
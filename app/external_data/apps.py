@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ExternalDataConfig(AppConfig):
+    name = 'app.external_data'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from app.core.cache.generations import GenerationStore, platform_namespace
+from .models import ExternalDataFetch
+
+
+@receiver(post_save, sender=ExternalDataFetch)
+def invalidate_platform_caches(sender, instance, **kwargs):
+    """平台数据获取完成后使该平台的缓存失效"""
+    if instance.status == 'completed':
+        platform_id = instance.platform_id
+        transaction.on_commit(lambda: GenerationStore().bump(platform_namespace(platform_id)))
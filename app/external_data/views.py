@@ -11,7 +11,8 @@ from .serializers import (
 )
 from .tasks import sync_platform_data, sync_all_platforms_data
 from .sync import DataSyncService
-from .core.decorators import cache_view_result
+from app.core.decorators import cache_view_result
+from app.core.cache.generations import platform_namespace
 
 class ExternalPlatformViewSet(viewsets.ModelViewSet):
     """外部平台API视图集"""
@@ -60,7 +61,8 @@ class ExternalDataFetchViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset.select_related('platform') 
 
     @action(detail=False, methods=['post'])
-    @cache_view_result('external_data', timeout=1800)
+    @cache_view_result('external_data', timeout=1800, stale_while_revalidate=1800,
+                       namespaces=lambda request, kwargs: [platform_namespace(request.data.get('platform_id'))])
     def fetch_data(self, request):
         """获取外部数据"""
         serializer = DataSyncRequestSerializer(data=request.data)
@@ -0,0 +1,119 @@
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Sequence, Tuple
+import numpy as np
+from scipy.integrate import trapezoid
+
+PortPair = Tuple[int, int]  # (输出端口, 输入端口)
+
+
+@dataclass
+class FomSettings:
+    """FOM计算设置(频率单位Hz)"""
+    baud_rate: float = 25.78125e9
+    f_min: float = 50e6             # 拟合起始频率
+    f_max: float = None             # 拟合终止频率, 默认为波特率
+    tx_bandwidth: float = None      # 发送滤波器3dB带宽ft, 默认波特率/4
+    rx_bandwidth: float = None      # 接收参考滤波器3dB带宽fr, 默认0.75倍波特率
+    next_amplitude: float = 1.2     # 近端干扰源峰峰值幅度(V)
+    fext_amplitude: float = 1.2     # 远端干扰源峰峰值幅度(V)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FomSettings':
+        """从配置字典构建, 忽略未知字段"""
+        names = {f.name for f in fields(cls)}
+        settings = cls(**{key: value for key, value in (data or {}).items() if key in names})
+        settings.f_max = settings.f_max or settings.baud_rate
+        settings.tx_bandwidth = settings.tx_bandwidth or settings.baud_rate / 4
+        settings.rx_bandwidth = settings.rx_bandwidth or 0.75 * settings.baud_rate
+        return settings
+
+    def validate(self) -> List[str]:
+        """验证设置"""
+        errors = []
+        if self.baud_rate <= 0:
+            errors.append("波特率必须为正")
+        if self.f_min >= self.f_max:
+            errors.append("拟合起始频率必须小于终止频率")
+        return errors
+
+    def to_dict(self) -> dict:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+class FomChiEngine:
+    """
+    通道品质因数计算引擎
+    插损拟合(ILD)、积分串扰噪声(ICN)和FOM_ILD均以整条频率向量的数组运算完成,
+    多个干扰源按功率和一次合成
+    """
+    def __init__(self, frequencies: np.ndarray, s_parameters: np.ndarray, settings: FomSettings):
+        self.frequencies = np.asarray(frequencies, dtype=float)
+        self.s_parameters = np.asarray(s_parameters)
+        self.settings = settings
+
+    def calculate(self, thru: PortPair, next_pairs: Sequence[PortPair] = (),
+                  fext_pairs: Sequence[PortPair] = ()) -> dict:
+        """计算直通通道的ILD/FOM_ILD和串扰ICN"""
+        settings = self.settings
+        band = (self.frequencies >= settings.f_min) & (self.frequencies <= settings.f_max)
+        if np.count_nonzero(band) < 4:
+            raise ValueError("拟合频段内的频点不足")
+        freqs = self.frequencies[band]
+        weight = self._weight(freqs)
+
+        insertion_loss = -self._to_db(self.s_parameters[band, thru[0], thru[1]])
+        coefficients, fitted = self._fit_insertion_loss(freqs, insertion_loss)
+        ild = insertion_loss - fitted
+
+        icn_next = self._crosstalk_noise(freqs, next_pairs, band, settings.next_amplitude)
+        icn_fext = self._crosstalk_noise(freqs, fext_pairs, band, settings.fext_amplitude)
+
+        nyquist = settings.baud_rate / 2
+        return {
+            'fom_ild': float(np.sqrt(np.mean(weight * ild ** 2))),
+            'ild_rms': float(np.sqrt(np.mean(ild ** 2))),
+            'ild_peak': float(np.max(np.abs(ild))),
+            'il_nyquist': float(np.interp(nyquist, freqs, insertion_loss)),
+            'il_fit_nyquist': float(np.interp(nyquist, freqs, fitted)),
+            'fit_coefficients': coefficients.tolist(),
+            'icn': float(np.hypot(icn_next, icn_fext)),
+            'icn_next': icn_next,
+            'icn_fext': icn_fext,
+            'points': int(len(freqs))
+        }
+
+    @staticmethod
+    def _to_db(values: np.ndarray) -> np.ndarray:
+        """幅度转dB"""
+        return 20 * np.log10(np.maximum(np.abs(values), 1e-12))
+
+    def _weight(self, freqs: np.ndarray) -> np.ndarray:
+        """sinc²(f/fb)与发送、接收参考滤波器的联合加权"""
+        settings = self.settings
+        return (np.sinc(freqs / settings.baud_rate) ** 2
+                / (1 + (freqs / settings.tx_bandwidth) ** 4)
+                / (1 + (freqs / settings.rx_bandwidth) ** 8))
+
+    @staticmethod
+    def _fit_insertion_loss(freqs: np.ndarray, insertion_loss: np.ndarray):
+        """
+        最小二乘拟合 IL(f) = a0 + a1·√f + a2·f + a4·f²(频率以GHz计)
+        :return: (系数, 拟合插损)
+        """
+        f_ghz = freqs / 1e9
+        design = np.column_stack([np.ones_like(f_ghz), np.sqrt(f_ghz), f_ghz, f_ghz ** 2])
+        coefficients, *_ = np.linalg.lstsq(design, insertion_loss, rcond=None)
+        return coefficients, design @ coefficients
+
+    def _crosstalk_noise(self, freqs: np.ndarray, pairs: Sequence[PortPair], band: np.ndarray,
+                         amplitude: float) -> float:
+        """
+        积分串扰噪声(V): σ = sqrt(2Δf·Σ W(f)·A²/fb·Σ|S_xt(f)|²)
+        不均匀频点按梯形积分处理
+        """
+        if not len(pairs):
+            return 0.0
+        pairs = np.asarray(pairs, dtype=int)
+        power_sum = np.sum(np.abs(self.s_parameters[band][:, pairs[:, 0], pairs[:, 1]]) ** 2, axis=-1)
+        density = amplitude ** 2 / self.settings.baud_rate * self._weight(freqs) * power_sum
+        return float(np.sqrt(2 * trapezoid(density, freqs)))
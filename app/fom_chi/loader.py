@@ -0,0 +1,44 @@
+from typing import Tuple
+import numpy as np
+from django.conf import settings
+from app.core.cache.manager import CacheManager
+from app.core.cache.shared_arrays import SharedArrayCache
+from app.parameter.models import SParameter
+
+
+def load_s_parameter_arrays(parameter: SParameter) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    加载S参数数组(频点 [F], S矩阵 [F, P, P])
+    按文件内容哈希缓存, 同一文件的重复计算不再解析JSON;
+    本机共享数组缓存命中时返回只读内存映射, 各进程共用同一份内存, 调用方不应原地修改
+    """
+    content_hash = parameter.get_content_hash()
+    shared_cache = SharedArrayCache.instance() if content_hash else None
+    if shared_cache is not None:
+        arrays = shared_cache.get_or_load(
+            f"s_parameter_{content_hash}",
+            lambda: dict(zip(('frequencies', 's_parameters'), _load_arrays(parameter, content_hash)))
+        )
+        return arrays['frequencies'], arrays['s_parameters']
+    return _load_arrays(parameter, content_hash)
+
+
+def _load_arrays(parameter: SParameter, content_hash: str) -> Tuple[np.ndarray, np.ndarray]:
+    """从缓存后端加载, 未命中时解析S参数数据"""
+    cache_manager = CacheManager(
+        backend=getattr(settings, 'FOM_CACHE_BACKEND', 'file'),
+        timeout=settings.CACHE_TIMEOUTS.get('long', 86400)
+    )
+    cache_key = f"fom_s_parameter_{content_hash or parameter.id}"
+
+    arrays = cache_manager.get(cache_key)
+    if arrays is None:
+        data = parameter.get_data()
+        if not data:
+            raise ValueError("S参数文件尚未解析")
+        arrays = (
+            np.asarray(data['frequencies'], dtype=float),
+            np.asarray(data['s_parameters'])
+        )
+        cache_manager.set(cache_key, arrays)
+    return arrays
@@ -23,8 +23,46 @@ class FomChiCalculation(TimeStampedModel):
         related_name='fom_chi_calculations',
         verbose_name="S参数文件"
     )
+    parameters = models.JSONField(default=dict, verbose_name="计算参数")
     result_data = models.JSONField(null=True, verbose_name="计算结果")
     
     class Meta:
         verbose_name = "Fom_chi计算"
-        verbose_name_plural = verbose_name 
\ No newline at end of file
+        verbose_name_plural = verbose_name 
+
+
+class FomChannelScore(TimeStampedModel):
+    """通道FOM排名记录(每个S参数文件在每个计算配置下一条)"""
+    s_parameter = models.ForeignKey(
+        SParameter,
+        on_delete=models.CASCADE,
+        related_name='fom_scores',
+        verbose_name="S参数文件"
+    )
+    profile = models.CharField(max_length=64, verbose_name="计算配置哈希")
+    content_hash = models.CharField(max_length=64, blank=True, verbose_name="S参数内容哈希")
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            ('completed', '已完成'),
+            ('failed', '失败')
+        ],
+        default='completed',
+        verbose_name="状态"
+    )
+    fom_ild = models.FloatField(null=True, verbose_name="FOM_ILD")
+    icn = models.FloatField(null=True, verbose_name="积分串扰噪声")
+    il_nyquist = models.FloatField(null=True, verbose_name="奈奎斯特频率插损")
+    error_message = models.TextField(blank=True, verbose_name="错误信息")
+    result_data = models.JSONField(null=True, verbose_name="计算结果")
+
+    class Meta:
+        verbose_name = "通道FOM排名"
+        verbose_name_plural = verbose_name
+        constraints = [
+            models.UniqueConstraint(fields=['s_parameter', 'profile'], name='unique_fom_score_profile')
+        ]
+        indexes = [
+            models.Index(fields=['profile', 'status', 'fom_ild']),
+            models.Index(fields=['profile', 'status', 'icn']),
+        ]
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+from celery import group
+from django.conf import settings
+from app.parameter.models import SParameter
+from .models import FomChannelScore
+from .engine import FomSettings, FomChiEngine
+from .loader import load_s_parameter_arrays
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FomProfile:
+    """批量FOM计算配置: 端口选择与FOM设置, 哈希作为排名表的分区键"""
+    thru: Tuple[int, int]
+    next: List[Tuple[int, int]] = field(default_factory=list)
+    fext: List[Tuple[int, int]] = field(default_factory=list)
+    settings: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FomProfile':
+        return cls(
+            thru=tuple(data['thru']),
+            next=[tuple(pair) for pair in data.get('next', [])],
+            fext=[tuple(pair) for pair in data.get('fext', [])],
+            settings=FomSettings.from_dict(data.get('settings', {})).to_dict()
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            'thru': list(self.thru),
+            'next': [list(pair) for pair in self.next],
+            'fext': [list(pair) for pair in self.fext],
+            'settings': self.settings
+        }
+
+    @property
+    def key(self) -> str:
+        return hashlib.sha256(json.dumps(self.to_dict(), sort_keys=True).encode()).hexdigest()
+
+
+class FomBatchRanker:
+    """
+    批量通道FOM排名
+    只重新计算内容哈希或计算配置发生变化的通道, 计算按块分发到Celery worker并行执行,
+    结果以upsert写入带索引的排名表
+    """
+    order_fields = {'fom_ild', 'icn', 'il_nyquist'}
+
+    def __init__(self, chunk_size: int = None):
+        self.chunk_size = chunk_size or getattr(settings, 'FOM_BATCH_CHUNK_SIZE', 20)
+
+    def stale_parameters(self, parameter_ids: List[int], profile: FomProfile) -> List[int]:
+        """找出需要重新计算的S参数, 内容哈希未知或上次未成功计算(如失败)的一律重算"""
+        current = SParameter.objects.filter(id__in=parameter_ids).values_list('id', 'content_hash')
+        scored = dict(
+            FomChannelScore.objects.filter(
+                profile=profile.key, s_parameter_id__in=parameter_ids, status='completed'
+            ).values_list('s_parameter_id', 'content_hash')
+        )
+        return [pk for pk, content_hash in current if not content_hash or scored.get(pk) != content_hash]
+
+    def dispatch(self, parameter_ids: List[int], profile: FomProfile, force: bool = False) -> dict:
+        """分发批量计算任务"""
+        from .tasks import compute_fom_scores
+
+        stale = list(parameter_ids) if force else self.stale_parameters(parameter_ids, profile)
+        result = {
+            'profile': profile.key,
+            'total': len(parameter_ids),
+            'scheduled': len(stale),
+            'group_id': None
+        }
+        if stale:
+            chunks = [stale[i:i + self.chunk_size] for i in range(0, len(stale), self.chunk_size)]
+            group_result = group(
+                compute_fom_scores.s(chunk, profile.to_dict()) for chunk in chunks
+            ).apply_async()
+            result['group_id'] = group_result.id
+        return result
+
+    def compute(self, parameter_ids: List[int], profile: FomProfile) -> int:
+        """计算一组通道的FOM并写入排名表, 返回写入条数"""
+        fom_settings = FomSettings.from_dict(profile.settings)
+        scores = []
+        for parameter in SParameter.objects.filter(id__in=parameter_ids):
+            score = FomChannelScore(s_parameter=parameter, profile=profile.key)
+            try:
+                # 文件缺失或不可读时哈希也会失败, 记录在该行而不是中断整批
+                score.content_hash = parameter.get_content_hash()
+                frequencies, s_parameters = load_s_parameter_arrays(parameter)
+                metrics = FomChiEngine(frequencies, s_parameters, fom_settings).calculate(
+                    profile.thru, profile.next, profile.fext
+                )
+                score.fom_ild = metrics['fom_ild']
+                score.icn = metrics['icn']
+                score.il_nyquist = metrics['il_nyquist']
+                score.result_data = metrics
+            except Exception as e:
+                logger.warning(f"S参数{parameter.id}的FOM计算失败: {str(e)}")
+                score.status = 'failed'
+                score.error_message = str(e)
+            scores.append(score)
+
+        FomChannelScore.objects.bulk_create(
+            scores,
+            update_conflicts=True,
+            unique_fields=['s_parameter', 'profile'],
+            update_fields=['content_hash', 'status', 'fom_ild', 'icn', 'il_nyquist',
+                           'error_message', 'result_data', 'updated_at']
+        )
+        return len(scores)
+
+    def ranked(self, profile_key: str, order_by: str = 'fom_ild', offset: int = 0, limit: int = 100) -> dict:
+        """
+        从排名表查询排序结果
+        :param order_by: 排序字段, 前缀'-'表示降序
+        """
+        if order_by.lstrip('-') not in self.order_fields:
+            raise ValueError(f"不支持的排序字段: {order_by}")
+
+        queryset = FomChannelScore.objects.filter(profile=profile_key, status='completed')
+        rows = queryset.order_by(order_by, 's_parameter_id').values(
+            's_parameter_id', 's_parameter__name', 'fom_ild', 'icn', 'il_nyquist', 'updated_at'
+        )[offset:offset + limit]
+        return {
+            'profile': profile_key,
+            'total': queryset.count(),
+            'results': [
+                {'rank': offset + index, **row}
+                for index, row in enumerate(rows, 1)
+            ]
+        }
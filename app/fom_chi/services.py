@@ -1,34 +1,65 @@
 from app.core.services import ProcessingService
 from .models import FomChiCalculation
+from .engine import FomSettings, FomChiEngine
+from .loader import load_s_parameter_arrays
 
 class FomChiProcessor(ProcessingService):
     """Fom_chi计算处理服务"""
+    parameter_keys = ('thru', 'next', 'fext', 'settings')
+
     def __init__(self, calculation: FomChiCalculation):
         super().__init__()
         self.calculation = calculation
 
+    def _parameters(self, kwargs: dict) -> dict:
+        """计算参数: 调用时传入的端口选择和设置覆盖计算记录中保存的值"""
+        return {
+            **(self.calculation.parameters or {}),
+            **{key: value for key, value in kwargs.items() if key in self.parameter_keys}
+        }
+
     def pre_process(self, **kwargs) -> bool:
         """计算前的准备工作"""
         if not self.calculation.s_parameter:
             self.add_error("缺少S参数文件")
             return False
+        if not self._parameters(kwargs).get('thru'):
+            self.add_error("缺少直通通道端口")
+            return False
         return True
 
     def process(self, **kwargs) -> dict:
         """执行Fom_chi计算"""
         try:
+            parameters = self._parameters(kwargs)
+            settings = FomSettings.from_dict(parameters.get('settings', {}))
+            errors = settings.validate()
+            if errors:
+                for error in errors:
+                    self.add_error(error)
+                return None
+
+            self.calculation.parameters = parameters
             self.calculation.status = self.status
             self.calculation.save()
             
-            # 实现具体的Fom_chi计算逻辑
+            frequencies, s_parameters = load_s_parameter_arrays(self.calculation.s_parameter)
+            engine = FomChiEngine(frequencies, s_parameters, settings)
+            metrics = engine.calculate(
+                tuple(parameters['thru']),
+                [tuple(pair) for pair in parameters.get('next', [])],
+                [tuple(pair) for pair in parameters.get('fext', [])]
+            )
+            
             result_data = {
                 'calculation_type': 'fom_chi',
                 'parameter_id': self.calculation.s_parameter.id,
-                # 添加其他计算结果数据
+                'settings': settings.to_dict(),
+                **metrics
             }
             
             self.calculation.result_data = result_data
-            self.calculation.status = self.status
+            self.calculation.status = 'completed'
             self.calculation.save()
             
             return result_data
@@ -40,4 +71,4 @@ class FomChiProcessor(ProcessingService):
     def post_process(self, result: dict) -> dict:
         """计算后的清理和数据整理工作"""
         # 可以在这里添加结果验证、数据转换等逻辑
-        return result 
\ No newline at end of file
+        return result 
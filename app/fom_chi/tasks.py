@@ -0,0 +1,15 @@
+from celery import shared_task
+from .ranking import FomBatchRanker, FomProfile
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def compute_fom_scores(self, parameter_ids: list, profile: dict):
+    """计算一块通道的FOM并写入排名表"""
+    try:
+        count = FomBatchRanker().compute(parameter_ids, FomProfile.from_dict(profile))
+    except Exception as e:
+        raise self.retry(exc=e)
+    return {
+        'status': 'success',
+        'computed': count
+    }
@@ -0,0 +1,14 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from . import views
+
+router = DefaultRouter()
+router.register(r'ranking', views.FomRankingViewSet, basename='fom-ranking')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
+
+# 生成的 URL 模式:
+# /ranking/batch/ - POST(批量计算FOM)
+# /ranking/ranked/ - GET(按FOM排序的通道排名)
@@ -0,0 +1,42 @@
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from .ranking import FomBatchRanker, FomProfile
+
+class FomRankingViewSet(viewsets.ViewSet):
+    """通道FOM批量计算与排名视图集"""
+    permission_classes = [IsAuthenticated]
+
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """批量计算FOM, 只重算发生变化的通道"""
+        parameter_ids = request.data.get('s_parameters', [])
+        if not parameter_ids or not request.data.get('thru'):
+            return Response({'error': '未指定S参数或直通通道'}, status=status.HTTP_400_BAD_REQUEST)
+
+        profile = FomProfile.from_dict(request.data)
+        result = FomBatchRanker().dispatch(
+            parameter_ids,
+            profile,
+            force=bool(request.data.get('force', False))
+        )
+        return Response(result, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['get'])
+    def ranked(self, request):
+        """按FOM排序的通道排名"""
+        profile_key = request.query_params.get('profile')
+        if not profile_key:
+            return Response({'error': '缺少计算配置'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            result = FomBatchRanker().ranked(
+                profile_key,
+                order_by=request.query_params.get('order_by', 'fom_ild'),
+                offset=int(request.query_params.get('offset', 0)),
+                limit=min(int(request.query_params.get('limit', 100)), 1000)
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result)
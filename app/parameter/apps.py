@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ParameterConfig(AppConfig):
+    name = 'app.parameter'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,36 @@
+import json
+from django.core.management.base import BaseCommand
+from app.parameter.tasks import warm_parameter_caches
+from app.parameter.warmup import warm_parameters
+
+
+class Command(BaseCommand):
+    """预热热门S参数的缓存"""
+    help = '按访问统计和收藏数挑选热门S参数, 预先加载解析数据、常用指标和COM脉冲响应'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, help='预热的S参数数量')
+        parser.add_argument('--steps', nargs='+', choices=['arrays', 'metrics', 'com_pulses'],
+                            help='只执行指定的预热步骤')
+        parser.add_argument('--rate', type=float, help='每秒最多处理的S参数数, 0表示不限制')
+        parser.add_argument('--max-seconds', type=float, help='预热总时长上限(秒)')
+        parser.add_argument('--async', action='store_true', dest='run_async', help='提交到Celery后台执行')
+
+    def handle(self, *args, **options):
+        if options['run_async']:
+            task = warm_parameter_caches.delay(
+                limit=options['limit'],
+                steps=options['steps'],
+                rate=options['rate'],
+                max_seconds=options['max_seconds']
+            )
+            self.stdout.write(f"已提交预热任务 {task.id}")
+            return
+
+        summary = warm_parameters(
+            limit=options['limit'],
+            steps=options['steps'],
+            rate=options['rate'],
+            max_seconds=options['max_seconds']
+        )
+        self.stdout.write(json.dumps(summary, ensure_ascii=False, indent=2))
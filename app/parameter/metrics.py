@@ -0,0 +1,44 @@
+import numpy as np
+from django.conf import settings
+from app.core.cache.manager import CacheManager
+from app.fom_chi.loader import load_s_parameter_arrays
+from .models import SParameter
+
+
+def compute_common_metrics(frequencies: np.ndarray, s_parameters: np.ndarray) -> dict:
+    """
+    常用指标: 各端口回波损耗和端口对插入损耗(dB)
+    :param s_parameters: [F, P, P]
+    :return: frequencies [F], return_loss [P, F], insertion_loss [P, P, F]
+    """
+    with np.errstate(divide='ignore'):
+        loss = -20 * np.log10(np.abs(s_parameters))  # [F, P, P]
+    loss = np.moveaxis(loss, 0, -1)  # [P, P, F]
+    return {
+        'frequencies': np.asarray(frequencies, dtype=float),
+        'return_loss': np.diagonal(loss, axis1=0, axis2=1).T.copy(),
+        'insertion_loss': loss
+    }
+
+
+def load_common_metrics(parameter: SParameter) -> dict:
+    """获取常用指标, 按文件内容哈希缓存, 所有用户共享"""
+    cache_manager = CacheManager(
+        backend=getattr(settings, 'S_PARAMETER_CACHE_BACKEND', 'default'),
+        timeout=settings.CACHE_TIMEOUTS.get('long', 86400),
+        local_cache=True
+    )
+    content_hash = parameter.get_content_hash()
+    cache_key = f"s_parameter_metrics_{content_hash or parameter.id}"
+
+    metrics = cache_manager.get(cache_key)
+    if metrics is None:
+        metrics = compute_common_metrics(*load_s_parameter_arrays(parameter))
+        cache_manager.set(cache_key, metrics, tags=[f"parameter_{parameter.id}"])
+    return metrics
+
+
+def metric_series(metrics: dict, name: str, *ports: int) -> list:
+    """取出某个指标的 (频率, 值) 序列"""
+    values = metrics[name][ports]
+    return list(zip(metrics['frequencies'].tolist(), values.tolist()))
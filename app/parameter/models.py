@@ -1,3 +1,4 @@
+import hashlib
 from django.db import models
 from django.contrib.auth import get_user_model
 
@@ -35,9 +36,27 @@ class SParameter(models.Model):
     description = models.TextField(blank=True)
     file = models.FileField(upload_to='s_parameters/')
     user = models.ForeignKey(get_user_model(), on_delete=models.CASCADE)
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)  # 文件内容SHA-256
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    def save(self, *args, **kwargs):
+        # 新上传的文件尚未提交到存储, 原有的内容哈希失效
+        if self.file and not self.file._committed:
+            self.content_hash = ''
+        super().save(*args, **kwargs)
+
+    def get_content_hash(self) -> str:
+        """获取文件内容哈希(按需计算并保存)"""
+        if not self.content_hash and self.file:
+            file_hash = hashlib.sha256()
+            with self.file.open('rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    file_hash.update(chunk)
+            self.content_hash = file_hash.hexdigest()
+            SParameter.objects.filter(pk=self.pk).update(content_hash=self.content_hash)
+        return self.content_hash
+
     def get_data(self):
         """获取处理后的数据"""
         latest_history = self.sparameterhistory_set.filter(
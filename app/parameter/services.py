@@ -1,4 +1,3 @@
-from django.core.cache import cache
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 from django.utils import timezone
@@ -13,6 +12,7 @@ from tempfile import TemporaryDirectory, NamedTemporaryFile
 from app.core.services import ProcessingService
 from .models import SParameter, SParameterHistory, Simulation
 from app.core.cache.manager import FileCacheManager, CacheManager
+from app.core.cache.generations import parameter_namespace
 
 class SParameterProcessor(ProcessingService):
     """S参数处理服务"""
@@ -94,12 +94,21 @@ class SParameterDataService:
     def data(self) -> dict:
         """获取数据(带缓存)"""
         if self._data_cache is None:
-            cache_key = f"s_parameter_data_{self.parameter.id}"
-            self._data_cache = cache.get(cache_key)
+            # 热点数据, 进程内L1命中时无需网络往返和反序列化
+            cache_manager = CacheManager(
+                backend=getattr(settings, 'S_PARAMETER_CACHE_BACKEND', 'default'),
+                timeout=3600,
+                local_cache=True
+            )
+            cache_key = cache_manager.versioned_key(
+                f"s_parameter_data_{self.parameter.id}",
+                parameter_namespace(self.parameter.id)
+            )
+            self._data_cache = cache_manager.get(cache_key)
             
             if self._data_cache is None:
                 self._data_cache = self._load_data()
-                cache.set(cache_key, self._data_cache, timeout=3600)
+                cache_manager.set(cache_key, self._data_cache, tags=[f"parameter_{self.parameter.id}"])
         
         return self._data_cache
     
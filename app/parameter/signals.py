@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from app.core.cache.generations import GenerationStore, parameter_namespace
+from .models import SParameter, SParameterHistory
+
+
+def _bump_parameter(parameter_id: int):
+    """事务提交后递增S参数命名空间的代数, 避免提交前被读取的旧数据重新写入缓存"""
+    transaction.on_commit(lambda: GenerationStore().bump(parameter_namespace(parameter_id)))
+
+
+@receiver(post_save, sender=SParameter)
+@receiver(post_delete, sender=SParameter)
+def invalidate_parameter_caches(sender, instance, **kwargs):
+    """S参数文件或元数据变更时使派生缓存失效"""
+    _bump_parameter(instance.id)
+
+
+@receiver(post_save, sender=SParameterHistory)
+def invalidate_parsed_data_caches(sender, instance, **kwargs):
+    """重新解析后使基于解析结果的缓存失效"""
+    _bump_parameter(instance.parameter_id)
@@ -22,7 +22,8 @@ from .services import SimulationService
 # 添加缺失的导入
 import numpy as np
 import matplotlib.pyplot as plt
-from app.core.cache.manager import FileCacheManager
+from app.core.cache.manager import FileCacheManager, CacheManager
+from .warmup import warm_parameters
 
 @shared_task
 def generate_parameter_export(ids: list, user_id: int) -> str:
@@ -72,7 +73,7 @@ def generate_parameter_export(ids: list, user_id: int) -> str:
         
         # 保存ZIP文件
         file_key = f"export_file_{user_id}"
-        cache.set(file_key, zip_buffer.getvalue(), timeout=3600)
+        CacheManager(timeout=3600).set(file_key, zip_buffer.getvalue())
         cache.set(progress_key, {'status': 'completed', 'progress': 100}, timeout=3600)
         
         return file_key
@@ -174,4 +175,20 @@ def process_large_file(file_path: str):
         file_paths=file_path,
         func=process_chunks,
         args=(file_path,)
-    ) 
\ No newline at end of file
+    )
+
+@shared_task
+def warm_parameter_caches(limit: int = None, steps: list = None, rate: float = None,
+                          max_seconds: float = None) -> dict:
+    """预热热门S参数的缓存, 同一时间只运行一个预热任务"""
+    lock_key = 'cache_warmup_running'
+    lock_timeout = (max_seconds or getattr(settings, 'CACHE_WARMUP_MAX_SECONDS', 600)) + 60
+    if not cache.add(lock_key, True, timeout=lock_timeout):
+        return {'status': 'skipped', 'reason': '已有预热任务在运行'}
+    try:
+        return {
+            'status': 'completed',
+            **warm_parameters(limit=limit, steps=steps, rate=rate, max_seconds=max_seconds)
+        }
+    finally:
+        cache.delete(lock_key)
@@ -29,6 +29,16 @@ from app.core.decorators import cache_view_result, cache_result, cache_method_re
 from .tasks import generate_parameter_export, run_simulation
 from app.core.cache import CacheManager
 from app.core.cache.manager import FileCacheManager
+from app.core.cache.warmup import AccessStats
+from app.core.cache.generations import parameter_namespace
+from app.core.cache.coalesce import RequestCoalescer, coalesce_key
+from .metrics import load_common_metrics, metric_series
+
+
+def _record_parameter_access(pk):
+    """记录S参数访问(用于缓存预热), 只在对象已解析或命中该用户的视图缓存后调用"""
+    AccessStats('s_parameter').record(int(pk))
+
 
 class SParameterViewSet(viewsets.ModelViewSet):
     queryset = SParameter.objects.all()
@@ -46,25 +56,34 @@ class SParameterViewSet(viewsets.ModelViewSet):
         return queryset
 
     @action(detail=True, methods=['post'])
-    @cache_view_result('parameter_analysis')
+    @cache_view_result('parameter_analysis', stale_while_revalidate=3600,
+                       namespaces=lambda request, kwargs: [parameter_namespace(kwargs['pk'])],
+                       on_hit=lambda request, kwargs: _record_parameter_access(kwargs['pk']))
     def analyze(self, request, pk=None):
         """分析S参数"""
         instance = self.get_object()
-        analyzer = SParameterAnalyzer(instance.get_data()['data_points'])
+        _record_parameter_access(instance.id)
         
         analysis_type = request.data.get('type')
         port = request.data.get('port')
+        port2 = request.data.get('port2')
         
+        # 回波/插入损耗按文件内容缓存, 所有用户共享(可由缓存预热生成)
         if analysis_type == 'return_loss':
-            result = analyzer.get_return_loss(port)
+            compute = lambda: metric_series(load_common_metrics(instance), 'return_loss', port)
         elif analysis_type == 'insertion_loss':
-            port2 = request.data.get('port2')
-            result = analyzer.get_insertion_loss(port, port2)
+            compute = lambda: metric_series(load_common_metrics(instance), 'insertion_loss', port, port2)
         elif analysis_type == 'vswr':
-            result = analyzer.get_vswr(port)
+            compute = lambda: SParameterAnalyzer(instance.get_data()['data_points']).get_vswr(port)
         else:
             return Response({'error': '不支持的分析类型'}, status=400)
-            
+
+        # 权限检查后合并各用户同时发起的相同分析
+        result = RequestCoalescer().run(
+            coalesce_key('parameter_analysis', pk=instance.id, type=analysis_type, port=port, port2=port2),
+            compute,
+            namespaces=[parameter_namespace(instance.id)]
+        )
         return Response({
             'type': analysis_type,
             'data': result
@@ -171,7 +190,8 @@ class SParameterViewSet(viewsets.ModelViewSet):
         if progress['status'] == 'completed':
             # 获取文件
             file_key = f"export_file_{request.user.id}"
-            file_data = cache.get(file_key)
+            file_cache = CacheManager(timeout=3600)
+            file_data = file_cache.get(file_key)
             
             if file_data:
                 # 使用 default_storage 保存并获取下载 URL
@@ -182,7 +202,7 @@ class SParameterViewSet(viewsets.ModelViewSet):
                 
                 # 清理缓存
                 cache.delete(progress_key)
-                cache.delete(file_key)
+                file_cache.delete(file_key)
                 
                 return Response({
                     'status': 'completed',
@@ -404,6 +424,7 @@ class SParameterViewSet(viewsets.ModelViewSet):
     def retrieve(self, request, *args, **kwargs):
         """重写获取详情方法，添加文件URL"""
         instance = self.get_object()
+        _record_parameter_access(instance.id)
         serializer = self.get_serializer(instance)
         data = serializer.data
         
@@ -460,7 +481,11 @@ class SParameterViewSet(viewsets.ModelViewSet):
     def get_analysis(self, request, pk=None):
         """获取分析结果（使用装饰器缓存）"""
         instance = self.get_object()
-        result = self.analyze_data(instance)
+        result = RequestCoalescer().run(
+            coalesce_key('parameter_get_analysis', pk=instance.id),
+            lambda: self.analyze_data(instance),
+            namespaces=[parameter_namespace(instance.id)]
+        )
         return Response(result)
 
     @action(detail=True, methods=['get'])
@@ -471,13 +496,21 @@ class SParameterViewSet(viewsets.ModelViewSet):
             key_prefix='parameter_data'
         )
         
-        cache_key = f"data_{pk}"
+        cache_key = cache_manager.versioned_key(f"data_{pk}", parameter_namespace(pk))
         cached_data = cache_manager.get(cache_key)
         if cached_data is not None:
             return Response(cached_data)
             
-        data = self.process_data(self.get_object())
-        cache_manager.set(cache_key, data)
+        instance = self.get_object()
+
+        def compute():
+            # 只由合并后的一个调用方计算并写入缓存
+            data = self.process_data(instance)
+            cache_manager.set(cache_key, data, tags=[f"parameter_{pk}"])
+            return data
+
+        # cache_key已包含数据代数
+        data = RequestCoalescer().run(coalesce_key('parameter_data', key=cache_key), compute)
         return Response(data)
 
     @action(detail=False, methods=['post'])
@@ -570,10 +603,18 @@ class SParameterViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['post'])
     def clear_cache(self, request):
-        """清理指定模式的缓存"""
-        pattern = request.data.get('pattern', '')
+        """清理指定S参数或指定模式的缓存"""
         cache_manager = CacheManager(backend='default')
-        deleted_count = cache_manager.delete_pattern(pattern)
+        parameter_id = request.data.get('parameter_id')
+        if parameter_id:
+            # 递增代数使所有后端中的版本化键失效, 标签删除立即释放Redis中的空间
+            cache_manager.bump(parameter_namespace(parameter_id))
+            deleted_count = cache_manager.delete_tag(f"parameter_{parameter_id}")
+        else:
+            pattern = request.data.get('pattern', '')
+            if not pattern:
+                return Response({'error': '未指定S参数或缓存模式'}, status=400)
+            deleted_count = cache_manager.delete_pattern(pattern)
         return Response({
             'deleted_count': deleted_count
         })
@@ -0,0 +1,67 @@
+from collections import Counter
+from typing import List, Optional
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count
+from app.core.cache.warmup import AccessStats, CacheWarmer
+from app.collection.models import Collection
+from app.com_simulation.pulse import load_pulse_responses
+from app.fom_chi.loader import load_s_parameter_arrays
+from .metrics import load_common_metrics
+from .models import SParameter
+
+
+def hot_parameter_ids(limit: int) -> List[int]:
+    """
+    按热度挑选S参数: 近期访问次数 + 收藏数 * CACHE_WARMUP_FAVORITE_WEIGHT
+    """
+    scores = Counter()
+    for object_id, hits in AccessStats('s_parameter').top(limit):
+        scores[int(object_id)] += hits
+
+    favourite_weight = getattr(settings, 'CACHE_WARMUP_FAVORITE_WEIGHT', 5)
+    favourites = (
+        Collection.objects
+        .filter(content_type=ContentType.objects.get_for_model(SParameter), is_deleted=False)
+        .values('object_id')
+        .annotate(total=Count('id'))
+        .order_by('-total')[:limit]
+    )
+    for row in favourites:
+        scores[row['object_id']] += row['total'] * favourite_weight
+
+    return [object_id for object_id, _ in scores.most_common(limit)]
+
+
+def warm_pulse_responses(parameter: SParameter):
+    """按配置的速率组合预先生成COM脉冲响应"""
+    for profile in getattr(settings, 'CACHE_WARMUP_COM_PROFILES', []):
+        load_pulse_responses(
+            parameter,
+            profile['sample_rate'],
+            profile['bit_rate'],
+            num_ui=profile.get('num_ui', 64)
+        )
+
+
+def build_parameter_warmer(rate: Optional[float] = None, max_seconds: Optional[float] = None) -> CacheWarmer:
+    """S参数缓存预热流程: 解析数据 -> 常用指标 -> COM脉冲响应"""
+    return (
+        CacheWarmer(rate=rate, max_seconds=max_seconds)
+        .register('arrays', load_s_parameter_arrays)
+        .register('metrics', load_common_metrics)
+        .register('com_pulses', warm_pulse_responses)
+    )
+
+
+def warm_parameters(limit: Optional[int] = None, steps: Optional[List[str]] = None,
+                    rate: Optional[float] = None, max_seconds: Optional[float] = None) -> dict:
+    """预热最热门的S参数"""
+    ids = hot_parameter_ids(limit or getattr(settings, 'CACHE_WARMUP_LIMIT', 50))
+    parameters = SParameter.objects.in_bulk(ids)
+    # 保持热度顺序, 时长用尽时优先完成最热门的对象
+    ordered = (parameters[object_id] for object_id in ids if object_id in parameters)
+    return {
+        'candidates': len(ids),
+        **build_parameter_warmer(rate, max_seconds).run(ordered, steps=steps)
+    }
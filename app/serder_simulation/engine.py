@@ -0,0 +1,375 @@
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+from app.com_simulation.fft_plan import FFTPlanner
+from app.com_simulation.jitter import find_crossings, JitterHistogram, DualDiracFitter
+
+# PRBS生成多项式 x[n] = x[n-a] ^ x[n-b]
+PRBS_TAPS = {7: (7, 6), 9: (9, 5), 11: (11, 9), 15: (15, 14), 23: (23, 18)}
+
+
+@lru_cache(maxsize=8)
+def _prbs_period(order: int) -> np.ndarray:
+    """生成一个完整周期的PRBS序列(只读)"""
+    a, b = PRBS_TAPS[order]
+    period = (1 << order) - 1
+    bits = np.ones(period + a, dtype=np.int8)
+    # 每次可向量化生成b个比特, 它们只依赖已生成的比特
+    for n in range(a, period + a, b):
+        end = min(n + b, period + a)
+        bits[n:end] = bits[n - a:end - a] ^ bits[n - b:end - b]
+    bits = bits[:period]
+    bits.setflags(write=False)
+    return bits
+
+
+def prbs_symbols(order: int, start: int, stop: int) -> np.ndarray:
+    """按全局比特索引随机访问PRBS码型, 返回±1符号"""
+    period = _prbs_period(order)
+    return period[np.arange(start, stop) % len(period)] * 2.0 - 1.0
+
+
+@dataclass
+class SerdesConfig:
+    """SerDes链路仿真配置"""
+    sample_rate: float = 32e9
+    bit_rate: float = 1e9
+    num_bits: int = 100_000
+    block_bits: int = 4096    # 每个处理块的比特数
+    prbs_order: int = 7
+    tx_ffe: List[float] = field(default_factory=lambda: [1.0])  # TX FFE抽头, 间隔1 UI
+    tx_ffe_pre: int = 0       # TX FFE前标抽头数
+    ctle: Optional[Dict[str, Any]] = None  # {'dc_gain_db', 'zero', 'poles'}
+    dfe_taps: int = 0
+    noise_rms: float = 0.0    # 折算到采样器输入的噪声有效值
+    impulse_ui: int = 64      # 冲激响应截取长度(UI)
+    cdr: bool = True
+    eye_bins: int = 128       # 眼图幅度分箱数
+    jitter_bins: int = 256
+    target_ber: float = 1e-12
+    seed: int = 0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SerdesConfig':
+        """从配置字典构建, 忽略未知字段"""
+        names = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in names})
+
+    def validate(self) -> List[str]:
+        """验证配置"""
+        errors = []
+        if self.sample_rate <= 0 or self.bit_rate <= 0:
+            errors.append("采样率和比特率必须为正")
+        elif self.sample_rate / self.bit_rate < 2:
+            errors.append("每UI至少需要2个采样点")
+        if self.prbs_order not in PRBS_TAPS:
+            errors.append(f"不支持的PRBS阶数: {self.prbs_order}")
+        if not self.tx_ffe or not 0 <= self.tx_ffe_pre < len(self.tx_ffe):
+            errors.append("TX FFE抽头配置无效")
+        if self.block_bits < self.impulse_ui:
+            errors.append("处理块长度不能小于冲激响应长度")
+        if self.num_bits < 2 * self.block_bits:
+            errors.append("比特数至少为两个处理块")
+        if self.ctle and not {'dc_gain_db', 'zero', 'poles'} <= set(self.ctle):
+            errors.append("CTLE参数需包含dc_gain_db, zero和poles")
+        return errors
+
+    @property
+    def samples_per_ui(self) -> int:
+        return int(round(self.sample_rate / self.bit_rate))
+
+    @property
+    def num_blocks(self) -> int:
+        return self.num_bits // self.block_bits
+
+
+class OverlapSaveConvolver:
+    """
+    FFT重叠保留卷积
+    每次处理固定长度的输入块, 只保留上一块末尾的 taps-1 个样本作为状态
+    """
+    def __init__(self, impulse: np.ndarray, block_length: int, planner: FFTPlanner):
+        self.planner = planner
+        self.taps = len(impulse)
+        self.fft_length = planner.fast_length(block_length + self.taps - 1)
+        self.spectrum = planner.rfft(impulse, n=self.fft_length)
+        self.history = np.zeros(self.taps - 1)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """卷积一个输入块, 返回等长输出"""
+        frame = np.concatenate([self.history, block])
+        output = self.planner.irfft(self.planner.rfft(frame, n=self.fft_length) * self.spectrum,
+                                    n=self.fft_length)
+        self.history = frame[len(frame) - (self.taps - 1):]
+        return output[self.taps - 1:self.taps - 1 + len(block)]
+
+
+@dataclass
+class SerdesStatistics:
+    """
+    SerDes统计量
+    只包含计数和极值, 不同分片的统计可以精确合并
+    """
+    bits: int
+    errors: int
+    eye_counts: np.ndarray    # [2 * 每UI采样数, 幅度分箱]
+    jitter_counts: np.ndarray  # [抖动分箱]
+    inner_high: float = np.inf   # 逻辑1采样的最小值
+    inner_low: float = -np.inf   # 逻辑0采样的最大值
+    phase_sum: int = 0
+    phase_min: int = 0
+    phase_max: int = 0
+    blocks: int = 0
+
+    @classmethod
+    def empty(cls, eye_shape: tuple, jitter_bins: int) -> 'SerdesStatistics':
+        return cls(
+            bits=0,
+            errors=0,
+            eye_counts=np.zeros(eye_shape, dtype=np.int64),
+            jitter_counts=np.zeros(jitter_bins, dtype=np.int64)
+        )
+
+    def merge(self, other: 'SerdesStatistics') -> 'SerdesStatistics':
+        """合并另一分片的统计"""
+        if not other.blocks:
+            return self
+        if not self.blocks:
+            return other
+        return SerdesStatistics(
+            bits=self.bits + other.bits,
+            errors=self.errors + other.errors,
+            eye_counts=self.eye_counts + other.eye_counts,
+            jitter_counts=self.jitter_counts + other.jitter_counts,
+            inner_high=min(self.inner_high, other.inner_high),
+            inner_low=max(self.inner_low, other.inner_low),
+            phase_sum=self.phase_sum + other.phase_sum,
+            phase_min=min(self.phase_min, other.phase_min),
+            phase_max=max(self.phase_max, other.phase_max),
+            blocks=self.blocks + other.blocks
+        )
+
+
+class SerdesEngine:
+    """
+    时域SerDes链路仿真引擎
+    比特流按固定块经过 TX FFE -> 信道(含RX CTLE)冲激响应 -> 噪声 -> 理想DFE -> CDR采样,
+    所有中间量只与全局块索引有关, 内存占用与比特数无关, 任意块区间可独立仿真
+    """
+    def __init__(self, frequencies: np.ndarray, channel: np.ndarray, config: SerdesConfig):
+        self.config = config
+        self.spu = config.samples_per_ui
+        self.block_samples = config.block_bits * self.spu
+        self.planner = FFTPlanner(config.sample_rate)
+        self.tx_ffe = np.asarray(config.tx_ffe, dtype=float)
+        self.ffe_post = len(self.tx_ffe) - 1 - config.tx_ffe_pre
+
+        self.impulse = self._impulse_response(np.asarray(frequencies), np.asarray(channel))
+        symbol_pulse = self._symbol_pulse()
+        self.delay = max(int(np.argmax(symbol_pulse)) - config.tx_ffe_pre * self.spu, 0)
+        self.dfe = self._dfe_taps(symbol_pulse)
+        self.amplitude_range = self._amplitude_range(symbol_pulse)
+        self.lookahead_blocks = -(-(self.delay + 2 * self.spu) // self.block_samples)
+        self.jitter_edges = np.linspace(-0.5, 0.5, config.jitter_bins + 1)
+
+    def _impulse_response(self, frequencies: np.ndarray, channel: np.ndarray) -> np.ndarray:
+        """信道与RX CTLE级联后的离散冲激响应"""
+        length = self.config.impulse_ui * self.spu
+        fft_length = self.planner.fast_length(length)
+        freqs = self.planner.frequencies(fft_length)
+        response = self.planner.interpolate(freqs, frequencies, channel)
+        ctle = self.config.ctle
+        if ctle:
+            gain = 10 ** (ctle['dc_gain_db'] / 20)
+            p1, p2 = ctle['poles']
+            jf = 1j * freqs
+            response = response * (gain + jf / ctle['zero']) / ((1 + jf / p1) * (1 + jf / p2))
+        return self.planner.irfft(response, n=fft_length)[:length]
+
+    def _symbol_pulse(self) -> np.ndarray:
+        """单个数据符号(含TX FFE)的响应, 索引0对应最前的前标抽头"""
+        pulse = np.convolve(self.impulse, np.ones(self.spu))
+        taps = np.zeros(len(self.tx_ffe) * self.spu)
+        taps[::self.spu] = self.tx_ffe
+        return np.convolve(pulse, taps)[:len(pulse)]
+
+    def _dfe_taps(self, symbol_pulse: np.ndarray) -> np.ndarray:
+        """迫零DFE抽头: 名义采样点处的后标"""
+        main = self.delay + self.config.tx_ffe_pre * self.spu
+        positions = main + self.spu * np.arange(1, self.config.dfe_taps + 1)
+        positions = positions[positions < len(symbol_pulse)]
+        taps = np.zeros(self.config.dfe_taps)
+        taps[:len(positions)] = symbol_pulse[positions]
+        return taps
+
+    def _amplitude_range(self, symbol_pulse: np.ndarray) -> float:
+        """眼图幅度范围: 各相位峰值失真的最大值加噪声裕量"""
+        padded = np.pad(symbol_pulse, (0, -len(symbol_pulse) % self.spu))
+        peak = np.max(np.sum(np.abs(padded.reshape(-1, self.spu)), axis=0))
+        return float(peak * 1.1 + 6 * self.config.noise_rms)
+
+    def _block_origin(self, block: int) -> int:
+        """块内第一个符号的名义采样位置"""
+        return block * self.block_samples + self.delay
+
+    def _received_block(self, convolver: OverlapSaveConvolver, block: int) -> np.ndarray:
+        """生成第block块发送波形并经过信道, 叠加该块固定种子的噪声"""
+        bits = self.config.block_bits
+        symbols = prbs_symbols(self.config.prbs_order,
+                               block * bits - self.ffe_post,
+                               (block + 1) * bits + self.config.tx_ffe_pre)
+        transmitted = np.repeat(np.convolve(symbols, self.tx_ffe, 'valid'), self.spu)
+        received = convolver.process(transmitted)
+        if self.config.noise_rms:
+            rng = np.random.default_rng([self.config.seed, block])
+            received = received + rng.normal(0.0, self.config.noise_rms, len(received))
+        return received
+
+    def run(self, start_block: int = 0, end_block: Optional[int] = None,
+            progress_callback: Optional[Callable[[int, int, str], None]] = None) -> SerdesStatistics:
+        """
+        仿真[start_block, end_block)区间的符号块
+        从start_block前两块开始预热, 使卷积状态和CDR相位与整段仿真完全一致
+        """
+        end_block = self.config.num_blocks if end_block is None else end_block
+        warm_block = max(0, start_block - 2)
+        first_counted = max(start_block, 1)  # 第0块包含启动瞬态, 不计入统计
+        stats = SerdesStatistics.empty((2 * self.spu, self.config.eye_bins), self.config.jitter_bins)
+
+        convolver = OverlapSaveConvolver(self.impulse, self.block_samples, self.planner)
+        # 第0块之前为静默, 输出以零填充
+        pad = 2 * self.spu if warm_block == 0 else 0
+        buffer = np.zeros(pad)
+        buffer_start = warm_block * self.block_samples - pad
+
+        phase = 0
+        block = warm_block
+        report_every = max(1, (end_block - start_block) // 100)
+        for input_block in range(warm_block, end_block + self.lookahead_blocks):
+            buffer = np.concatenate([buffer, self._received_block(convolver, input_block)])
+            while block < end_block and buffer_start + len(buffer) >= self._block_origin(block + 1) + 2 * self.spu:
+                crossings = self._process_block(block, phase, buffer, buffer_start,
+                                                stats if block >= first_counted else None)
+                if self.config.cdr:
+                    phase = self._recover_phase(crossings, phase)
+                block += 1
+
+                keep_from = max(0, self._block_origin(block) - 2 * self.spu - buffer_start)
+                buffer = buffer[keep_from:]
+                buffer_start += keep_from
+
+                done = block - start_block
+                if progress_callback and done > 0 and (done % report_every == 0 or block == end_block):
+                    progress_callback(done, end_block - start_block,
+                                      f"已仿真 {done * self.config.block_bits} 比特")
+        return stats
+
+    def _process_block(self, block: int, phase: int, buffer: np.ndarray, buffer_start: int,
+                       stats: Optional[SerdesStatistics]) -> np.ndarray:
+        """
+        处理一个符号块: 采样判决、理想DFE、眼图与抖动直方图
+        :return: 块内的交叉点(相对名义采样位置, 采样点)
+        """
+        bits = self.config.block_bits
+        spu = self.spu
+        origin = self._block_origin(block)
+
+        # 交叉点只与波形有关, 用于CDR和抖动统计
+        segment = buffer[origin - buffer_start:self._block_origin(block + 1) - buffer_start + 1]
+        crossings = find_crossings(segment[None, :], 0.0)
+        if stats is None:
+            return crossings
+
+        # 理想DFE: 以已知发送符号抵消后标ISI(不考虑误码传播)
+        taps = len(self.dfe)
+        symbols = prbs_symbols(self.config.prbs_order, block * bits - taps, (block + 1) * bits)
+        data = symbols[taps:]
+        if taps:
+            feedback = np.convolve(symbols, np.concatenate([[0.0], self.dfe]))[taps:taps + bits]
+        else:
+            feedback = np.zeros(bits)
+
+        # 以采样点为中心截取2 UI窗口
+        sample_index = origin + phase + spu * np.arange(bits) - buffer_start
+        windows = buffer[sample_index[:, None] + np.arange(-spu, spu)] - feedback[:, None]
+        samples = windows[:, spu]
+
+        decisions = np.where(samples >= 0, 1.0, -1.0)
+        stats.errors += int(np.count_nonzero(decisions != data))
+        stats.bits += bits
+        if np.any(data > 0):
+            stats.inner_high = min(stats.inner_high, float(samples[data > 0].min()))
+        if np.any(data < 0):
+            stats.inner_low = max(stats.inner_low, float(samples[data < 0].max()))
+
+        eye_bins = self.config.eye_bins
+        amplitude = ((windows + self.amplitude_range) / (2 * self.amplitude_range) * eye_bins).astype(int)
+        amplitude = np.clip(amplitude, 0, eye_bins - 1)
+        flat = np.arange(2 * spu)[None, :] * eye_bins + amplitude
+        stats.eye_counts += np.bincount(flat.ravel(), minlength=stats.eye_counts.size).reshape(stats.eye_counts.shape)
+
+        histogram = JitterHistogram.from_crossings(crossings - phase, spu, bins=self.config.jitter_bins,
+                                                   center=spu / 2)
+        stats.jitter_counts += histogram.counts
+
+        stats.phase_min = min(stats.phase_min, phase) if stats.blocks else phase
+        stats.phase_max = max(stats.phase_max, phase) if stats.blocks else phase
+        stats.phase_sum += phase
+        stats.blocks += 1
+        return crossings
+
+    def _recover_phase(self, crossings: np.ndarray, phase: int) -> int:
+        """
+        前馈式CDR: 以上一块交叉点的圆周均值定位边沿, 采样点置于两边沿中间
+        相位只依赖上一块的波形, 因此分片仿真时可精确复现
+        """
+        if not len(crossings):
+            return phase
+        angle = np.angle(np.mean(np.exp(2j * np.pi * crossings / self.spu)))
+        edge = angle / (2 * np.pi) * self.spu
+        offset = int(np.round(edge - self.spu / 2))
+        return (offset + self.spu // 2) % self.spu - self.spu // 2
+
+    def _eye_width(self, stats: SerdesStatistics) -> float:
+        """
+        眼宽(UI): 1 UI减去插值交叉点的分布范围, 不超过1 UI
+        交叉点由相邻采样点线性插值得到, 快边沿越过零附近幅度分箱时也不会遗漏; 采样点处眼图闭合时为0
+        """
+        if not stats.bits or stats.inner_high <= stats.inner_low:
+            return 0.0
+        occupied = np.flatnonzero(stats.jitter_counts)
+        if not len(occupied):
+            return 1.0
+        spread = self.jitter_edges[occupied[-1] + 1] - self.jitter_edges[occupied[0]]
+        return float(np.clip(1.0 - spread, 0.0, 1.0))
+
+    def summarize(self, stats: SerdesStatistics) -> dict:
+        """由统计量计算链路指标"""
+        spu = self.spu
+        eye_width = self._eye_width(stats)
+
+        jitter = DualDiracFitter().fit(
+            JitterHistogram(counts=stats.jitter_counts, edges=self.jitter_edges),
+            self.config.target_ber
+        )
+        return {
+            'bits': stats.bits,
+            'errors': stats.errors,
+            'ber': stats.errors / stats.bits if stats.bits else None,
+            'eye_height': max(0.0, stats.inner_high - stats.inner_low) if stats.bits else 0.0,
+            'eye_width': eye_width,
+            'jitter': jitter.to_dict(),
+            'cdr': {
+                'mean_phase_ui': stats.phase_sum / stats.blocks / spu if stats.blocks else 0.0,
+                'min_phase_ui': stats.phase_min / spu,
+                'max_phase_ui': stats.phase_max / spu
+            },
+            'dfe_taps': self.dfe.tolist(),
+            'cursor_delay': self.delay,
+            'eye_diagram': {
+                'counts': stats.eye_counts.tolist(),
+                'amplitude_range': [-self.amplitude_range, self.amplitude_range],
+                'time_range_ui': [-1, 1]
+            }
+        }
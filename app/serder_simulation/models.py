@@ -23,6 +23,7 @@ class SerderSimulation(TimeStampedModel):
         related_name='serder_simulations',
         verbose_name="S参数文件"
     )
+    parameters = models.JSONField(default=dict, verbose_name="仿真参数")
     result_data = models.JSONField(null=True, verbose_name="仿真结果")
     
     class Meta:
@@ -1,2 +1,83 @@
 from app.core.services import ProcessingService
-from .models import SerderSimulation 
\ No newline at end of file
+from .models import SerderSimulation
+from .engine import SerdesConfig, SerdesEngine
+from .parallel import ShardedSerdesRunner
+import numpy as np
+
+class SerderSimulationProcessor(ProcessingService):
+    """Serder仿真处理服务"""
+    def __init__(self, simulation: SerderSimulation):
+        super().__init__()
+        self.simulation = simulation
+
+    def pre_process(self, **kwargs) -> bool:
+        """仿真前的准备工作"""
+        if not self.simulation.s_parameter:
+            self.add_error("缺少S参数文件")
+            return False
+        return True
+
+    def process(self, **kwargs) -> dict:
+        """执行Serder链路仿真"""
+        try:
+            config = SerdesConfig.from_dict(kwargs.get('settings', {}))
+            errors = config.validate()
+            if errors:
+                for error in errors:
+                    self.add_error(error)
+                return None
+
+            # 更新状态
+            self.simulation.status = self.status
+            self.simulation.save()
+
+            channel = self._extract_channel(kwargs.get('input_port', 0), kwargs.get('output_port', 1))
+            if channel is None:
+                return None
+            frequencies, response = channel
+            engine = SerdesEngine(frequencies, response, config)
+
+            # 长码型按块区间分片到进程池并行仿真
+            stats = ShardedSerdesRunner().run(engine, frequencies, response,
+                                              progress_callback=self._report_progress)
+            result = {
+                'simulation_type': 'serdes',
+                'parameter_id': self.simulation.s_parameter.id,
+                **engine.summarize(stats),
+                'success': True
+            }
+
+            # 保存结果
+            self.simulation.result_data = result
+            self.simulation.status = 'completed'
+            self.simulation.save()
+
+            return result
+        except Exception as e:
+            self.simulation.status = 'failed'
+            self.simulation.result_data = {'success': False, 'error': str(e)}
+            self.simulation.save()
+            raise
+
+    def _extract_channel(self, input_port: int, output_port: int):
+        """
+        从S参数提取传输通道
+        :return: (频点, 通道频响), 无效时返回None
+        """
+        s_param_data = self.simulation.s_parameter.get_data()
+        if not s_param_data:
+            self.add_error("S参数文件尚未解析")
+            return None
+
+        s_parameters = np.asarray(s_param_data['s_parameters'])
+        num_ports = s_parameters.shape[-1]
+        if not (0 <= input_port < num_ports and 0 <= output_port < num_ports):
+            self.add_error("端口映射无效")
+            return None
+
+        return np.asarray(s_param_data['frequencies']), s_parameters[:, output_port, input_port]
+
+    def _report_progress(self, current: int, total: int, message: str = ""):
+        """将引擎进度转发给任务进度回调"""
+        if self.progress_callback:
+            self.progress_callback(current, total, message)
@@ -0,0 +1,60 @@
+from celery import shared_task
+from django.utils import timezone
+from celery.exceptions import MaxRetriesExceededError
+from app.core.models import TaskRecord
+from app.core.services import TaskMonitorService
+from app.core.decorators import MonitoredTask
+from .models import SerderSimulation
+from .services import SerderSimulationProcessor
+
+
+@shared_task(bind=True, base=MonitoredTask, max_retries=3, default_retry_delay=60)
+def run_serder_simulation(self, simulation_id: int):
+    """运行Serder链路仿真任务"""
+    task_record = TaskRecord.objects.get(task_id=self.request.id)
+    TaskMonitorService.update_task_status(
+        task_record,
+        'started',
+        started_at=timezone.now()
+    )
+
+    try:
+        simulation = SerderSimulation.objects.select_related('s_parameter').get(id=simulation_id)
+    except SerderSimulation.DoesNotExist:
+        # 对象不存在不需要重试
+        return {
+            'simulation_id': simulation_id,
+            'status': 'error',
+            'error': f'找不到ID为{simulation_id}的仿真'
+        }
+
+    # 记录处理进度
+    def progress_callback(current, total, message=""):
+        TaskMonitorService.update_task_status(
+            task_record,
+            'started',
+            runtime_data={
+                'progress': (current / total) * 100,
+                'message': message
+            }
+        )
+
+    try:
+        processor = SerderSimulationProcessor(simulation)
+        processor.execute(progress_callback=progress_callback, **(simulation.parameters or {}))
+
+        # 结果已保存在仿真记录中, 任务结果只返回状态
+        return {
+            'simulation_id': simulation_id,
+            'status': processor.status,
+            'errors': processor.errors
+        }
+    except Exception as e:
+        try:
+            self.retry(exc=e)
+        except MaxRetriesExceededError:
+            return {
+                'simulation_id': simulation_id,
+                'status': 'error',
+                'error': f'仿真失败(重试次数已达上限): {str(e)}'
+            }
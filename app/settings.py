@@ -289,6 +289,18 @@ CELERY_BEAT_SCHEDULE = {
     'cleanup-simulation-results': {
         'task': 'app.parameter.tasks.cleanup_old_results',
         'schedule': crontab(hour=2, minute=0),  # 每天凌晨2点执行
+    },
+    'cleanup-com-waveforms': {
+        'task': 'app.com_simulation.tasks.cleanup_expired_waveforms',
+        'schedule': crontab(hour=2, minute=30),  # 每天凌晨2点半清理过期波形文件
+    },
+    'cleanup-com-exports': {
+        'task': 'app.com_simulation.tasks.cleanup_expired_exports',
+        'schedule': crontab(minute=15),  # 每小时清理过期的导出文件
+    },
+    'compact-file-caches': {
+        'task': 'app.core.tasks.compact_file_caches',
+        'schedule': crontab(minute=30),  # 每小时整理文件缓存
     }
 }
 
@@ -312,8 +324,14 @@ CACHES = {
     
     # 方案二：使用混入类扩展的缓存后端
     'file': {
-        'BACKEND': 'app.core.cache.backends.SubDirFileBasedCache',
+        'BACKEND': 'app.core.cache.backends.BoundedFileBasedCache',
         'LOCATION': '/var/tmp/django_cache/mixin',
+        'OPTIONS': {
+            'MAX_ENTRIES': 200000,
+            'MAX_BYTES': int(os.getenv('FILE_CACHE_MAX_BYTES', 20 * 1024 ** 3)),  # 全局容量
+            'NAMESPACE_MAX_BYTES': 2 * 1024 ** 3,  # 每个命名空间(如user_1)的默认配额
+            'NAMESPACE_QUOTAS': {},
+        },
     },
 }
 
@@ -335,3 +353,85 @@ MEDIA_ROOT = BASE_DIR / 'media'
 SIMULATION_RESULTS_EXPIRY_DAYS = 30  # 结果保留天数
 SIMULATION_MAX_RETRIES = 3           # 最大重试次数
 SIMULATION_RETRY_DELAY = 300         # 重试延迟（秒）
+
+# COM仿真FFT配置
+COM_FFT_WORKERS = int(os.getenv('COM_FFT_WORKERS', os.cpu_count() or 1))  # 大变换使用的线程数
+COM_FFT_PARALLEL_THRESHOLD = 1 << 16  # 超过该点数的变换才启用多线程
+
+# COM仿真端口并行配置(按worker通过环境变量设置, 1表示串行)
+COM_SIMULATION_POOL_SIZE = int(os.getenv('COM_SIMULATION_POOL_SIZE', 1))
+
+# COM仿真波形存储配置
+COM_WAVEFORM_COMPRESS = False        # 是否以压缩NPZ格式存储波形
+COM_WAVEFORM_PREVIEW_POINTS = 500    # result_data中保留的波形预览点数
+
+# COM仿真引擎版本, 算法变更时递增以使结果记忆失效
+COM_ENGINE_VERSION = '2'
+
+# 批量仿真分发配置: 超过该数量时按chunks合并任务消息
+COM_BULK_CHUNK_SIZE = 50
+
+# 仿真导出配置
+COM_EXPORT_BATCH_SIZE = 100  # 每批并行序列化的仿真数
+COM_EXPORT_WORKERS = 4       # 序列化线程数
+COM_EXPORT_EXPIRY_HOURS = 2  # 导出文件保留时间(小时), 下载地址只在进度缓存中保存1小时
+
+# SerDes仿真分片配置, 进程数默认1(不分片)
+SERDES_SIMULATION_POOL_SIZE = int(os.getenv('SERDES_SIMULATION_POOL_SIZE', 1))
+SERDES_MIN_SHARD_BLOCKS = 8  # 每个分片的最少处理块数
+
+# 批量FOM排名配置
+FOM_BATCH_CHUNK_SIZE = 20  # 每个worker任务计算的通道数
+
+# 两级缓存配置: 列出的后端在前面加一层进程内LRU(L1)
+CACHE_L1_BACKENDS = []
+CACHE_L1_MAX_ENTRIES = 1024   # L1最大条目数
+CACHE_L1_TIMEOUT = 60         # L1条目最长存活时间(秒)
+# L1失效广播使用的Redis地址, 为空时只在进程内广播
+CACHE_INVALIDATION_URL = os.getenv('CACHE_INVALIDATION_URL', '')
+CACHE_INVALIDATION_CHANNEL = 'rf_cache_invalidation'
+
+# 缓存击穿保护配置
+CACHE_LOCK_TIMEOUT = 30   # 重算锁超时(秒)
+CACHE_STALE_GRACE = 60    # 软过期后旧值的保留时间(秒)
+
+# 视图缓存后台刷新(stale-while-revalidate)线程数
+CACHE_REVALIDATE_WORKERS = 4
+
+# 文件指纹索引配置
+FILE_FINGERPRINT_INDEX = '/var/tmp/django_cache/fingerprints.sqlite3'
+FILE_HASH_WORKERS = 4  # 多文件并行哈希的线程数
+
+# 缓存预热配置
+ACCESS_STATS_BACKEND = 'default'  # 访问统计使用的缓存后端
+ACCESS_STATS_DAYS = 7             # 热度统计窗口(天)
+CACHE_WARMUP_LIMIT = 50           # 每次预热的S参数数量
+CACHE_WARMUP_RATE = 2             # 每秒最多预热的S参数数, 避免占满worker
+CACHE_WARMUP_MAX_SECONDS = 600    # 单次预热总时长上限(秒)
+CACHE_WARMUP_FAVORITE_WEIGHT = 5  # 一次收藏相当于的访问次数
+CACHE_WARMUP_COM_PROFILES = [     # 预先生成脉冲响应的速率组合
+    {'sample_rate': 1e9, 'bit_rate': 1e9, 'num_ui': 64},
+]
+
+# 缓存指标配置
+CACHE_METRICS_ENABLED = True
+CACHE_METRICS_SIZE_SAMPLE_EVERY = 10   # 每N次写入抽样一次值大小(需要序列化)
+CACHE_METRICS_MAX_NAMESPACES = 200     # 命名空间数量上限, 超出归入other
+CACHE_METRICS_FLUSH_INTERVAL = 30      # 进程快照写入间隔(秒)
+CACHE_METRICS_DIR = '/var/tmp/django_cache/metrics'
+
+# 缓存值编码配置: 序列化器(auto/pickle/npy, 为空时不编码)和大值压缩
+CACHE_VALUE_SERIALIZER = 'auto'
+CACHE_VALUE_COMPRESSOR = os.getenv('CACHE_VALUE_COMPRESSOR', 'zlib')  # zlib, 安装对应库后可用zstd/lz4
+CACHE_COMPRESS_MIN_BYTES = 64 * 1024  # 序列化后超过该大小才压缩
+
+# 本机共享数组缓存: 解析后的S参数数组以内存映射文件在各进程间共享
+SHARED_ARRAY_ENABLED = True
+SHARED_ARRAY_DIR = os.getenv('SHARED_ARRAY_DIR')      # 默认 /dev/shm/rf_arrays
+SHARED_ARRAY_MAX_BYTES = 2 * 1024 ** 3               # 总大小上限, 超出按LRU淘汰
+SHARED_ARRAY_LOCAL_HANDLES = 32                      # 每个进程保留映射的条目数
+
+# 请求合并: 进行中的相同请求等待同一次计算
+REQUEST_COALESCE_BACKEND = 'default'   # 跨进程协调使用的缓存后端, 为空时只在进程内合并
+REQUEST_COALESCE_WAIT_TIMEOUT = 30     # 等待其他调用方计算的最长时间(秒)
+REQUEST_COALESCE_RESULT_TTL = 10       # 计算结果在缓存中保留的秒数
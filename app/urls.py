@@ -22,4 +22,6 @@ from django.conf.urls.static import static
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/external/', include('app.external_data.urls')),
+    path('api/fom-chi/', include('app.fom_chi.urls')),
+    path('api/cache/', include('app.core.urls')),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)